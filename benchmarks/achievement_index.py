@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - ACHIEVEMENT INDEX BENCHMARK
+Pits AchievementIndex against re-testing every achievement on every award.
+
+Usage: python benchmarks/achievement_index.py [achievements]
+
+Fails if the two ever earn different achievements, or if the index is less
+than 10x faster per award with a few hundred achievements defined.
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from achievement_index import AchievementIndex  # noqa: E402
+
+REQUIRED_SPEEDUP = 10
+STATS = [f"stat_{n}" for n in range(20)]
+
+
+def synthetic_requirements(count: int, rng: random.Random) -> dict:
+    """count achievements, mostly one threshold, some on two stats."""
+    requirements = {}
+    for n in range(count):
+        stats = rng.sample(STATS, 2 if rng.random() < 0.1 else 1)
+        requirements[f"ach_{n}"] = {stat: rng.randint(1, 2000) for stat in stats}
+    return requirements
+
+
+def reference_check(requirements: dict, earned: list, values: dict) -> list:
+    """The old approach: test every unearned achievement."""
+    new = []
+    for ach_id, requirement in requirements.items():
+        if ach_id not in earned and all(values[s] >= m for s, m in requirement.items()):
+            new.append(ach_id)
+    earned.extend(new)
+    return new
+
+
+def awards(count: int, rng: random.Random) -> list:
+    """Which stat each award bumps, and by how much."""
+    return [(rng.choice(STATS), rng.choice((1, 1, 1, 5, 50))) for _ in range(count)]
+
+
+def replay_reference(requirements, steps):
+    values = dict.fromkeys(STATS, 0)
+    earned = []
+    unlocked = []
+    for stat, amount in steps:
+        values[stat] += amount
+        unlocked.append(reference_check(requirements, earned, values))
+    return unlocked
+
+
+def replay_index(index, steps):
+    values = dict.fromkeys(STATS, 0)
+    tracker = index.tracker([])
+    unlocked = []
+    for stat, amount in steps:
+        values[stat] += amount
+        unlocked.append(tracker.check((stat,), values.__getitem__))
+    return unlocked
+
+
+def best_of(fn, repeat=5) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(1337)
+
+    for seed in range(50):
+        case = random.Random(seed)
+        requirements = synthetic_requirements(case.randint(1, count), case)
+        steps = awards(500, case)
+        index = AchievementIndex(requirements)
+        if replay_index(index, steps) != replay_reference(requirements, steps):
+            print(f"❌ index and reference disagree (seed {seed})")
+            sys.exit(1)
+    print("✓ identical unlocks on 50 random award sequences")
+
+    requirements = synthetic_requirements(count, rng)
+    index = AchievementIndex(requirements)
+    steps = awards(5000, rng)
+    baseline = best_of(lambda: replay_reference(requirements, steps), repeat=3)
+    elapsed = best_of(lambda: replay_index(index, steps))
+    speedup = baseline / elapsed
+    print(f"{count} achievements, {len(steps)} awards")
+    print(f"  full scan {baseline / len(steps) * 1e6:8.2f} µs/award")
+    print(f"  index     {elapsed / len(steps) * 1e6:8.2f} µs/award  {speedup:5.1f}x")
+    if speedup < REQUIRED_SPEEDUP:
+        print(f"❌ index is under {REQUIRED_SPEEDUP}x")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
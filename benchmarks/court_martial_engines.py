@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - COURT MARTIAL ENGINE PARITY
+Runs the line and scan engines of court_martial side by side.
+
+Usage: python benchmarks/court_martial_engines.py [file_or_dir ...]
+
+Every generated sample, plus every file under the given paths, must get
+exactly the same violations (and line count) from both engines. Timings
+for the given paths are printed at the end.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import court_martial  # noqa: E402
+from file_access import open_source  # noqa: E402
+
+EXTENSIONS = list(court_martial.LINE_MATCHERS) + ['.java', '.go', '.c']
+
+# Fragments that trip every rule, plus line breaks of every flavour
+FRAGMENTS = [
+    b'console.log(x)', b'//', b'print', b'(', b')', b' ', b'\t', b'\x0b',
+    b': any', b'as any', b'@ts-ignore', b'@ts-nocheck', b'todo', b'ToDo',
+    b'FIXME', b'hack', b'HaCk', b'catch', b'{', b'}', b'?', b':', b'=',
+    b'<', b'>', b'1234', b'99', b'const', b'CONST', b'#', b'password',
+    b'PassWord', b'api_key', b'API-KEY', b'apikey', b'secret', b'"', b"'",
+    b'x', b'function', b'async', b'=>', b'\xc3\xa9', b'\xff', b'x' * 45,
+    b'\n', b'\n', b'\r', b'\r\n',
+]
+
+
+def samples(count: int, seed: int = 9):
+    """Deterministic random sources, some with long function bodies."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        data = b''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 80)))
+        if rng.random() < 0.05:
+            body = b'  x();\n' * rng.randint(40, 120)
+            data = (b'function f() {\n' + body + b'}\n') * 2 + data
+        yield data
+
+
+def run(engine: str, data, ext: str):
+    violations = []
+    lines = court_martial.ENGINES[engine](data, ext, violations)
+    return lines, violations
+
+
+def check(data, ext: str, label: str) -> bool:
+    expected = run("line", data, ext)
+    actual = run("scan", data, ext)
+    if actual != expected:
+        print(f"❌ engines disagree on {label} ({ext or 'no extension'})")
+        print(f"   line: {expected}")
+        print(f"   scan: {actual}")
+        return False
+    return True
+
+
+def source_files(paths):
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from (p for p in sorted(path.rglob("*")) if p.is_file())
+        elif path.is_file():
+            yield path
+
+
+def main():
+    checked = 0
+    for ext in EXTENSIONS:
+        for n, data in enumerate(samples(2000)):
+            if not check(data, ext, f"sample {n}: {data[:60]!r}"):
+                sys.exit(1)
+            checked += 1
+
+    files = list(source_files(sys.argv[1:]))
+    for path in files:
+        with open_source(path) as data:
+            if not check(data, path.suffix.lower(), str(path)):
+                sys.exit(1)
+        checked += 1
+    print(f"✓ identical results on {checked} samples")
+
+    if not files:
+        return
+    size = sum(path.stat().st_size for path in files)
+    print(f"{len(files)} files, {size / 1e6:.1f} MB")
+    for engine in court_martial.ENGINES:
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            for path in files:
+                court_martial.analyze_file(path, engine=engine)
+            best = min(best, time.perf_counter() - started)
+        print(f"  {engine:6} {best * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
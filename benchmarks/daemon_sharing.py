@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - DAEMON SHARING CHECK
+Runs sergeantd next to the scripts that write the profile directly.
+
+Usage: python benchmarks/daemon_sharing.py [store ...]
+
+For each profile store (default: all of them), in a throwaway home: start
+the daemon, award through it while another client sits connected without
+sending anything, unlock a medal with achievements.py and log challenge
+progress with daily_challenges.py while it holds unsaved changes, award
+again. Then flush, unlock another medal, and compare the daemon's
+profile, daily and achievements output with xp_tracker.py's. Award once
+more and stop it. The stalled client must not fail the awards, the outputs
+must match, and the medals, the challenge progress and every XP point
+must survive the daemon's flush. Exits non-zero otherwise.
+"""
+
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+from profile_schema import load_profile  # noqa: E402
+from profile_store import STORES, open_store  # noqa: E402
+
+
+def run(env: dict, script: str, *args) -> str:
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS / script), *args],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    return result.stdout
+
+
+def stored(home: str, kind: str) -> dict:
+    store = open_store(Path(home) / ".sergeant" / "profile.json", kind)
+    try:
+        return load_profile(store)
+    finally:
+        store.close()
+
+
+def check(kind: str) -> list:
+    """What went missing with the given store, if anything."""
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, SERGEANT_STORE=kind,
+                   SERGEANT_SOCKET=os.path.join(home, "sergeantd.sock"))
+        env.pop("SERGEANT_RANKS", None)
+        # A long flush interval: only stop writes the daemon's changes
+        daemon = subprocess.Popen(
+            [sys.executable, str(SCRIPTS / "sergeantd.py"), "--flush-interval", "600"],
+            stdout=subprocess.DEVNULL, env=env,
+        )
+        try:
+            for _ in range(100):
+                if subprocess.run([sys.executable, str(SCRIPTS / "sergeantd.py"), "status"],
+                                  capture_output=True, env=env).returncode == 0:
+                    break
+                time.sleep(0.1)
+            else:
+                return ["sergeantd never came up"]
+            problems = []
+
+            # A client that connects and never sends its request
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stalled:
+                stalled.connect(env["SERGEANT_SOCKET"])
+                try:
+                    popups = run(env, "sergeant.py", "award", "bug_fixed")
+                except subprocess.CalledProcessError as e:
+                    said = (e.stdout + e.stderr).strip().splitlines() or [""]
+                    return [f"award failed next to a stalled client: {said[-1]}"]
+            popups += run(env, "sergeant.py", "award", "file_edited")
+            # The daemon now holds unsaved awards; write around it
+            run(env, "achievements.py", "unlock", "purple_heart")
+            run(env, "daily_challenges.py", "progress", "bug_fixed", "2")
+            before = stored(home, kind)
+            popups += run(env, "sergeant.py", "award", "file_edited")
+            # Once flushed, the daemon must show what others save next
+            run(env, "sergeant.py", "flush")
+            run(env, "achievements.py", "unlock", "bronze_star")
+            for command in ("profile", "daily", "achievements"):
+                if run(env, "sergeant.py", command) != run(env, "xp_tracker.py", command):
+                    problems.append(f"sergeantd's {command} differs from xp_tracker.py's")
+            popups += run(env, "sergeant.py", "award", "file_edited")
+            run(env, "sergeantd.py", "stop")
+            daemon.wait(timeout=30)
+        finally:
+            if daemon.poll() is None:
+                daemon.kill()
+
+        after = stored(home, kind)
+
+    for medal in ("purple_heart", "bronze_star"):
+        if medal not in after["medals"]:
+            problems.append(f"{medal} lost: medals are {after['medals']}")
+    progress = after["challenges"].get("daily_progress", {})
+    if progress.get("bug_fixed") != 2:
+        problems.append(f"challenge progress lost: {progress}")
+    if after["stats"].get("bugs_fixed") != 1:
+        problems.append(f"bugs_fixed is {after['stats'].get('bugs_fixed')}, expected 1")
+    # None of the daemon's awards were saved when `before` was read: they
+    # and the achievement rewards their popups announced come on top
+    gained = sum(int(xp) for xp in re.findall(r"\+(\d+) XP", popups))
+    gained += 100  # bronze_star, unlocked after `before` was read
+    if after["xp"] != before["xp"] + gained:
+        problems.append(f"xp is {after['xp']}, expected {before['xp']} + {gained}")
+    return problems
+
+
+def main():
+    kinds = sys.argv[1:] or list(STORES)
+    failed = False
+    for kind in kinds:
+        problems = check(kind)
+        if problems:
+            failed = True
+            for problem in problems:
+                print(f"❌ {kind}: {problem}")
+        else:
+            print(f"✓ {kind}: medal, challenge progress and XP survive the daemon's flush")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - NESTING DEPTH BENCHMARK
+Pits recon.max_nesting_depth against the old per-character loop.
+
+Usage: python benchmarks/nesting_depth.py [--parity] [megabytes]
+
+Fails if the results ever disagree, or if the NumPy path is less than
+20x faster than the loop on a multi-MB minified bundle. --parity only
+checks the results, which is what CI runs: timings depend on the machine.
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import recon  # noqa: E402
+
+REQUIRED_SPEEDUP = 20
+
+
+def reference_depth(content: str) -> int:
+    """The original CALLBACK_HELL loop from analyze_code_smells."""
+    max_depth = 0
+    current_depth = 0
+    for char in content:
+        if char in '{[(':
+            current_depth += 1
+            max_depth = max(max_depth, current_depth)
+        elif char in '}])':
+            current_depth = max(0, current_depth - 1)
+    return max_depth
+
+
+def minified_bundle(megabytes: float) -> str:
+    """Deterministic minified-looking JS with deep nesting and stray closers."""
+    rng = random.Random(1337)
+    names = ["e", "t", "n", "r", "this.props", "module.exports", "i18n"]
+    chunks = []
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        depth = rng.randint(1, 12)
+        opened = [rng.choice("({[") for _ in range(depth)]
+        closers = {"(": ")", "{": "}", "[": "]"}
+        body = "".join(
+            f"{o}{rng.choice(names)}.{rng.choice(names)}='lorem ipsum dolor';"
+            for o in opened
+        )
+        body += "".join(f"{closers[o]};var x{depth}=\"sit amet\"" for o in reversed(opened))
+        if rng.random() < 0.01:
+            body += ")"  # stray closer, e.g. from a regex literal
+        chunks.append("function f(){var s='é';return " + body + "}")
+        size += len(chunks[-1])
+    return "".join(chunks)
+
+
+def best_of(fn, repeat=5) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main():
+    args = sys.argv[1:]
+    parity_only = "--parity" in args
+    if parity_only:
+        args.remove("--parity")
+    megabytes = float(args[0]) if args else 4
+    content = minified_bundle(megabytes)
+    data = content.encode("utf-8")
+    numpy = recon.numpy
+
+    # Parity: random edge cases, then the full bundle, on both engines
+    rng = random.Random(7)
+    samples = ["", ")", "(", ")(", "((())", "é{[(" * 3] + [
+        "".join(rng.choice("{}[]()aé") for _ in range(rng.randint(0, 60)))
+        for _ in range(2000)
+    ]
+    samples.append(content)
+    engines = [("pure-python", None)] + ([("numpy", numpy)] if numpy else [])
+    for name, module in engines:
+        recon.numpy = module
+        for sample in samples:
+            expected = reference_depth(sample)
+            actual = recon.max_nesting_depth(sample.encode("utf-8"))
+            if actual != expected:
+                print(f"❌ {name}: depth {actual} != {expected} for {sample[:60]!r}")
+                sys.exit(1)
+    print(f"✓ identical results on {len(samples)} samples")
+    recon.numpy = numpy
+    if parity_only:
+        return
+
+    baseline = best_of(lambda: reference_depth(content), repeat=3)
+    print(f"{len(data) / 1e6:.1f} MB bundle, loop: {baseline * 1000:.1f} ms")
+
+    failed = False
+    for name, module in engines:
+        recon.numpy = module
+        elapsed = best_of(lambda: recon.max_nesting_depth(data))
+        speedup = baseline / elapsed
+        print(f"  {name:12} {elapsed * 1000:8.1f} ms  {speedup:5.1f}x")
+        if module is not None and speedup < REQUIRED_SPEEDUP:
+            failed = True
+    recon.numpy = numpy
+
+    if not numpy:
+        print("NumPy not installed; skipped the accelerated path.")
+    if failed:
+        print(f"❌ NumPy path is under {REQUIRED_SPEEDUP}x")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
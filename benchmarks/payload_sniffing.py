@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - PAYLOAD SNIFFING CHECK
+Runs classify_payload, which recon and court martial use to turn away
+binaries, minified bundles and generated code, over a handful of made-up
+files whose verdict is known.
+
+Usage: python benchmarks/payload_sniffing.py
+
+Ordinary source must be analyzed whatever its line endings or script:
+LF, CRLF or lone CR, and comments in CJK (three bytes a character in
+UTF-8). Exits non-zero when a file gets the wrong verdict.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from file_access import classify_payload  # noqa: E402
+
+SOURCE_LINE = "    total = compute(values, weight=2)  # keep the running total\n"
+# 88 characters, but 258 bytes: a normal line, over the limit in bytes
+CJK_LINE = "# " + "计算总数并保存结果以便后续步骤使用" * 5 + "\n"
+
+CASES = [
+    ("plain.py", SOURCE_LINE * 100, None),
+    ("crlf.py", (SOURCE_LINE * 100).replace("\n", "\r\n"), None),
+    ("cr_only.py", (SOURCE_LINE * 100).replace("\n", "\r"), None),
+    ("cjk.py", CJK_LINE * 30 + SOURCE_LINE * 10, None),
+    ("cjk_cr_only.py", (CJK_LINE * 30 + SOURCE_LINE * 10).replace("\n", "\r"), None),
+    ("bundle.js", "var a=1;" * 1000, "minified"),
+    ("cjk_bundle.js", "var 名=1;" * 1000, "minified"),
+    ("generated_cr.py", "# stub\r# Code generated by stubgen. DO NOT EDIT.\r" + SOURCE_LINE * 50,
+     "generated"),
+    ("late_marker_cr.py", (SOURCE_LINE * 20).replace("\n", "\r") + "# do not edit this file\r",
+     None),
+]
+
+
+def main():
+    failed = False
+    for name, text, expected in CASES:
+        verdict = classify_payload(text.encode("utf-8"), name)
+        if (verdict or "").split(" ")[0] != (expected or ""):
+            failed = True
+            print(f"❌ {name}: {verdict or 'analyzed'}, expected {expected or 'analyzed'}")
+        else:
+            print(f"✓ {name}: {verdict or 'analyzed'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - PYTHON RULE PARITY
+Compares the line rules court martial used to apply to Python files with
+the AST rules (py_analyzer) that replaced them.
+
+Usage: python benchmarks/python_rules.py [--examples N] file_or_dir ...
+
+For DEBUG_TRASH and MAGIC_NUMBER, counts the lines both flag, and lists
+lines only one of them flags, so every difference can be read and judged.
+Also times a cold (parsing) and a warm (cached) run of analyze_file.
+Differences are expected, the point of the AST rules, so it never fails.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import court_martial  # noqa: E402
+import py_analyzer  # noqa: E402
+from file_access import LineIndex, decode, open_source  # noqa: E402
+
+CATEGORIES = ("DEBUG_TRASH", "MAGIC_NUMBER")
+
+
+def python_files(paths):
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*.py") if p.is_file())
+        elif path.suffix == ".py":
+            yield path
+
+
+def flagged_lines(violations) -> dict:
+    lines = {category: set() for category in CATEGORIES}
+    for v in violations:
+        if v.category in lines:
+            lines[v.category].add(v.line)
+    return lines
+
+
+def compare(files, examples: int):
+    agree = {category: 0 for category in CATEGORIES}
+    only = {(category, side): [] for category in CATEGORIES for side in ("line", "ast")}
+    parsed = 0
+    for path in files:
+        with open_source(path) as data:
+            if court_martial.classify_payload(data, path.name):
+                continue
+            facts = py_analyzer.PythonFacts().get(data)
+            if not facts:
+                continue
+            parsed += 1
+            line_rules = []
+            court_martial.ENGINES["line"](data, ".py", line_rules)
+            by_line = flagged_lines(line_rules)
+            by_ast = flagged_lines(court_martial._python_violations(facts, data))
+            index = LineIndex(data)
+            for category in CATEGORIES:
+                agree[category] += len(by_line[category] & by_ast[category])
+                for side, mine, theirs in (("line", by_line, by_ast), ("ast", by_ast, by_line)):
+                    for line in sorted(mine[category] - theirs[category]):
+                        text = decode(index.line(line)[1]).strip()
+                        only[category, side].append(f"{path}:{line}: {text[:90]}")
+
+    print(f"{parsed} Python files parsed")
+    for category in CATEGORIES:
+        line_only, ast_only = only[category, "line"], only[category, "ast"]
+        print(f"\n{category}: {agree[category]} lines flagged by both, "
+              f"{len(line_only)} by the line rule only, {len(ast_only)} by the AST only")
+        for side, found in (("line rule only", line_only), ("AST only", ast_only)):
+            for example in found[:examples]:
+                print(f"  [{side}] {example}")
+
+
+def timings(files):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        py_analyzer._shared[True] = py_analyzer.PythonFacts(Path(cache_dir))
+        for label in ("cold", "warm"):
+            # A fresh process would start with an empty memory cache
+            py_analyzer._shared[True].memory.clear()
+            started = time.perf_counter()
+            for path in files:
+                court_martial.analyze_file(path, engine="scan")
+            print(f"  {label:5} {(time.perf_counter() - started) * 1000:8.1f} ms")
+        del py_analyzer._shared[True]
+
+
+def main():
+    args = sys.argv[1:]
+    examples = 5
+    if "--examples" in args:
+        at = args.index("--examples")
+        examples = int(args[at + 1])
+        del args[at:at + 2]
+    files = list(python_files(args or [Path(__file__).resolve().parent.parent / "scripts"]))
+    compare(files, examples)
+    print(f"\nanalyze_file over {len(files)} files, scan engine")
+    timings(files)
+
+
+if __name__ == "__main__":
+    main()
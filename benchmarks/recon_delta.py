@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - RECON DELTA CHECK
+Builds a throwaway git repo and checks which files recon's delta scan
+(`recon.py --since` / `--staged`) picks up from it.
+
+Usage: python benchmarks/recon_delta.py
+
+The repo has a committed file that is then edited, a submodule entry, an
+untracked file, an ignored one, and a file removed from the index but
+left on disk. Against the working tree, the edit, the untracked file and
+the file still on disk must show up with their contents, and nothing
+else. Against the index, only the removal must. Exits non-zero otherwise.
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from recon import git_changed_sources  # noqa: E402
+
+
+def git(repo: Path, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def build(repo: Path):
+    git(repo, "init", "-q")
+    git(repo, "config", "user.email", "recon@example.com")
+    git(repo, "config", "user.name", "recon")
+    (repo / "edited.py").write_text("x = 1\n")
+    (repo / "unstaged.py").write_text("y = 1\n")
+    (repo / ".gitignore").write_text("ignored.py\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "base")
+    # A submodule entry: a commit id where a blob would be
+    head = subprocess.run(["git", "-C", str(repo), "rev-parse", "HEAD"],
+                          check=True, capture_output=True, text=True).stdout.strip()
+    git(repo, "update-index", "--add", "--cacheinfo", f"160000,{head},vendored.py")
+
+    (repo / "edited.py").write_text("x = 2\n")
+    (repo / "untracked.py").write_text("z = 1\n")
+    (repo / "ignored.py").write_text("w = 1\n")
+    git(repo, "rm", "-q", "--cached", "unstaged.py")
+
+
+def check() -> list:
+    problems = []
+    with tempfile.TemporaryDirectory() as directory:
+        repo = Path(directory)
+        build(repo)
+        expected = {
+            False: {
+                "edited.py": (b"x = 1\n", b"x = 2\n"),
+                "untracked.py": (None, b"z = 1\n"),
+                "unstaged.py": (b"y = 1\n", b"y = 1\n"),
+            },
+            True: {
+                "unstaged.py": (b"y = 1\n", None),
+            },
+        }
+        for staged, files in expected.items():
+            mode = "--staged" if staged else "working tree"
+            found = {rel_path: (before, after)
+                     for rel_path, _, before, after in git_changed_sources(repo, staged=staged)}
+            for rel_path in sorted(found.keys() | files.keys()):
+                if found.get(rel_path) != files.get(rel_path):
+                    problems.append(f"{mode}: {rel_path} is {found.get(rel_path)}, "
+                                    f"expected {files.get(rel_path)}")
+    return problems
+
+
+def main():
+    problems = check()
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✓ delta scan picks up edits and untracked files, and skips the rest")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - STORE FAILURE CHECK
+Makes writes to the profile fail halfway and checks nothing half-done is
+saved later.
+
+Usage: python benchmarks/store_failures.py [store ...]
+
+For each profile store (default: all of them), in a throwaway directory:
+
+  - award, make an award raise after it changed the profile, award again:
+    only the two awards that went through may be stored
+  - make a save fail after part of it was written, on its own and inside a
+    transaction, then save the same change again: it must all be stored
+
+Each reads the profile back with a fresh store. Exits non-zero otherwise.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from profile_schema import load_profile  # noqa: E402
+from profile_store import STORES, open_store  # noqa: E402
+from xp_tracker import XPTracker  # noqa: E402
+
+
+class Boom(Exception):
+    pass
+
+
+class Unencodable:
+    """Raises when a store encodes it, after the keys saved before it."""
+
+    def __str__(self):
+        raise Boom("cannot encode")
+
+
+def gained(result: dict) -> int:
+    return result["xp_earned"] + sum(ach["xp_reward"] for ach in result["new_achievements"])
+
+
+def stored(path: Path, kind: str) -> dict:
+    store = open_store(path, kind)
+    try:
+        return load_profile(store)
+    finally:
+        store.close()
+
+
+def failed_award(path: Path, kind: str) -> list:
+    """An award that raises after adding its XP must not be saved later."""
+    tracker = XPTracker(path, store=open_store(path, kind))
+    try:
+        first = tracker.award_xp("file_edited")
+
+        def explode(action):
+            raise Boom(action)
+
+        tracker._check_achievements = explode
+        try:
+            tracker.award_xp("bug_fixed")
+        except Boom:
+            pass
+        del tracker._check_achievements
+
+        second = tracker.award_xp("file_edited")
+    finally:
+        tracker.store.close()
+
+    expected = first["total_xp"] + gained(second)
+    problems = []
+    if second["total_xp"] != expected:
+        problems.append(f"the next award reports {second['total_xp']} XP, expected {expected}")
+    after = stored(path, kind)
+    if after["xp"] != expected:
+        problems.append(f"{after['xp']} XP stored, expected {expected}")
+    if after["stats"].get("bugs_fixed"):
+        problems.append("the failed bug_fixed award was counted")
+    return problems
+
+
+def failed_save(path: Path, kind: str) -> list:
+    """A save that fails halfway must not pass for saved on the next try."""
+    store = open_store(path, kind)
+    problems = []
+    try:
+        profile = load_profile(store)
+        profile["achievements"] = ["first_blood"]
+        store.save(profile)
+        for inside in (False, True):
+            changed = dict(profile, xp=profile["xp"] + 100,
+                           stats=dict(profile["stats"], bugs_fixed=3),
+                           achievements=["first_blood", "bug_hunter"])
+            try:
+                if inside:
+                    with store.transaction():
+                        store.save(dict(changed, zz=Unencodable()))
+                else:
+                    store.save(dict(changed, zz=Unencodable()))
+            except Boom:
+                pass
+            store.save(changed)
+            after = stored(path, kind)
+            where = "in a transaction" if inside else "on its own"
+            for key in ("xp", "stats", "achievements"):
+                if after[key] != changed[key]:
+                    problems.append(f"{key} is {after[key]} after a failed save {where}, "
+                                    f"expected {changed[key]}")
+            profile = changed
+    finally:
+        store.close()
+    return problems
+
+
+CHECKS = (failed_award, failed_save)
+
+
+def main():
+    kinds = sys.argv[1:] or list(STORES)
+    failed = False
+    for kind in kinds:
+        for check in CHECKS:
+            with tempfile.TemporaryDirectory() as directory:
+                problems = check(Path(directory) / "profile.json", kind)
+            for problem in problems:
+                print(f"❌ {kind} {check.__name__}: {problem}")
+            if problems:
+                failed = True
+            else:
+                print(f"✓ {kind} {check.__name__}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
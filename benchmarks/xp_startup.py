@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - XP STARTUP BENCHMARK
+Times what a hook pays before an award even starts: `python -X importtime`
+on `sergeant.py award`, the entry point the commands call.
+
+Usage: python benchmarks/xp_startup.py [runs]
+
+Fails if the award path imports a module that only other commands need
+(loot's random, the sqlite backend, the daemon socket, ...), which is how
+startup regressions usually creep back in. Timings are printed, not
+enforced: they depend too much on the machine.
+"""
+
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+
+# Must stay out of `award` without a daemon running
+DEFERRED = ("dataclasses", "random", "socket", "sqlite3", "tempfile", "typing")
+
+
+def import_times(home: str) -> dict:
+    """{module: cumulative µs} for one `sergeant.py award` run, plus "total"."""
+    env = dict(os.environ, HOME=home)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.pop("SERGEANT_SOCKET", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(SCRIPTS / "sergeant.py"), "award", "file_edited"],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    times = {"total": 0}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+        if not name.startswith("  "):
+            times["total"] += int(cumulative)
+    return times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    # Hooks run against cached bytecode; measure that, not a first compile
+    compileall.compile_dir(str(SCRIPTS), quiet=1)
+
+    with tempfile.TemporaryDirectory() as home:
+        samples = [import_times(home) for _ in range(runs)]
+
+    imported = set().union(*samples)
+    leaked = [name for name in DEFERRED if name in imported]
+
+    def median_ms(name):
+        return statistics.median(s.get(name, 0) for s in samples) / 1000
+
+    print(f"sergeant.py award, {runs} runs (median cumulative import time)")
+    print(f"  {'all imports':16} {median_ms('total'):7.1f} ms")
+    heaviest = sorted(
+        (name for name in imported if not name.startswith("_") and name != "total"),
+        key=median_ms, reverse=True,
+    )[:8]
+    for name in heaviest:
+        print(f"  {name:16} {median_ms(name):7.1f} ms")
+
+    if leaked:
+        print(f"❌ award imports {', '.join(leaked)}; defer them to the commands that use them")
+        sys.exit(1)
+    print(f"✓ none of {', '.join(DEFERRED)} imported")
+
+
+if __name__ == "__main__":
+    main()
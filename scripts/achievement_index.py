@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - ACHIEVEMENT INDEX
+Finds the achievements an award just earned without re-testing all of them.
+
+Every achievement is a set of requirements, {stat: minimum}. The index maps
+each stat to the achievements that depend on it, sorted by threshold. Stats
+only go up, so for each stat that changed only the thresholds between the
+lowest one not yet earned and the stat's new value can have been crossed.
+An award that earns nothing costs one comparison per changed stat, however
+many achievements are defined.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Callable, Iterable
+
+
+class AchievementIndex:
+    """Threshold index over {achievement_id: {stat: minimum, ...}}.
+
+    Iteration order of requirements is the order new achievements are
+    reported in.
+    """
+
+    def __init__(self, requirements: dict[str, dict[str, int]]):
+        self.requirements = requirements
+        self.order = {ach_id: n for n, ach_id in enumerate(requirements)}
+        by_stat = {}
+        for ach_id, requirement in requirements.items():
+            for stat, minimum in requirement.items():
+                by_stat.setdefault(stat, []).append((minimum, self.order[ach_id], ach_id))
+        self.thresholds = {}
+        self.ids = {}
+        for stat, entries in by_stat.items():
+            entries.sort()
+            self.thresholds[stat] = [minimum for minimum, _, _ in entries]
+            self.ids[stat] = [ach_id for _, _, ach_id in entries]
+
+    def stats(self) -> list[str]:
+        return list(self.thresholds)
+
+    def tracker(self, earned: list[str]) -> "AchievementTracker":
+        """Per-profile state for checking against this index."""
+        return AchievementTracker(self, earned)
+
+
+class AchievementTracker:
+    """Remembers, per stat, where the first unearned threshold is.
+
+    earned is the profile's own list and is appended to in place. The first
+    check() looks at every stat, so achievements a profile already
+    qualified for (after a migration, or newly defined ones) are caught.
+    """
+
+    def __init__(self, index: AchievementIndex, earned: list[str]):
+        self.index = index
+        self.earned = earned
+        self.earned_set = set(earned)
+        self.next_unmet = {}
+        self.swept = False
+
+    def earn(self, ach_id: str) -> bool:
+        """Mark an achievement earned outside the index. False if it already was."""
+        if ach_id in self.earned_set:
+            return False
+        self.earned.append(ach_id)
+        self.earned_set.add(ach_id)
+        return True
+
+    def check(self, changed: Iterable[str], value: Callable[[str], int]) -> list[str]:
+        """Earn and return, in definition order, what the changed stats unlocked."""
+        index = self.index
+        if not self.swept:
+            changed = index.stats()
+            self.swept = True
+
+        found = set()
+        for stat in changed:
+            ids = index.ids.get(stat)
+            if ids is None:
+                continue
+            start = self.next_unmet.get(stat, 0)
+            while start < len(ids) and ids[start] in self.earned_set:
+                start += 1
+            self.next_unmet[stat] = start
+            # Thresholds at or below the current value, not yet earned
+            stop = bisect_right(index.thresholds[stat], value(stat), lo=start)
+            for ach_id in ids[start:stop]:
+                if ach_id in self.earned_set or ach_id in found:
+                    continue
+                requirement = index.requirements[ach_id]
+                if len(requirement) == 1 or all(value(s) >= m for s, m in requirement.items()):
+                    found.add(ach_id)
+
+        new = sorted(found, key=index.order.__getitem__)
+        self.earned.extend(new)
+        self.earned_set.update(new)
+        return new
@@ -4,10 +4,9 @@ Achievement and Medal System for Sergeant Claude
 Handles unlock notifications and progress tracking
 """
 
-import json
-import os
-from datetime import datetime
-from pathlib import Path
+from achievement_index import AchievementIndex
+from profile_schema import add_xp, load_profile, profile_transaction, stat
+from state_io import StateError
 
 ACHIEVEMENTS = {
     # Combat Medals
@@ -126,38 +125,16 @@ ACHIEVEMENTS = {
     }
 }
 
-def get_profile_path():
-    """Get the profile file path"""
-    return Path.home() / ".sergeant_profile.json"
-
-def load_profile():
-    """Load user profile"""
-    profile_path = get_profile_path()
-    if profile_path.exists():
-        with open(profile_path, 'r') as f:
-            return json.load(f)
-    return {
-        "xp": 0,
-        "bugs_fixed": 0,
-        "features_complete": 0,
-        "tests_written": 0,
-        "operations_complete": 0,
-        "ambushes": 0,
-        "fortifications": 0,
-        "current_streak": 0,
-        "max_streak": 0,
-        "unlocked_achievements": [],
-        "last_active": None
-    }
-
-def save_profile(profile):
-    """Save user profile"""
-    with open(get_profile_path(), 'w') as f:
-        json.dump(profile, f, indent=2)
+# Medals earned by counters alone; special ones are awarded elsewhere
+MEDAL_INDEX = AchievementIndex({
+    achievement_id: achievement["requirement"]
+    for achievement_id, achievement in ACHIEVEMENTS.items()
+    if "special" not in achievement["requirement"]
+})
 
 def check_achievement(profile, achievement_id):
     """Check if an achievement should be unlocked"""
-    if achievement_id in profile.get("unlocked_achievements", []):
+    if achievement_id in profile.get("medals", []):
         return False  # Already unlocked
 
     achievement = ACHIEVEMENTS.get(achievement_id)
@@ -168,22 +145,22 @@ def check_achievement(profile, achievement_id):
 
     for key, value in requirement.items():
         if key == "special":
-            # Special achievements checked elsewhere
-            continue
-        if profile.get(key, 0) < value:
+            # Special achievements are awarded elsewhere, never by a sweep
+            return False
+        if stat(profile, key) < value:
             return False
 
     return True
 
 def unlock_achievement(profile, achievement_id):
-    """Unlock an achievement and display notification"""
-    achievement = ACHIEVEMENTS[achievement_id]
+    """Unlock an achievement and display notification.
 
-    if "unlocked_achievements" not in profile:
-        profile["unlocked_achievements"] = []
+    Only changes profile; the caller's profile_transaction saves it.
+    """
+    achievement = ACHIEVEMENTS[achievement_id]
 
-    profile["unlocked_achievements"].append(achievement_id)
-    profile["xp"] = profile.get("xp", 0) + achievement["xp_bonus"]
+    profile.setdefault("medals", []).append(achievement_id)
+    add_xp(profile, achievement["xp_bonus"])
 
     # Display unlock notification
     print(f"""
@@ -199,17 +176,22 @@ def unlock_achievement(profile, achievement_id):
 ╚═══════════════════════════════════════════════════════════╝
 """)
 
-    save_profile(profile)
     return achievement["xp_bonus"]
 
 def check_all_achievements(profile):
     """Check and unlock all eligible achievements"""
     newly_unlocked = []
+    # A copy: unlock_achievement() records each medal in the profile
+    earned = MEDAL_INDEX.tracker(list(profile.get("medals", [])))
 
-    for achievement_id in ACHIEVEMENTS:
-        if check_achievement(profile, achievement_id):
+    changed = MEDAL_INDEX.stats()
+    while changed:
+        found = earned.check(changed, lambda key: stat(profile, key))
+        for achievement_id in found:
             unlock_achievement(profile, achievement_id)
             newly_unlocked.append(achievement_id)
+        # Bonus XP can itself cross an xp threshold
+        changed = ["xp"] if found else []
 
     return newly_unlocked
 
@@ -226,7 +208,7 @@ def get_achievement_progress(profile, achievement_id):
         if key == "special":
             progress[key] = {"current": "?", "target": "special"}
         else:
-            current = profile.get(key, 0)
+            current = stat(profile, key)
             progress[key] = {"current": current, "target": target, "percent": min(100, int(current/target*100))}
 
     return progress
@@ -241,7 +223,7 @@ def display_medals(profile):
         "hidden": "🔮 HIDDEN ACHIEVEMENTS"
     }
 
-    unlocked = profile.get("unlocked_achievements", [])
+    unlocked = profile.get("medals", [])
     total_unlocked = len(unlocked)
     total_achievements = len(ACHIEVEMENTS)
 
@@ -272,23 +254,25 @@ def display_medals(profile):
     print(f"║  TOTAL DECORATIONS: {total_unlocked} / {total_achievements:<32} ║")
     print("╚═══════════════════════════════════════════════════════════╝")
 
-if __name__ == "__main__":
+def main():
     import sys
 
-    profile = load_profile()
-
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
+    command = sys.argv[1] if len(sys.argv) > 1 else "medals"
 
-        if command == "check":
-            check_all_achievements(profile)
-        elif command == "medals":
-            display_medals(profile)
-        elif command == "unlock" and len(sys.argv) > 2:
-            achievement_id = sys.argv[2]
-            if achievement_id in ACHIEVEMENTS:
-                unlock_achievement(profile, achievement_id)
-        else:
-            print("Usage: achievements.py [check|medals|unlock <id>]")
+    if command == "medals":
+        display_medals(load_profile())
+    elif command in ("check", "unlock") and (command == "check" or len(sys.argv) > 2):
+        with profile_transaction("medals", command=command) as profile:
+            if command == "check":
+                check_all_achievements(profile)
+            elif sys.argv[2] in ACHIEVEMENTS and sys.argv[2] not in profile["medals"]:
+                unlock_achievement(profile, sys.argv[2])
     else:
-        display_medals(profile)
+        print("Usage: achievements.py [check|medals|unlock <id>]")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except StateError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
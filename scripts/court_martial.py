@@ -5,212 +5,558 @@ Full breakdown of a specific file. No mercy.
 Every violation catalogued. Every sin exposed.
 """
 
+import argparse
+import glob
+import json
+import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
 from pathlib import Path
-from dataclasses import dataclass
-from typing import List
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from file_access import LineIndex, classify_payload, decode, iter_lines, open_source
+from py_analyzer import python_facts
 
 @dataclass
 class Violation:
     line: int
     category: str
     message: str
-    severity: str  # MINOR, MAJOR, CRITICAL, WAR_CRIME
+    severity: str  # MINOR, MAJOR, CRITICAL, WAR_CRIME (DISMISSED: not judged)
     code_snippet: str = ""
 
 
-def analyze_file(filepath: Path) -> List[Violation]:
-    """Perform deep analysis on a single file. No mercy."""
+def dismissal(violations: List[Violation]) -> Optional[str]:
+    """Why the case was dismissed without a trial, or None if it was tried."""
+    if len(violations) == 1 and violations[0].severity == "DISMISSED":
+        return violations[0].message
+    return None
+
+
+JS_EXTS = ('.ts', '.tsx', '.js', '.jsx')
+TS_EXTS = ('.ts', '.tsx')
+SECRET_VALUE = rb'\s*=\s*["\'][^"\']+["\']'
+
+# Keyword rules, checked together in a single scan per line:
+#   (category, extensions or None for all, keywords, ignore case, must follow)
+# Only the keyword itself is consumed; whatever has to follow it is a
+# lookahead, so one rule's match never hides text another rule needs.
+KEYWORD_RULES = [
+    ("DEBUG_TRASH", JS_EXTS, [b'console.log'], False, b''),
+    ("TYPE_COWARDICE", TS_EXTS, [b': any', b'as any'], False, b''),
+    ("SUPPRESSION", TS_EXTS, [b'@ts-ignore', b'@ts-nocheck'], False, b''),
+    ("UNFINISHED", None, [b'todo', b'fixme'], True, b''),
+    ("ADMITTED_CRIME", None, [b'hack'], True, b''),
+    ("SILENT_FAILURE", JS_EXTS + ('.java',), [b'catch'], False, rb'\s*\([^)]*\)\s*{\s*}'),
+    ("MAGIC_NUMBER", JS_EXTS + ('.py',), [b'=', b'<', b'>'], False, rb'\s*\d{3}'),
+    ("HARDCODED_PASSWORD", None, [b'password'], True, SECRET_VALUE),
+    ("HARDCODED_API_KEY", None, [b'api_key', b'api-key', b'apikey'], True, SECRET_VALUE),
+    ("HARDCODED_SECRET", None, [b'secret'], True, SECRET_VALUE),
+]
+SECRET_CATEGORIES = ("HARDCODED_PASSWORD", "HARDCODED_API_KEY", "HARDCODED_SECRET")
+# Left to the AST when a Python file parses
+AST_CATEGORIES = ("MAGIC_NUMBER",)
+MAX_FUNCTION_LINES = 50
+MAX_NESTING_DEPTH = 4
+MAGIC_VALUE = re.compile(rb'\s*(\d+)')
+
+# Rules anchored at the start of a line: print() debugging in Python,
+# function declarations (for GOD_FUNCTION) in JavaScript/TypeScript.
+PY_PRINT = re.compile(rb'\s*print\s*\(')
+FUNCTION_START = re.compile(rb'\s*(?:function|const\s+\w+\s*=[^\r\n]*=>|async\s+function)')
+
+def _single_line(pattern: bytes) -> bytes:
+    """Rewrite a line rule so a whole-file scan cannot run past a line break."""
+    pattern = re.sub(rb'\[\^(?!\\r\\n)', rb'[^\\r\\n', pattern)
+    return pattern.replace(rb'\s', rb'[^\S\r\n]')
+
+
+class LineMatcher:
+    """All keyword rules for one extension, compiled into one alternation.
+
+    Every branch starts with a case-sensitive literal byte (case-insensitive
+    keywords get one branch per case of their first letter), which lets the
+    regex engine skip ahead to candidate bytes instead of trying each rule
+    at every position. An empty group right after that byte tells scan()
+    which rule matched.
+
+    file_pattern is the whole-file variant used by scan_file(). On top of
+    the keywords it flags, by the same literal-first trick, every line a
+    line-level rule could fire on: long lines and line-start rules (right
+    after a line break), a second '?' (ternaries) and braces (function
+    tracking).
+
+    parsed=True is for Python files whose AST was read: print() calls and
+    magic numbers come from the tree instead, so those rules are left out.
+    """
+
+    def __init__(self, ext: str, parsed: bool = False):
+        branches = []
+        file_branches = []
+        self.categories = [None]
+        for category, extensions, keywords, ignore_case, follow in KEYWORD_RULES:
+            if extensions is not None and ext not in extensions:
+                continue
+            if parsed and category in AST_CATEGORIES:
+                continue
+            for keyword in keywords:
+                first, rest = keyword[:1], re.escape(keyword[1:])
+                if ignore_case:
+                    rest = b'(?i:' + rest + b')'
+                firsts = {first.lower(), first.upper()} if ignore_case else {first}
+                for lead in sorted(firsts):
+                    branch = re.escape(lead) + b'()' + rest
+                    branches.append(branch + (b'(?=' + follow + b')' if follow else b''))
+                    file_branches.append(
+                        branch + (b'(?=' + _single_line(follow) + b')' if follow else b''))
+                    self.categories.append(category)
+        self.pattern = re.compile(b'|'.join(branches))
+
+        if parsed:
+            self.line_start = None
+        elif ext == '.py':
+            self.line_start = PY_PRINT
+        elif ext in JS_EXTS:
+            self.line_start = FUNCTION_START
+        else:
+            self.line_start = None
+
+        line_rules = rb'[^\r\n]{121}'
+        if self.line_start:
+            line_rules += b'|' + _single_line(self.line_start.pattern)
+        self.first_line = re.compile(line_rules)
+        file_branches += [
+            rb'\n()(?=' + line_rules + b')',
+            rb'\r()(?=' + line_rules + b')',
+            rb'\?()(?=[^\r\n?]*\?)',
+        ]
+        self.categories += ["LINE"] * 3
+        if ext in JS_EXTS:
+            file_branches += [rb'\{()', rb'\}()']
+            self.categories += ["BRACES"] * 2
+        self.file_pattern = re.compile(b'|'.join(file_branches))
+
+    def scan(self, line: bytes) -> dict:
+        """Map each rule category found in the line to its first match span."""
+        found = {}
+        for match in self.pattern.finditer(line):
+            found.setdefault(self.categories[match.lastindex], match.span())
+        return found
+
+    def scan_file(self, index: LineIndex):
+        """Run every rule over a whole file at once.
+
+        Returns ({line number: {category: span}}, brace line numbers). The
+        first holds each line that needs a full check, with keyword spans
+        relative to the line; the second holds lines that only matter for
+        function tracking.
+        """
+        found = {}
+        braces = set()
+        starts = index.starts
+        categories = self.categories
+        if self.first_line.match(index.data):
+            found[1] = {}
+        for match in self.file_pattern.finditer(index.data):
+            category = categories[match.lastindex]
+            number = index.line_number(match.start(match.lastindex))
+            if category == "BRACES":
+                braces.add(number)
+                continue
+            line = found.setdefault(number, {})
+            if category != "LINE" and category not in line:
+                start = starts[number - 1]
+                line[category] = (match.start() - start, match.end() - start)
+        return found, braces
+
+
+LINE_MATCHERS = {ext: LineMatcher(ext) for ext in JS_EXTS + ('.py', '.java', '')}
+PARSED_PY_MATCHER = LineMatcher('.py', parsed=True)
+
+
+class FunctionTracker:
+    """Follows brace depth to measure function length for GOD_FUNCTION.
+
+    Lengths are worked out from line numbers, so only lines that start a
+    function or contain braces have to be fed to step().
+    """
+
+    def __init__(self):
+        self.start = None
+        self.start_depth = None
+        self.started = False
+        self.depth = 0
+
+    def step(self, i: int, line: bytes, at_start: bool, violations: List[Violation]):
+        open_count = line.count(b'{')
+        close_count = line.count(b'}')
+        if at_start:
+            self.finish(i - 1, violations)
+            self.start = i
+            self.start_depth = self.depth
+            self.started = False
+
+        self.depth += open_count - close_count
+        if self.start:
+            if open_count > 0:
+                self.started = True
+            if self.started and self.depth <= self.start_depth:
+                self.finish(i, violations)
+                self.start = None
+                self.start_depth = None
+                self.started = False
+
+    def finish(self, last_line: int, violations: List[Violation]):
+        """Report the open function if it ran past 50 lines by last_line."""
+        if not self.start:
+            return
+        length = last_line - self.start + 1
+        if length > MAX_FUNCTION_LINES:
+            violations.append(Violation(
+                self.start, "GOD_FUNCTION",
+                f"Function is {length} lines. Max 50. Split it up.",
+                "CRITICAL" if length > 100 else "MAJOR"
+            ))
+
+
+def _snippet(line: bytes, width: int = 60) -> str:
+    """Decode a reported line for display."""
+    return decode(line).strip()[:width]
+
+
+def analyze_file(filepath: Path, engine: str = "line", use_cache: bool = True) -> List[Violation]:
+    """Perform deep analysis on a single file. No mercy.
+
+    engine picks how the file is walked: "line" runs the rules line by line,
+    "scan" runs them over the whole file and only visits lines with hits.
+    Both report exactly the same violations.
+
+    Python files that parse are also judged on their AST (see
+    py_analyzer): real function lengths, nesting depth, print() calls and
+    magic numbers. With use_cache, those facts are kept by content hash in
+    ~/.sergeant/cache, so trying an unchanged file again skips the parse.
+    Files that do not parse fall back to the line rules alone.
+
+    Binaries, minified and generated files are not tried: they come back as
+    a single DISMISSED entry (see dismissal()) saying why.
+    """
     violations = []
     
-    try:
-        content = filepath.read_text(encoding='utf-8', errors='ignore')
-        lines = content.split('\n')
-    except Exception as e:
-        return [Violation(0, "UNREADABLE", f"Cannot read file: {e}", "CRITICAL")]
-    
-    ext = filepath.suffix.lower()
-    total_lines = len(lines)
+    with ExitStack() as stack:
+        try:
+            data = stack.enter_context(open_source(filepath))
+        except Exception as e:
+            return [Violation(0, "UNREADABLE", f"Cannot read file: {e}", "CRITICAL")]
+        
+        reason = classify_payload(data, filepath.name)
+        if reason:
+            return [Violation(0, "NOT_SOURCE", reason, "DISMISSED")]
+        
+        ext = filepath.suffix.lower()
+        facts = python_facts(data, use_cache) if ext == '.py' else None
+        if facts:
+            total_lines = ENGINES[engine](data, ext, violations, PARSED_PY_MATCHER)
+            violations.extend(_python_violations(facts, data))
+            violations.sort(key=lambda v: v.line)
+        else:
+            total_lines = ENGINES[engine](data, ext, violations)
     
     # File length check
     if total_lines > 500:
-        violations.append(Violation(
+        violations.insert(0, Violation(
             0, "BLOAT", 
             f"File is {total_lines} lines. Max 300 recommended. This is a novel, not code.",
             "WAR_CRIME"
         ))
     elif total_lines > 300:
-        violations.append(Violation(
+        violations.insert(0, Violation(
             0, "BLOAT", 
             f"File is {total_lines} lines. Getting chunky. Consider splitting.",
             "MAJOR"
         ))
-    
-    # Line-by-line analysis
-    current_function_start = None
-    current_function_lines = 0
-    brace_depth = 0
-    function_start_depth = None
-    function_started = False
-    max_line_length = 0
-    
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-        line_len = len(line)
-        max_line_length = max(max_line_length, line_len)
-        
-        # Long lines
-        if line_len > 120:
-            violations.append(Violation(
-                i, "LINE_LENGTH",
-                f"Line is {line_len} chars. We have horizontal scrolling trauma here.",
-                "MINOR",
-                line[:80] + "..."
-            ))
-        
-        # Console.log / print debugging
-        if ext in ['.ts', '.tsx', '.js', '.jsx']:
-            if 'console.log' in line and '//' not in line.split('console.log')[0]:
-                violations.append(Violation(
-                    i, "DEBUG_TRASH",
-                    "console.log left in code. Clean up after yourself, soldier.",
-                    "MINOR",
-                    stripped[:60]
-                ))
-        
-        if ext == '.py':
-            if re.match(r'^\s*print\s*\(', line) and '#' not in line.split('print')[0]:
-                violations.append(Violation(
-                    i, "DEBUG_TRASH",
-                    "print() left in code. Use proper logging.",
-                    "MINOR",
-                    stripped[:60]
-                ))
-        
-        # Any type abuse (TypeScript)
-        if ext in ['.ts', '.tsx']:
-            if ': any' in line or 'as any' in line:
-                violations.append(Violation(
-                    i, "TYPE_COWARDICE",
-                    "Using 'any' is surrender. Fight for your types.",
-                    "MAJOR",
-                    stripped[:60]
-                ))
-            
-            # @ts-ignore
-            if '@ts-ignore' in line or '@ts-nocheck' in line:
-                violations.append(Violation(
-                    i, "SUPPRESSION",
-                    "Suppressing TypeScript errors. Coward's way out.",
-                    "CRITICAL",
-                    stripped[:60]
-                ))
-        
-        # TODO/FIXME
-        if 'TODO' in line.upper() or 'FIXME' in line.upper():
-            violations.append(Violation(
-                i, "UNFINISHED",
-                "TODO/FIXME found. Either do it or delete it.",
-                "MINOR",
-                stripped[:60]
+
+    return violations
+
+
+def _python_violations(facts: dict, data) -> List[Violation]:
+    """Violations from the AST facts of a Python file (see py_analyzer)."""
+    found = []
+    for line, name, length in facts['functions']:
+        if length > MAX_FUNCTION_LINES:
+            found.append(Violation(
+                line, "GOD_FUNCTION",
+                f"Function {name}() is {length} lines. Max {MAX_FUNCTION_LINES}. Split it up.",
+                "CRITICAL" if length > 100 else "MAJOR"
             ))
-        
-        # HACK comments
-        if 'HACK' in line.upper():
-            violations.append(Violation(
-                i, "ADMITTED_CRIME",
-                "Developer admits this is a hack. At least they're honest.",
-                "MAJOR",
-                stripped[:60]
+    for line, name, depth in facts['nesting']:
+        if depth > MAX_NESTING_DEPTH:
+            # Reported at the outermost statement of the nest
+            where = f"This statement in {name}()" if name else "This module level statement"
+            found.append(Violation(
+                line, "DEEP_NESTING",
+                f"{where} nests {depth} blocks deep. Max {MAX_NESTING_DEPTH}. Flatten it.",
+                "CRITICAL" if depth > MAX_NESTING_DEPTH + 2 else "MAJOR"
             ))
-        
-        # Empty catch blocks
-        if ext in ['.ts', '.tsx', '.js', '.jsx', '.java']:
-            if re.search(r'catch\s*\([^)]*\)\s*{\s*}', line):
-                violations.append(Violation(
-                    i, "SILENT_FAILURE",
-                    "Empty catch block. Errors scream into the void.",
-                    "CRITICAL",
-                    stripped[:60]
-                ))
-        
-        # Nested ternaries
-        if line.count('?') >= 2 and line.count(':') >= 2:
-            violations.append(Violation(
-                i, "TERNARY_HELL",
-                "Nested ternaries. This isn't a riddle contest.",
-                "MAJOR",
-                stripped[:60]
-            ))
-        
-        # Magic numbers
-        if ext in ['.ts', '.tsx', '.js', '.jsx', '.py']:
-            magic = re.findall(r'[=<>]\s*(\d{3,})', line)
-            if magic and 'const' not in line.lower() and '#' not in line:
-                violations.append(Violation(
-                    i, "MAGIC_NUMBER",
-                    f"Magic number {magic[0]}. Extract to named constant.",
-                    "MINOR",
-                    stripped[:60]
-                ))
-        
-        # God functions (track function length)
-        if ext in ['.ts', '.tsx', '.js', '.jsx']:
-            open_count = line.count('{')
-            close_count = line.count('}')
-            if re.match(r'^\s*(function|const\s+\w+\s*=.*=>|async\s+function)', line):
-                if current_function_start and current_function_lines > 50:
-                    violations.append(Violation(
-                        current_function_start, "GOD_FUNCTION",
-                        f"Function is {current_function_lines} lines. Max 50. Split it up.",
-                        "CRITICAL" if current_function_lines > 100 else "MAJOR"
-                    ))
-                current_function_start = i
-                current_function_lines = 0
-                function_start_depth = brace_depth
-                function_started = False
-
-            brace_depth += open_count - close_count
-            if current_function_start:
-                current_function_lines += 1
-                if open_count > 0:
-                    function_started = True
-                if function_started and brace_depth <= function_start_depth:
-                    if current_function_lines > 50:
-                        violations.append(Violation(
-                            current_function_start, "GOD_FUNCTION",
-                            f"Function is {current_function_lines} lines. Max 50. Split it up.",
-                            "CRITICAL" if current_function_lines > 100 else "MAJOR"
-                        ))
-                    current_function_start = None
-                    current_function_lines = 0
-                    function_start_depth = None
-                    function_started = False
-        
-        # Hardcoded secrets
-        secret_patterns = [
-            (r'password\s*=\s*["\'][^"\']+["\']', "HARDCODED_PASSWORD"),
-            (r'api[_-]?key\s*=\s*["\'][^"\']+["\']', "HARDCODED_API_KEY"),
-            (r'secret\s*=\s*["\'][^"\']+["\']', "HARDCODED_SECRET"),
-        ]
-        for pattern, vtype in secret_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                violations.append(Violation(
-                    i, vtype,
-                    "HARDCODED CREDENTIALS. This is a FELONY.",
-                    "WAR_CRIME",
-                    "[REDACTED FOR SECURITY]"
-                ))
-    
-    if current_function_start and current_function_lines > 50:
+    if not facts['prints'] and not facts['magic']:
+        return found
+
+    index = LineIndex(data)
+    for line in facts['prints']:
+        found.append(Violation(
+            line, "DEBUG_TRASH",
+            "print() left in code. Use proper logging.",
+            "MINOR",
+            _snippet(index.line(line)[1])
+        ))
+    for line, number in facts['magic']:
+        text = index.line(line)[1]
+        # Same escape hatches as the line rule: a comment or a const
+        if b'#' in text or b'const' in text.lower():
+            continue
+        found.append(Violation(
+            line, "MAGIC_NUMBER",
+            f"Magic number {number}. Extract to named constant.",
+            "MINOR",
+            _snippet(text)
+        ))
+    return found
+
+
+def _analyze_lines(data, ext: str, violations: List[Violation], matcher=None) -> int:
+    """Line engine: every line gets its own keyword scan.
+    Returns the number of lines seen."""
+    matcher = matcher or LINE_MATCHERS.get(ext, LINE_MATCHERS[''])
+    tracker = FunctionTracker() if ext in JS_EXTS else None
+    i = 0
+    for i, line in enumerate(iter_lines(data), 1):
+        _check_line(i, line, matcher.scan(line), ext, matcher, tracker, violations)
+    if tracker:
+        tracker.finish(i, violations)
+    return i
+
+
+def _scan_lines(data, ext: str, violations: List[Violation], matcher=None) -> int:
+    """Scan engine: the rules run over the whole file in C, and only lines
+    they flag are visited. Returns the number of lines in the file."""
+    matcher = matcher or LINE_MATCHERS.get(ext, LINE_MATCHERS[''])
+    tracker = FunctionTracker() if ext in JS_EXTS else None
+    index = LineIndex(data)
+    found, braces = matcher.scan_file(index)
+    for i in sorted(braces.union(found)):
+        _, line = index.line(i)
+        if i in found:
+            _check_line(i, line, found[i], ext, matcher, tracker, violations)
+        else:
+            tracker.step(i, line, False, violations)
+    if tracker:
+        tracker.finish(len(index), violations)
+    return len(index)
+
+
+ENGINES = {"line": _analyze_lines, "scan": _scan_lines}
+
+
+def _check_line(i: int, line: bytes, found: dict, ext: str, matcher: LineMatcher,
+                tracker, violations: List[Violation]):
+    """Apply every rule to one line, given its keyword hits."""
+    at_start = bool(matcher.line_start and matcher.line_start.match(line))
+
+    # Byte length bounds the character count from above
+    line_len = len(line)
+    if line_len > 120:
+        line_len = len(decode(line))
+    
+    # Long lines
+    if line_len > 120:
+        violations.append(Violation(
+            i, "LINE_LENGTH",
+            f"Line is {line_len} chars. We have horizontal scrolling trauma here.",
+            "MINOR",
+            decode(line)[:80] + "..."
+        ))
+    
+    # Console.log / print debugging
+    debug = found.get("DEBUG_TRASH")
+    if debug and b'//' not in line[:debug[0]]:
+        violations.append(Violation(
+            i, "DEBUG_TRASH",
+            "console.log left in code. Clean up after yourself, soldier.",
+            "MINOR",
+            _snippet(line)
+        ))
+    
+    if at_start and ext == '.py':
+        violations.append(Violation(
+            i, "DEBUG_TRASH",
+            "print() left in code. Use proper logging.",
+            "MINOR",
+            _snippet(line)
+        ))
+    
+    # Any type abuse (TypeScript)
+    if "TYPE_COWARDICE" in found:
+        violations.append(Violation(
+            i, "TYPE_COWARDICE",
+            "Using 'any' is surrender. Fight for your types.",
+            "MAJOR",
+            _snippet(line)
+        ))
+    
+    # @ts-ignore
+    if "SUPPRESSION" in found:
+        violations.append(Violation(
+            i, "SUPPRESSION",
+            "Suppressing TypeScript errors. Coward's way out.",
+            "CRITICAL",
+            _snippet(line)
+        ))
+    
+    # TODO/FIXME
+    if "UNFINISHED" in found:
+        violations.append(Violation(
+            i, "UNFINISHED",
+            "TODO/FIXME found. Either do it or delete it.",
+            "MINOR",
+            _snippet(line)
+        ))
+    
+    # HACK comments
+    if "ADMITTED_CRIME" in found:
+        violations.append(Violation(
+            i, "ADMITTED_CRIME",
+            "Developer admits this is a hack. At least they're honest.",
+            "MAJOR",
+            _snippet(line)
+        ))
+    
+    # Empty catch blocks
+    if "SILENT_FAILURE" in found:
         violations.append(Violation(
-            current_function_start, "GOD_FUNCTION",
-            f"Function is {current_function_lines} lines. Max 50. Split it up.",
-            "CRITICAL" if current_function_lines > 100 else "MAJOR"
+            i, "SILENT_FAILURE",
+            "Empty catch block. Errors scream into the void.",
+            "CRITICAL",
+            _snippet(line)
         ))
+    
+    # Nested ternaries
+    if line.count(b'?') >= 2 and line.count(b':') >= 2:
+        violations.append(Violation(
+            i, "TERNARY_HELL",
+            "Nested ternaries. This isn't a riddle contest.",
+            "MAJOR",
+            _snippet(line)
+        ))
+    
+    # Magic numbers
+    magic = found.get("MAGIC_NUMBER")
+    if magic and b'const' not in line.lower() and b'#' not in line:
+        number = MAGIC_VALUE.match(line, magic[1]).group(1)
+        violations.append(Violation(
+            i, "MAGIC_NUMBER",
+            f"Magic number {decode(number)}. Extract to named constant.",
+            "MINOR",
+            _snippet(line)
+        ))
+    
+    # God functions (track function length)
+    if tracker:
+        tracker.step(i, line, at_start, violations)
+    
+    # Hardcoded secrets
+    for vtype in SECRET_CATEGORIES:
+        if vtype in found:
+            violations.append(Violation(
+                i, vtype,
+                "HARDCODED CREDENTIALS. This is a FELONY.",
+                "WAR_CRIME",
+                "[REDACTED FOR SECURITY]"
+            ))
+
+
+def severity_counts(violations: List[Violation]) -> dict:
+    """Count violations by severity."""
+    counts = {"MINOR": 0, "MAJOR": 0, "CRITICAL": 0, "WAR_CRIME": 0}
+    for v in violations:
+        counts[v.severity] = counts.get(v.severity, 0) + 1
+    return counts
+
+
+def _charges_summary(counts: dict) -> List[str]:
+    lines = []
+    lines.append("\n" + "-" * 70)
+    lines.append("📊 CHARGES SUMMARY")
+    lines.append("-" * 70)
+    lines.append(f"  🔵 Minor:    {counts['MINOR']}")
+    lines.append(f"  🟡 Major:    {counts['MAJOR']}")
+    lines.append(f"  🟠 Critical: {counts['CRITICAL']}")
+    lines.append(f"  🔴 War Crime: {counts['WAR_CRIME']}")
+    lines.append(f"\n  TOTAL VIOLATIONS: {sum(counts.values())}")
+    return lines
+
+
+def verdict_level(counts: dict) -> str:
+    """The charge a set of counts is sentenced on: WAR_CRIME, CRITICAL,
+    MAJOR or MINOR."""
+    if counts['WAR_CRIME'] > 0:
+        return "WAR_CRIME"
+    if counts['CRITICAL'] > 2:
+        return "CRITICAL"
+    if counts['MAJOR'] > 3:
+        return "MAJOR"
+    return "MINOR"
+
+
+def _sentence(counts: dict, defendant: str = "file") -> List[str]:
+    """Verdict banner and sentence for a set of charges."""
+    lines = ["\n" + "=" * 70]
+    level = verdict_level(counts)
+    
+    if level == "WAR_CRIME":
+        lines.append("               🔴 GUILTY - WAR CRIMES 🔴")
+        lines.append("=" * 70)
+        lines.append("\nVERDICT: Immediate refactoring required.")
+        lines.append(f"SENTENCE: This {defendant} is a danger to the entire operation.")
+        lines.append("         Deploy /run-delta for emergency stabilization.")
+    elif level == "CRITICAL":
+        lines.append("              🟠 GUILTY - CRITICAL FAILURES 🟠")
+        lines.append("=" * 70)
+        lines.append("\nVERDICT: Significant violations detected.")
+        lines.append("SENTENCE: Prioritize fixes before any new features.")
+    elif level == "MAJOR":
+        lines.append("              🟡 GUILTY - MAJOR VIOLATIONS 🟡")
+        lines.append("=" * 70)
+        lines.append("\nVERDICT: Multiple issues require attention.")
+        lines.append("SENTENCE: Schedule cleanup sprint.")
+    else:
+        lines.append("              🔵 GUILTY - MINOR INFRACTIONS 🔵")
+        lines.append("=" * 70)
+        lines.append("\nVERDICT: Minor issues detected.")
+        lines.append("SENTENCE: Fix during regular maintenance.")
+    
+    return lines
 
-    return violations
+
+def case_record(filepath: Path, violations: List[Violation]) -> dict:
+    """One file's verdict as a JSON-ready dict.
+
+    verdict is DISMISSED (with the reason), ACQUITTED, or the charge the
+    file is sentenced on.
+    """
+    reason = dismissal(violations)
+    if reason:
+        return {'type': 'case', 'file': str(filepath), 'verdict': "DISMISSED",
+                'reason': reason, 'counts': severity_counts([]), 'violations': []}
+    counts = severity_counts(violations)
+    return {
+        'type': 'case',
+        'file': str(filepath),
+        'verdict': verdict_level(counts) if violations else "ACQUITTED",
+        'counts': counts,
+        'violations': [asdict(v) for v in violations],
+    }
 
 
 def generate_verdict(filepath: Path, violations: List[Violation]) -> str:
@@ -223,6 +569,15 @@ def generate_verdict(filepath: Path, violations: List[Violation]) -> str:
     report.append(f"\n📁 DEFENDANT: {filepath}")
     report.append(f"📅 DATE: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M')}")
     
+    reason = dismissal(violations)
+    if reason:
+        report.append("\n" + "=" * 70)
+        report.append("                  🚫 CASE DISMISSED 🚫")
+        report.append("=" * 70)
+        report.append(f"\nNot source code: {reason}.")
+        report.append("The court does not try bundles, binaries or machine output.")
+        return "\n".join(report)
+    
     if not violations:
         report.append("\n" + "=" * 70)
         report.append("                    ✅ ACQUITTED ✅")
@@ -231,19 +586,8 @@ def generate_verdict(filepath: Path, violations: List[Violation]) -> str:
         report.append("Don't get cocky, Private. Stay vigilant.")
         return "\n".join(report)
     
-    # Count by severity
-    counts = {"MINOR": 0, "MAJOR": 0, "CRITICAL": 0, "WAR_CRIME": 0}
-    for v in violations:
-        counts[v.severity] = counts.get(v.severity, 0) + 1
-    
-    report.append("\n" + "-" * 70)
-    report.append("📊 CHARGES SUMMARY")
-    report.append("-" * 70)
-    report.append(f"  🔵 Minor:    {counts['MINOR']}")
-    report.append(f"  🟡 Major:    {counts['MAJOR']}")
-    report.append(f"  🟠 Critical: {counts['CRITICAL']}")
-    report.append(f"  🔴 War Crime: {counts['WAR_CRIME']}")
-    report.append(f"\n  TOTAL VIOLATIONS: {len(violations)}")
+    counts = severity_counts(violations)
+    report.extend(_charges_summary(counts))
     
     # List violations
     report.append("\n" + "-" * 70)
@@ -265,29 +609,162 @@ def generate_verdict(filepath: Path, violations: List[Violation]) -> str:
             report.append(f"   └─ Code: {v.code_snippet}")
     
     # Verdict
-    report.append("\n" + "=" * 70)
+    report.extend(_sentence(counts))
     
-    if counts['WAR_CRIME'] > 0:
-        report.append("               🔴 GUILTY - WAR CRIMES 🔴")
-        report.append("=" * 70)
-        report.append("\nVERDICT: Immediate refactoring required.")
-        report.append("SENTENCE: This file is a danger to the entire operation.")
-        report.append("         Deploy /run-delta for emergency stabilization.")
-    elif counts['CRITICAL'] > 2:
-        report.append("              🟠 GUILTY - CRITICAL FAILURES 🟠")
-        report.append("=" * 70)
-        report.append("\nVERDICT: Significant violations detected.")
-        report.append("SENTENCE: Prioritize fixes before any new features.")
-    elif counts['MAJOR'] > 3:
-        report.append("              🟡 GUILTY - MAJOR VIOLATIONS 🟡")
-        report.append("=" * 70)
-        report.append("\nVERDICT: Multiple issues require attention.")
-        report.append("SENTENCE: Schedule cleanup sprint.")
-    else:
-        report.append("              🔵 GUILTY - MINOR INFRACTIONS 🔵")
+    report.append("\n\"Every line of code is a responsibility, Private.\"")
+    report.append("    - Sergeant Claude, ASF")
+    report.append("=" * 70)
+    
+    return "\n".join(report)
+
+
+def collect_targets(target: str) -> List[Path]:
+    """Expand a --batch target into the files to try.
+
+    target is a directory (every code file in it, skipping the same
+    directories and ignored files recon does), a glob pattern, a file listing one path per
+    line, or "-" to read that list from stdin.
+    """
+    if target == "-":
+        return _listed_paths(sys.stdin)
+    
+    path = Path(target)
+    if path.is_dir():
+        from recon import CODE_EXTENSIONS, IGNORE_DIRS
+        from walker import walk
+        files = []
+        for rel_root, dirs, entries in walk(path, IGNORE_DIRS):
+            files.extend(Path(entry.path) for entry in entries
+                         if os.path.splitext(entry.name)[1].lower() in CODE_EXTENSIONS)
+        return files
+    
+    if path.is_file():
+        with open(path, encoding='utf-8') as f:
+            return _listed_paths(f)
+    
+    return [Path(p) for p in sorted(glob.glob(target, recursive=True))
+            if os.path.isfile(p)]
+
+
+def _listed_paths(lines) -> List[Path]:
+    return [Path(line.strip()) for line in lines if line.strip()]
+
+
+def _try_all(filepaths: List[Path], engine: str, use_cache: bool) -> list:
+    return [(filepath, analyze_file(filepath, engine, use_cache)) for filepath in filepaths]
+
+
+def court_martial_batch(filepaths: List[Path], engine: str = "line", jobs: int = 1,
+                        use_cache: bool = True):
+    """Try many files in one process, or across a pool of jobs workers.
+
+    Yields (filepath, violations) as each file is judged. With a pool,
+    files go out in small chunks and come back in completion order.
+    """
+    if jobs <= 1:
+        for filepath in filepaths:
+            yield filepath, analyze_file(filepath, engine, use_cache)
+        return
+    
+    chunksize = max(1, min(32, len(filepaths) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(_try_all, filepaths[i:i + chunksize], engine, use_cache)
+            for i in range(0, len(filepaths), chunksize)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+class Docket:
+    """Running tally of a batch: what the aggregate verdict needs and no more.
+
+    Only the counts of each convicted file are kept, not its violations, so
+    a batch can stream verdicts without holding them all.
+    """
+
+    def __init__(self):
+        self.defendants = 0
+        self.dismissed = 0
+        self.guilty = []  # (filepath, counts, total)
+        self.totals = {"MINOR": 0, "MAJOR": 0, "CRITICAL": 0, "WAR_CRIME": 0}
+
+    def add(self, filepath: Path, violations: List[Violation]):
+        self.defendants += 1
+        if dismissal(violations):
+            self.dismissed += 1
+        elif violations:
+            counts = severity_counts(violations)
+            self.guilty.append((filepath, counts, len(violations)))
+            for severity, count in counts.items():
+                self.totals[severity] = self.totals.get(severity, 0) + count
+
+    @property
+    def acquitted(self) -> int:
+        return self.defendants - len(self.guilty) - self.dismissed
+
+    def most_wanted(self, limit: int = 10) -> list:
+        """Worst offenders first: war crimes, then criticals, majors, minors."""
+        def rap_sheet(entry):
+            filepath, counts, total = entry
+            return (-counts['WAR_CRIME'], -counts['CRITICAL'], -counts['MAJOR'],
+                    -total, str(filepath))
+        return sorted(self.guilty, key=rap_sheet)[:limit]
+
+    def summary(self, most_wanted: int = 10) -> dict:
+        """The aggregate verdict as a JSON-ready dict."""
+        return {
+            'type': 'summary',
+            'defendants': self.defendants,
+            'acquitted': self.acquitted,
+            'convicted': len(self.guilty),
+            'dismissed': self.dismissed,
+            'counts': self.totals,
+            'verdict': verdict_level(self.totals) if self.guilty else "ACQUITTED",
+            'most_wanted': [
+                {'file': str(filepath), 'counts': counts, 'total': total}
+                for filepath, counts, total in self.most_wanted(most_wanted)
+            ],
+        }
+
+
+def generate_batch_verdict(docket: Docket, most_wanted: int = 10) -> str:
+    """Aggregate verdict over a batch's docket."""
+    report = []
+    
+    report.append("=" * 70)
+    report.append("      ⚖️  GENERAL COURT MARTIAL - AGGREGATE VERDICT  ⚖️")
+    report.append("=" * 70)
+    
+    guilty = docket.guilty
+    report.append(f"\n📁 DEFENDANTS: {docket.defendants} files")
+    report.append(f"✅ ACQUITTED:  {docket.acquitted}")
+    report.append(f"⛓️  CONVICTED:  {len(guilty)}")
+    if docket.dismissed:
+        report.append(f"🚫 DISMISSED:  {docket.dismissed} (not source)")
+    
+    if not guilty:
+        report.append("\n" + "=" * 70)
+        report.append("                    ✅ ALL ACQUITTED ✅")
         report.append("=" * 70)
-        report.append("\nVERDICT: Minor issues detected.")
-        report.append("SENTENCE: Fix during regular maintenance.")
+        report.append("\nNo violations in any file. The unit passes inspection.")
+        report.append("Don't get cocky, Private. Stay vigilant.")
+        return "\n".join(report)
+    
+    totals = docket.totals
+    report.extend(_charges_summary(totals))
+    
+    report.append("\n" + "-" * 70)
+    report.append("🎯 MOST WANTED")
+    report.append("-" * 70)
+    for filepath, counts, total in docket.most_wanted(most_wanted):
+        report.append(
+            f"  {total:4} violations  "
+            f"🔴 {counts['WAR_CRIME']} 🟠 {counts['CRITICAL']} "
+            f"🟡 {counts['MAJOR']} 🔵 {counts['MINOR']}  {filepath}"
+        )
+    
+    report.extend(_sentence(totals, defendant="codebase"))
     
     report.append("\n\"Every line of code is a responsibility, Private.\"")
     report.append("    - Sergeant Claude, ASF")
@@ -297,12 +774,35 @@ def generate_verdict(filepath: Path, violations: List[Violation]) -> str:
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: court_martial.py <file_path>")
-        print("\nFull breakdown of a specific file. No mercy.")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Full breakdown of a specific file. No mercy.")
+    parser.add_argument("file_path", nargs="?", help="file to court martial")
+    parser.add_argument("--batch", metavar="TARGET",
+                        help="try many files in one run: a directory, a glob, "
+                             "a file listing paths, or - for that list on stdin")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="with --batch, judge files across N worker "
+                             "processes (0 = one per CPU)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="line",
+                        help="line: rules run line by line (default); "
+                             "scan: rules run over the whole file at once")
+    parser.add_argument("--format", choices=("text", "json", "ndjson"), default="text",
+                        help="text verdicts (default), one JSON document, or "
+                             "NDJSON: a line per file as it is judged, then "
+                             "a summary line with --batch")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="parse every Python file afresh and don't update "
+                             "~/.sergeant/cache")
+    args = parser.parse_args()
+    
+    if args.batch:
+        run_batch(args.batch, args.engine, args.jobs, args.format, not args.no_cache)
+        return
     
-    filepath = Path(sys.argv[1])
+    if not args.file_path:
+        parser.error("a file_path or --batch TARGET is required")
+    
+    filepath = Path(args.file_path)
     
     if not filepath.exists():
         print(f"❌ File does not exist: {filepath}")
@@ -312,8 +812,43 @@ def main():
         print(f"❌ Not a file: {filepath}")
         sys.exit(1)
     
-    violations = analyze_file(filepath)
-    print(generate_verdict(filepath, violations))
+    violations = analyze_file(filepath, engine=args.engine, use_cache=not args.no_cache)
+    if args.format == "text":
+        print(generate_verdict(filepath, violations))
+    else:
+        print(json.dumps(case_record(filepath, violations), indent=2 if args.format == "json" else None))
+
+
+def run_batch(target: str, engine: str, jobs: int, output: str = "text",
+              use_cache: bool = True):
+    """Stream a verdict per file as each one is judged, then the aggregate.
+
+    output is text, ndjson (a JSON line per file, then a summary line) or
+    json (one document with every case, written at the end).
+    """
+    filepaths = collect_targets(target)
+    if not filepaths:
+        print(f"❌ No files to court martial in: {target}")
+        sys.exit(1)
+    
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    docket = Docket()
+    cases = []
+    for filepath, violations in court_martial_batch(filepaths, engine, jobs, use_cache):
+        docket.add(filepath, violations)
+        if output == "json":
+            cases.append(case_record(filepath, violations))
+        elif output == "ndjson":
+            print(json.dumps(case_record(filepath, violations)), flush=True)
+        else:
+            print(generate_verdict(filepath, violations) + "\n", flush=True)
+    
+    if output == "json":
+        print(json.dumps({'cases': cases, 'summary': docket.summary()}, indent=2))
+    elif output == "ndjson":
+        print(json.dumps(docket.summary()), flush=True)
+    else:
+        print(generate_batch_verdict(docket))
 
 
 if __name__ == "__main__":
@@ -4,10 +4,11 @@ Daily Challenge System for Sergeant Claude
 Rotating challenges with bonus XP rewards
 """
 
-import json
 import random
-from datetime import datetime, date
-from pathlib import Path
+from datetime import date
+
+from profile_schema import add_xp, load_profile, profile_transaction
+from state_io import StateError
 
 # Challenge pool organized by difficulty
 CHALLENGES = {
@@ -96,40 +97,6 @@ CHALLENGES = {
     ]
 }
 
-def get_challenges_path():
-    """Get the challenges state file path"""
-    return Path.home() / ".sergeant_challenges.json"
-
-def get_profile_path():
-    """Get the profile file path"""
-    return Path.home() / ".sergeant_profile.json"
-
-def load_challenges_state():
-    """Load current challenge state"""
-    path = get_challenges_path()
-    if path.exists():
-        with open(path, 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_challenges_state(state):
-    """Save challenge state"""
-    with open(get_challenges_path(), 'w') as f:
-        json.dump(state, f, indent=2)
-
-def load_profile():
-    """Load user profile"""
-    path = get_profile_path()
-    if path.exists():
-        with open(path, 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_profile(profile):
-    """Save user profile"""
-    with open(get_profile_path(), 'w') as f:
-        json.dump(profile, f, indent=2)
-
 def get_daily_seed():
     """Get a seed based on today's date for consistent daily selection"""
     today = date.today()
@@ -153,58 +120,56 @@ def select_daily_challenges():
 
     return daily
 
-def get_todays_challenges():
-    """Get or generate today's challenges"""
-    state = load_challenges_state()
+def get_todays_challenges(profile):
+    """Today's challenge state from profile, rolling over to a new day if needed"""
+    state = profile.get("challenges") or {}
     today = str(date.today())
 
     if state.get("date") != today:
         # New day, new challenges
         state = select_daily_challenges()
-        save_challenges_state(state)
+        profile["challenges"] = state
 
     return state
 
 def update_progress(action, count=1):
     """Update progress towards daily challenges"""
-    state = get_todays_challenges()
-    profile = load_profile()
-
-    # Update daily progress
-    if "daily_progress" not in state:
-        state["daily_progress"] = {}
+    with profile_transaction("challenge", action=action, count=count) as profile:
+        state = get_todays_challenges(profile)
 
-    current = state["daily_progress"].get(action, 0)
-    state["daily_progress"][action] = current + count
+        # Update daily progress
+        if "daily_progress" not in state:
+            state["daily_progress"] = {}
 
-    # Check for completions
-    newly_completed = []
-    for challenge in state["challenges"]:
-        if challenge["id"] in state.get("completed", []):
-            continue
+        current = state["daily_progress"].get(action, 0)
+        state["daily_progress"][action] = current + count
 
-        completed = True
-        for req_key, req_val in challenge["requirement"].items():
-            progress = state["daily_progress"].get(req_key, 0)
-            if progress < req_val:
-                completed = False
-                break
+        # Check for completions
+        newly_completed = []
+        for challenge in state["challenges"]:
+            if challenge["id"] in state.get("completed", []):
+                continue
 
-        if completed:
-            state["completed"].append(challenge["id"])
-            newly_completed.append(challenge)
+            completed = True
+            for req_key, req_val in challenge["requirement"].items():
+                progress = state["daily_progress"].get(req_key, 0)
+                if progress < req_val:
+                    completed = False
+                    break
 
-            # Award XP
-            profile["xp"] = profile.get("xp", 0) + challenge["xp_reward"]
+            if completed:
+                state["completed"].append(challenge["id"])
+                newly_completed.append(challenge)
 
-    save_challenges_state(state)
-    save_profile(profile)
+                # Award XP
+                add_xp(profile, challenge["xp_reward"])
 
     return newly_completed
 
 def display_daily_challenges():
     """Display today's challenges with progress"""
-    state = get_todays_challenges()
+    # Selection is seeded by the date, so a new day needs no write to show
+    state = get_todays_challenges(load_profile())
     challenges = state["challenges"]
     progress = state.get("daily_progress", {})
     completed = state.get("completed", [])
@@ -260,7 +225,7 @@ def display_completion(challenge):
 ╚═══════════════════════════════════════════════════════════╝
 """)
 
-if __name__ == "__main__":
+def main():
     import sys
 
     if len(sys.argv) > 1:
@@ -279,3 +244,10 @@ if __name__ == "__main__":
             print("Usage: daily_challenges.py [show|progress <action> [count]]")
     else:
         display_daily_challenges()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except StateError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - FILE ACCESS
+Shared zero-copy file reader for recon and court martial.
+
+Files are memory-mapped and inspected as bytes. Nothing is decoded to
+text until a line actually has to be shown to the soldier.
+
+classify_payload() sniffs the head of a file first, so binaries, minified
+bundles and generated code are turned away before anything reads them in
+full.
+"""
+
+import codecs
+import math
+import mmap
+import re
+from bisect import bisect_right
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+CHUNK_SIZE = 1 << 20
+
+# Payload sniffing: only the first SNIFF_SIZE bytes (and the last
+# TAIL_SIZE) of a file are looked at
+SNIFF_SIZE = 4096
+TAIL_SIZE = 512
+MAX_ENTROPY = 7.0  # bits per byte; text stays well below, compressed data near 8
+MAX_AVERAGE_LINE = 200  # characters per line across the sniffed head
+MIN_LINE_SAMPLE = 1024  # heads shorter than this are too small to call minified
+HEADER_LINES = 10  # generated-file markers only count this close to the top
+GENERATED_SUFFIXES = (
+    '.min.js', '-min.js', '.bundle.js', '_pb2.py', '_pb2_grpc.py', '.pb.go',
+    '.designer.cs', '.g.cs',
+)
+# Generator headers: the wording tools use to describe the file itself,
+# so a comment merely mentioning generated code elsewhere does not count
+GENERATED_MARKER = re.compile(
+    rb'(?im)@generated\b|^[^\w\n]*(?:auto-?|automatically )generated\b|'
+    rb'\b(?:file|module|code) (?:is|was|has been) (?:auto-?|automatically )?generated\b|'
+    rb'\bcode generated .{0,80}do not edit|\bdo not edit this file|'
+    rb'\bgenerated by the protocol buffer compiler'
+)
+SOURCE_MAP = re.compile(rb'\s*(?:\)\]\}\'\s*)?\{\s*"version"\s*:\s*3\s*,')
+SOURCE_MAP_URL = re.compile(rb'[#@] sourceMappingURL=')
+
+# Universal newlines: CRLF, lone CR and LF all end a line
+LINE_BREAK = re.compile(rb'\r\n?|\n')
+LINE_FEED = re.compile(rb'\n')
+
+
+@contextmanager
+def open_source(filepath: Path):
+    """Map a file read-only and yield it as a bytes-like buffer.
+
+    Empty files cannot be mapped, so they come back as b''.
+    """
+    with open(filepath, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b''
+            return
+        try:
+            yield data
+        finally:
+            data.close()
+
+
+def iter_chunks(data, chunk_size: int = CHUNK_SIZE):
+    """Yield consecutive bytes slices of at most chunk_size."""
+    if len(data) <= chunk_size and isinstance(data, bytes):
+        if data:
+            yield data
+        return
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def decode(data) -> str:
+    """Decode bytes the same way open(..., errors='ignore') would."""
+    return bytes(data).decode('utf-8', errors='ignore')
+
+
+def count_lines(data, chunk_size: int = CHUNK_SIZE) -> int:
+    """Count lines the way len(f.readlines()) would in text mode.
+
+    Works chunk by chunk, so memory stays flat whatever the file size.
+    Universal newlines apply: LF, CRLF and a lone CR each end a line, and a
+    trailing partial line counts only if it decodes to some text.
+    """
+    lines = 0
+    trailing_text = False
+    tail_decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    previous = b''
+    for chunk in iter_chunks(data, chunk_size):
+        lines += chunk.count(b'\n')
+        if b'\r' in chunk or previous == b'\r':
+            lines += chunk.count(b'\r') - chunk.count(b'\r\n')
+            if previous == b'\r' and chunk.startswith(b'\n'):
+                lines -= 1  # CRLF split across two chunks
+            last_break = max(chunk.rfind(b'\n'), chunk.rfind(b'\r'))
+        else:
+            last_break = chunk.rfind(b'\n')
+        previous = chunk[-1:]
+
+        if last_break >= 0:
+            trailing_text = False
+            tail_decoder.reset()
+        tail = chunk[last_break + 1:]
+        if tail and not trailing_text:
+            trailing_text = bool(tail_decoder.decode(tail))
+    return lines + trailing_text
+
+
+def count_matches(pattern, data) -> int:
+    """Count non-overlapping matches of a compiled bytes pattern, in place."""
+    return sum(1 for _ in pattern.finditer(data))
+
+
+def iter_lines(data):
+    """Yield every line as bytes, without its line break.
+
+    Matches text.split('\\n') on the decoded file: a file that ends with a
+    line break yields a final empty line.
+    """
+    start = 0
+    for match in LINE_BREAK.finditer(data):
+        yield data[start:match.start()]
+        start = match.end()
+    yield data[start:]
+
+
+class LineIndex:
+    """Newline-offset index over a buffer, for whole-file scans.
+
+    Lines are numbered from 1 and split exactly like iter_lines, so a
+    match offset from re.finditer maps to the same line number the
+    line-by-line loop would report.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        breaks = LINE_BREAK if data.find(b'\r') >= 0 else LINE_FEED
+        self.starts = [0]
+        self.starts.extend([match.end() for match in breaks.finditer(data)])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line_number(self, offset: int) -> int:
+        """Line containing the byte at offset."""
+        return bisect_right(self.starts, offset)
+
+    def line(self, number: int):
+        """Return (start offset, line bytes without its line break)."""
+        start = self.starts[number - 1]
+        if number == len(self.starts):
+            return start, self.data[start:]
+        end = self.starts[number]
+        end -= 2 if self.data[end - 2:end] == b'\r\n' else 1
+        return start, self.data[start:end]
+
+
+def _entropy(sample: bytes) -> float:
+    """Shannon entropy of the byte distribution, in bits per byte."""
+    total = len(sample)
+    return -sum(n / total * math.log2(n / total) for n in Counter(sample).values())
+
+
+def classify_payload(data, name: str) -> Optional[str]:
+    """Why a code file is not worth analyzing, or None if it is source.
+
+    Cheap by design: the name, the first SNIFF_SIZE bytes and the last
+    TAIL_SIZE bytes are all that is looked at, whatever the file size.
+    Catches binaries (NUL bytes, near-random byte entropy), source maps,
+    minified code (long average lines), and generated code (well-known
+    file names, a generator's header, a sourceMappingURL trailer).
+    """
+    lowered = name.lower()
+    for suffix in GENERATED_SUFFIXES:
+        if lowered.endswith(suffix):
+            return f"generated ({suffix} file)"
+
+    head = bytes(data[:SNIFF_SIZE])
+    if b'\0' in head:
+        return "binary (NUL bytes)"
+    # Printable ASCII cannot reach MAX_ENTROPY, so only other bytes need counting
+    if not head.isascii():
+        entropy = _entropy(head)
+        if entropy > MAX_ENTROPY:
+            return f"binary ({entropy:.1f} bits/byte entropy)"
+    if SOURCE_MAP.match(head):
+        return "source map"
+
+    if len(head) >= MIN_LINE_SAMPLE:
+        # Characters, not bytes: CJK source takes three bytes a character
+        chars = len(head) if head.isascii() else len(head.decode('utf-8', errors='ignore'))
+        lines = head.count(b'\n') + head.count(b'\r') - head.count(b'\r\n') + 1
+        average = chars // lines
+        if average > MAX_AVERAGE_LINE:
+            return f"minified ({average} characters/line)"
+
+    header = b'\n'.join(LINE_BREAK.split(head, HEADER_LINES)[:HEADER_LINES])
+    marker = GENERATED_MARKER.search(header)
+    if marker:
+        return f"generated ('{decode(marker.group()).strip(' #/*-')}' header)"
+    if SOURCE_MAP_URL.search(data[-TAIL_SIZE:]):
+        return "generated (sourceMappingURL trailer)"
+    return None
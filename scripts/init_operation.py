@@ -8,6 +8,8 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+from state_io import write_text
+
 STATE_TEMPLATE = """# SITREP - {date}
 
 ## CURRENT RANK: Private
@@ -131,8 +133,8 @@ def init_operation(path: Path, name: str, description: str = ""):
     )
     
     # Write files
-    state_path.write_text(state_content, encoding="utf-8")
-    project_path.write_text(project_content, encoding="utf-8")
+    write_text(state_path, state_content)
+    write_text(project_path, project_content)
     
     return state_path, project_path
 
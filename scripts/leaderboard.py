@@ -5,62 +5,21 @@ Export your stats for flexing on other developers
 """
 
 import json
-import os
 from datetime import datetime
-from pathlib import Path
-
-RANKS = [
-    ("Recruit", 0, "Fresh Meat"),
-    ("Private", 500, "Boot"),
-    ("Private First Class", 1500, "Getting There"),
-    ("Corporal", 3500, "Not Terrible"),
-    ("Sergeant", 7000, "Competent"),
-    ("Staff Sergeant", 12000, "Reliable"),
-    ("Master Sergeant", 20000, "Seasoned"),
-    ("First Sergeant", 32000, "Veteran"),
-    ("Sergeant Major", 50000, "War Hero"),
-    ("Lieutenant", 75000, "Officer Material"),
-    ("Captain", 110000, "Leader"),
-    ("Major", 160000, "Strategist"),
-    ("Colonel", 230000, "Commander"),
-    ("General", 320000, "Legendary"),
-    ("Supreme Commander", 500000, "Mythic")
-]
-
-def get_profile_path():
-    """Get the profile file path"""
-    return Path.home() / ".sergeant_profile.json"
-
-def load_profile():
-    """Load user profile"""
-    path = get_profile_path()
-    if path.exists():
-        with open(path, 'r') as f:
-            return json.load(f)
-    return {
-        "xp": 0,
-        "bugs_fixed": 0,
-        "features_complete": 0,
-        "tests_written": 0,
-        "max_streak": 0,
-        "unlocked_achievements": []
-    }
+
+from profile_schema import load_profile, stat
+from ranks import load_ranks
+from state_io import StateError, write_json, write_text
 
 def get_rank(xp):
-    """Get current rank based on XP"""
-    current_rank = RANKS[0]
-    for rank in RANKS:
-        if xp >= rank[1]:
-            current_rank = rank
-        else:
-            break
-    return current_rank
+    """Get current rank based on XP ($SERGEANT_RANKS for a custom ladder)"""
+    return load_ranks().rank_for(xp)
 
 def export_markdown(profile, output_path=None):
     """Export stats as markdown for GitHub profile"""
     rank = get_rank(profile.get("xp", 0))
     xp = profile.get("xp", 0)
-    achievements = len(profile.get("unlocked_achievements", []))
+    achievements = len(profile.get("medals", []))
 
     md = f"""# 🎖️ Sergeant Claude Stats
 
@@ -70,8 +29,8 @@ def export_markdown(profile, output_path=None):
 
 | Stat | Value |
 |------|-------|
-| 🎖️ **Rank** | {rank[0]} |
-| ⭐ **Title** | {rank[2]} |
+| 🎖️ **Rank** | {rank['name']} |
+| ⭐ **Title** | {rank['title']} |
 | ⚡ **Total XP** | {xp:,} |
 | 🏅 **Achievements** | {achievements} / 15 |
 
@@ -79,12 +38,12 @@ def export_markdown(profile, output_path=None):
 
 | Metric | Count |
 |--------|-------|
-| 🐛 Bugs Fixed | {profile.get('bugs_fixed', 0):,} |
-| ✨ Features Shipped | {profile.get('features_complete', 0):,} |
-| 🧪 Tests Written | {profile.get('tests_written', 0):,} |
-| 🔥 Max Streak | {profile.get('max_streak', 0)} days |
-| ⚔️ Ambushes | {profile.get('ambushes', 0):,} |
-| 🏰 Fortifications | {profile.get('fortifications', 0):,} |
+| 🐛 Bugs Fixed | {stat(profile, 'bugs_fixed'):,} |
+| ✨ Features Shipped | {stat(profile, 'features_complete'):,} |
+| 🧪 Tests Written | {stat(profile, 'tests_written'):,} |
+| 🔥 Max Streak | {stat(profile, 'max_streak')} days |
+| ⚔️ Ambushes | {stat(profile, 'ambushes'):,} |
+| 🏰 Fortifications | {stat(profile, 'fortifications'):,} |
 
 ## Progress Bar
 
@@ -98,8 +57,7 @@ def export_markdown(profile, output_path=None):
 """
 
     if output_path:
-        with open(output_path, 'w') as f:
-            f.write(md)
+        write_text(output_path, md)
         print(f"Stats exported to {output_path}")
     else:
         print(md)
@@ -113,28 +71,27 @@ def export_json(profile, output_path=None):
     data = {
         "generated_at": datetime.now().isoformat(),
         "rank": {
-            "name": rank[0],
-            "title": rank[2],
-            "min_xp": rank[1]
+            "name": rank["name"],
+            "title": rank["title"],
+            "min_xp": rank["xp"]
         },
         "stats": {
             "xp": profile.get("xp", 0),
-            "bugs_fixed": profile.get("bugs_fixed", 0),
-            "features_complete": profile.get("features_complete", 0),
-            "tests_written": profile.get("tests_written", 0),
-            "max_streak": profile.get("max_streak", 0),
-            "ambushes": profile.get("ambushes", 0),
-            "fortifications": profile.get("fortifications", 0)
+            "bugs_fixed": stat(profile, "bugs_fixed"),
+            "features_complete": stat(profile, "features_complete"),
+            "tests_written": stat(profile, "tests_written"),
+            "max_streak": stat(profile, "max_streak"),
+            "ambushes": stat(profile, "ambushes"),
+            "fortifications": stat(profile, "fortifications")
         },
         "achievements": {
-            "unlocked": profile.get("unlocked_achievements", []),
-            "count": len(profile.get("unlocked_achievements", []))
+            "unlocked": profile.get("medals", []),
+            "count": len(profile.get("medals", []))
         }
     }
 
     if output_path:
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_json(output_path, data)
         print(f"Stats exported to {output_path}")
     else:
         print(json.dumps(data, indent=2))
@@ -147,10 +104,10 @@ def export_badge(profile):
     xp = profile.get("xp", 0)
 
     badges = {
-        "rank": f"![Rank](https://img.shields.io/badge/Rank-{rank[0].replace(' ', '%20')}-blue)",
+        "rank": f"![Rank](https://img.shields.io/badge/Rank-{rank['name'].replace(' ', '%20')}-blue)",
         "xp": f"![XP](https://img.shields.io/badge/XP-{xp:,}-green)",
-        "bugs": f"![Bugs Fixed](https://img.shields.io/badge/Bugs%20Fixed-{profile.get('bugs_fixed', 0)}-red)",
-        "streak": f"![Streak](https://img.shields.io/badge/Max%20Streak-{profile.get('max_streak', 0)}%20days-orange)"
+        "bugs": f"![Bugs Fixed](https://img.shields.io/badge/Bugs%20Fixed-{stat(profile, 'bugs_fixed')}-red)",
+        "streak": f"![Streak](https://img.shields.io/badge/Max%20Streak-{stat(profile, 'max_streak')}%20days-orange)"
     }
 
     print("Add these badges to your README:\n")
@@ -169,19 +126,19 @@ def display_leaderboard_card(profile):
 ╔═══════════════════════════════════════════════════════════╗
 ║               🏆 LEADERBOARD CARD 🏆                       ║
 ╠═══════════════════════════════════════════════════════════╣""")
-    print(f"║   🎖️  RANK: {rank[0]:<42} ║")
-    print(f"║   ⭐ TITLE: {rank[2]:<42} ║")
+    print(f"║   🎖️  RANK: {rank['name']:<42} ║")
+    print(f"║   ⭐ TITLE: {rank['title']:<42} ║")
     print(f"║   ⚡ XP: {xp:,:<44} ║")
     print("║                                                           ║")
-    print(f"║   🐛 Bugs Fixed: {profile.get('bugs_fixed', 0):<37} ║")
-    print(f"║   ✨ Features: {profile.get('features_complete', 0):<39} ║")
-    print(f"║   🧪 Tests: {profile.get('tests_written', 0):<42} ║")
-    print(f"║   🔥 Best Streak: {profile.get('max_streak', 0)} days{' ' * 33}║")
+    print(f"║   🐛 Bugs Fixed: {stat(profile, 'bugs_fixed'):<37} ║")
+    print(f"║   ✨ Features: {stat(profile, 'features_complete'):<39} ║")
+    print(f"║   🧪 Tests: {stat(profile, 'tests_written'):<42} ║")
+    print(f"║   🔥 Best Streak: {stat(profile, 'max_streak')} days{' ' * 33}║")
     print("║                                                           ║")
     print("║   github.com/juxstin1/sergeant-claude                     ║")
     print("╚═══════════════════════════════════════════════════════════╝")
 
-if __name__ == "__main__":
+def main():
     import sys
 
     profile = load_profile()
@@ -202,3 +159,10 @@ if __name__ == "__main__":
             print("Usage: leaderboard.py [markdown|json|badges|card] [output_path]")
     else:
         display_leaderboard_card(profile)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except StateError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
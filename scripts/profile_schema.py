@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - SOLDIER PROFILE
+The one profile every script reads and writes, and how to get at it.
+
+xp_tracker, achievements, daily_challenges and leaderboard all share
+~/.sergeant/profile.json (through the store picked by $SERGEANT_STORE):
+
+    xp, lifetime_xp, rank_index     experience and rank
+    stats                           action counters (bugs_fixed, ambushes, ...)
+    streak, combo, multiplier       award bonuses
+    achievements                    xp_tracker achievement ids, in earned order
+    medals                          achievements.py decorations, in earned order
+    challenges                      today's daily challenges and their progress
+    daily, titles, inventory, ...   the rest of xp_tracker's bookkeeping
+
+Older versions kept medals and flat counters in ~/.sergeant_profile.json and
+daily challenges in ~/.sergeant_challenges.json. The first access folds
+them into the shared profile and renames them to *.migrated.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from profile_store import ProfileStore, open_store
+
+LEGACY_PROFILE = ".sergeant_profile.json"
+LEGACY_CHALLENGES = ".sergeant_challenges.json"
+
+# Flat counter names used by medals, challenges and the leaderboard,
+# and where each one lives in the shared profile
+STAT_ALIASES = {
+    "operations_complete": "missions_completed",
+}
+
+# How merge_changes() combines a field two writers both changed
+COUNTER_KEYS = ("xp", "lifetime_xp")
+GROWING_KEYS = ("achievements", "medals", "titles", "inventory")
+HIGH_WATER_MARKS = {"streak": "longest", "combo": "highest"}
+
+
+def default_profile_path() -> Path:
+    return Path.home() / ".sergeant" / "profile.json"
+
+
+def new_profile() -> dict:
+    """A fresh recruit."""
+    return {
+        "xp": 0,
+        "lifetime_xp": 0,
+        "rank_index": 0,
+        "achievements": [],
+        "medals": [],
+        "titles": ["Recruit"],
+        "active_title": "Recruit",
+        "stats": {
+            "bugs_fixed": 0,
+            "tests_written": 0,
+            "files_created": 0,
+            "objectives_completed": 0,
+            "missions_completed": 0,
+            "clean_court_martials": 0,
+            "clean_court_martial_streak": 0,
+        },
+        "streak": {
+            "current": 0,
+            "longest": 0,
+            "last_active": None,
+        },
+        "combo": {
+            "current": 0,
+            "highest": 0,
+            "last_action": None,
+        },
+        "multiplier": {
+            "value": 1.0,
+            "expires": None,
+        },
+        "daily": {
+            "xp_earned": 0,
+            "actions": 0,
+            "date": None,
+        },
+        "challenges": {},
+        "inventory": [],
+        "created": datetime.now().isoformat(),
+        "last_session": None,
+    }
+
+
+def with_defaults(loaded: dict | None) -> dict:
+    """Fill a stored profile in with any missing fields, or start fresh."""
+    default = new_profile()
+    if loaded is None:
+        return default
+    for key in default:
+        if key not in loaded:
+            loaded[key] = default[key]
+    return loaded
+
+
+def stat(profile: dict, key: str) -> int:
+    """Read a counter by its flat name: "xp", "max_streak", "bugs_fixed", ..."""
+    if key == "xp":
+        return profile.get("xp", 0)
+    if key == "max_streak":
+        return profile.get("streak", {}).get("longest", 0)
+    if key == "current_streak":
+        return profile.get("streak", {}).get("current", 0)
+    return profile.get("stats", {}).get(STAT_ALIASES.get(key, key), 0)
+
+
+def add_xp(profile: dict, amount: int):
+    profile["xp"] = profile.get("xp", 0) + amount
+    profile["lifetime_xp"] = profile.get("lifetime_xp", 0) + amount
+
+
+def merge_changes(latest: dict, base: dict, mine: dict) -> dict:
+    """Apply what changed from base to mine onto latest, in place.
+
+    For a writer that kept the profile in memory (base is what it started
+    from, mine what it made of it) while other processes saved theirs.
+    Counters and stats gain mine's increments, lists gain mine's new
+    entries, streak and combo take mine with the best of both records,
+    and any other field mine changed replaces latest's. Fields mine left
+    alone keep whatever the other processes wrote.
+    """
+    for key, value in mine.items():
+        old = base.get(key)
+        if value == old:
+            continue
+        if key in COUNTER_KEYS:
+            latest[key] = latest.get(key, 0) + value - (old or 0)
+        elif key == "stats":
+            stats = latest.setdefault("stats", {})
+            old = old or {}
+            for name, count in value.items():
+                if count != old.get(name, 0):
+                    stats[name] = stats.get(name, 0) + count - old.get(name, 0)
+        elif key in GROWING_KEYS:
+            merged = latest.setdefault(key, [])
+            for item in value:
+                if item not in merged and item not in (old or ()):
+                    merged.append(item)
+        elif key in HIGH_WATER_MARKS:
+            best = HIGH_WATER_MARKS[key]
+            merged = dict(value)
+            merged[best] = max(merged.get(best, 0), latest.get(key, {}).get(best, 0))
+            latest[key] = merged
+        elif key == "rank_index":
+            latest[key] = max(latest.get(key, 0), value)
+        elif key == "daily" and value.get("date") == latest.get(key, {}).get("date"):
+            # Both wrote today's totals: add ours to theirs
+            since = old if old and old.get("date") == value.get("date") else {}
+            merged = dict(latest[key])
+            for field in ("xp_earned", "actions"):
+                merged[field] = merged.get(field, 0) + value.get(field, 0) - since.get(field, 0)
+            latest[key] = merged
+        else:
+            latest[key] = value
+    return latest
+
+
+def _legacy_files(store: ProfileStore) -> list:
+    # Only the default profile inherits the legacy files
+    if getattr(store, "path", None) != default_profile_path():
+        return []
+    home = Path.home()
+    return [path for path in (home / LEGACY_PROFILE, home / LEGACY_CHALLENGES) if path.exists()]
+
+
+def _fold_legacy(profile: dict, home: Path):
+    """Merge the pre-unification files into profile."""
+    from state_io import read_json
+
+    legacy = read_json(home / LEGACY_PROFILE) or {}
+    # Legacy XP came from medals and challenge rewards, which xp_tracker
+    # never saw, so it adds to the shared total rather than replacing it
+    add_xp(profile, legacy.get("xp", 0))
+    stats = profile["stats"]
+    for key in ("bugs_fixed", "tests_written", "features_complete", "operations_complete",
+                "ambushes", "fortifications"):
+        if key in legacy:
+            name = STAT_ALIASES.get(key, key)
+            stats[name] = max(stats.get(name, 0), legacy[key])
+    streak = profile["streak"]
+    streak["current"] = max(streak["current"], legacy.get("current_streak", 0))
+    streak["longest"] = max(streak["longest"], legacy.get("max_streak", 0), streak["current"])
+    for medal in legacy.get("unlocked_achievements", []):
+        if medal not in profile["medals"]:
+            profile["medals"].append(medal)
+
+    challenges = read_json(home / LEGACY_CHALLENGES) or {}
+    if challenges.get("date", "") > profile["challenges"].get("date", ""):
+        profile["challenges"] = challenges
+
+
+def adopt_profile(store: ProfileStore, latest: dict | None):
+    """Turn what a store transaction yielded into a full profile.
+
+    Returns the profile and the legacy files folded into it, which must
+    be handed to retire_legacy() after the save, before the store's lock
+    is released: a writer that still found them would fold them again.
+    """
+    profile = with_defaults(latest if latest is not None else store.load())
+    legacy = _legacy_files(store)
+    if legacy:
+        _fold_legacy(profile, Path.home())
+    return profile, legacy
+
+
+def retire_legacy(paths: list):
+    for path in paths:
+        os.replace(path, path.with_name(path.name + ".migrated"))
+
+
+@contextmanager
+def profile_transaction(event: str = "save", store: ProfileStore = None, **detail):
+    """Read the latest profile, let the block change it, write it back once.
+
+        with profile_transaction("medals") as profile:
+            profile["medals"].append(medal_id)
+
+    Writers are serialized by the store. Legacy files are migrated in
+    the same transaction the first time round.
+    """
+    owned = store is None
+    if owned:
+        store = open_store(default_profile_path())
+    try:
+        with store.transaction() as latest:
+            profile, legacy = adopt_profile(store, latest)
+            yield profile
+            store.save(profile, event, **detail)
+            retire_legacy(legacy)
+    finally:
+        if owned:
+            store.close()
+
+
+def load_profile(store: ProfileStore = None) -> dict:
+    """The current profile, for reading. One read unless a migration is due."""
+    owned = store is None
+    if owned:
+        store = open_store(default_profile_path())
+    try:
+        if _legacy_files(store):
+            with profile_transaction("migrate", store) as profile:
+                return profile
+        return with_defaults(store.load())
+    finally:
+        if owned:
+            store.close()
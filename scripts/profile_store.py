@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - PROFILE STORAGE
+Where the soldier's record lives between invocations.
+
+XPTracker talks to a ProfileStore instead of a file. Pick the backend with
+the SERGEANT_STORE environment variable:
+
+    json      the whole profile as one JSON document, rewritten on every save
+    eventlog  one compact record appended per event, rebuilt on load from a
+              snapshot plus the log, compacted in the background
+    sqlite    a WAL-mode SQLite database; every award is one transaction, so
+              parallel sessions never lose each other's XP
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from state_io import StateError, locked, read_json, write_json, write_text
+
+STORE_ENV = "SERGEANT_STORE"
+DEFAULT_STORE = "json"
+
+
+def _encode(value) -> str:
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+class ProfileStore:
+    """Persistence backend for an XPTracker profile.
+
+    load() returns the stored profile, or None when there is none yet.
+    save() is called after every mutation with the full profile and the
+    event that caused it; backends decide how much of it to write.
+
+    XPTracker wraps each mutation in transaction(). A backend that can
+    serialize writers yields the latest stored profile there, and the
+    mutation is applied to that instead of the copy loaded at startup.
+    """
+
+    def load(self) -> dict | None:
+        return None
+
+    @contextmanager
+    def transaction(self):
+        yield None
+
+    def save(self, data: dict, event: str = "save", **detail):
+        pass
+
+    def close(self):
+        pass
+
+
+class JSONStore(ProfileStore):
+    """The original format: one indented JSON file, rewritten in full.
+
+    Saves replace the file atomically and transaction() holds the file's
+    lock, so concurrent sessions apply their awards one after another.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self) -> dict | None:
+        return read_json(self.path)
+
+    @contextmanager
+    def transaction(self):
+        with locked(self.path):
+            yield self.load()
+
+    def save(self, data: dict, event: str = "save", **detail):
+        with locked(self.path):
+            write_json(self.path, data, default=str)
+
+
+class EventLogStore(ProfileStore):
+    """Append-only event log with background snapshots.
+
+    Each save appends one JSON line holding only the top-level profile keys
+    that changed, so an award costs the same however long the history is.
+    Loading reads the latest snapshot and replays every record with a
+    higher sequence number. Files, next to the profile path:
+
+        profile.snapshot.json  {"seq": n, "profile": {...}}
+        profile.log            records appended since the last compaction
+        profile.log.old        records being folded into a new snapshot
+
+    Records are only appended and snapshots are replaced atomically, so a
+    crash mid-write can tear at most the final record, which replay skips.
+    An existing profile.json is picked up as the starting point. Appends
+    and compactions hold the log's lock, so several processes can share it.
+    """
+
+    # Fold the log into a new snapshot after this many records
+    COMPACT_AFTER = 1000
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.snapshot_path = self.path.with_suffix('.snapshot.json')
+        self.log_path = self.path.with_suffix('.log')
+        self.old_log_path = self.path.with_suffix('.log.old')
+        self.seq = 0
+        self.pending = 0
+        self.profile = None
+        self.encoded = {}
+        # (inode, offset) of the live log up to where it has been replayed
+        self.tail = None
+        self._lock = threading.Lock()
+        self._compactor = None
+
+    def load(self) -> dict | None:
+        profile, seq = None, 0
+        snapshot = read_json(self.snapshot_path)
+        if snapshot is None:
+            profile = JSONStore(self.path).load()
+        else:
+            try:
+                profile, seq = snapshot["profile"], snapshot["seq"]
+            except (KeyError, TypeError):
+                raise StateError(f"{self.snapshot_path} is not a profile snapshot") from None
+
+        self.seq, self.pending = seq, 0
+        self.profile = profile
+        self.encoded = {key: _encode(value) for key, value in (profile or {}).items()}
+        self.tail = None
+        for log_path in (self.old_log_path, self.log_path):
+            records, self.tail = self._read_log(log_path)
+            self._replay(records)
+        return self.profile
+
+    def _replay(self, records: list):
+        for record in records:
+            if record["seq"] <= self.seq:
+                continue  # already folded into the snapshot
+            if self.profile is None:
+                self.profile = {}
+            self.profile.update(record["set"])
+            self.encoded.update((key, _encode(value)) for key, value in record["set"].items())
+            self.seq = record["seq"]
+            self.pending += 1
+
+    @staticmethod
+    def _read_log(log_path: Path, offset: int = 0):
+        """Intact records from offset on, and the (inode, offset) read up to.
+
+        Torn or garbled lines are skipped.
+        """
+        try:
+            with open(log_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+                tail = (os.fstat(f.fileno()).st_ino, offset + len(data))
+        except OSError:
+            return [], None
+        records = []
+        for line in data.split(b'\n'):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if isinstance(record.get("seq"), int) and isinstance(record.get("set"), dict):
+                    records.append(record)
+            except ValueError:
+                continue
+        return records, tail
+
+    def _catch_up(self) -> dict | None:
+        """Replay only what other processes appended since we last looked.
+
+        Falls back to a full load when the log was compacted or truncated
+        underneath us, or the new records do not follow on from ours.
+        """
+        if self.tail is None:
+            return self.load()
+        inode, offset = self.tail
+        try:
+            st = os.stat(self.log_path)
+        except FileNotFoundError:
+            return self.load()
+        if st.st_ino != inode or st.st_size < offset:
+            return self.load()
+        if st.st_size == offset:
+            return self.profile
+        records, tail = self._read_log(self.log_path, offset)
+        if tail is None or (records and records[0]["seq"] != self.seq + 1):
+            return self.load()
+        self.tail = tail
+        self._replay(records)
+        return self.profile
+
+    @contextmanager
+    def transaction(self):
+        # Another process may have appended since we loaded: catch up under
+        # the lock so our record gets the next sequence number
+        with locked(self.log_path):
+            try:
+                yield self._catch_up()
+            except BaseException:
+                # The caller changes the profile we cache in place: if it
+                # failed halfway, forget it so the next call reloads the log
+                self.profile, self.tail = None, None
+                raise
+
+    def save(self, data: dict, event: str = "save", **detail):
+        changed = {}
+        for key, value in data.items():
+            encoded = _encode(value)
+            if self.encoded.get(key) != encoded:
+                changed[key] = encoded
+        if not changed:
+            return
+
+        with self._lock, locked(self.log_path):
+            self.seq += 1
+            header = {"seq": self.seq, "ts": datetime.now().isoformat(), "event": event, **detail}
+            fields = ','.join(f'{json.dumps(key)}:{encoded}' for key, encoded in changed.items())
+            line = _encode(header)[:-1] + ',"set":{' + fields + '}}\n'
+            self._append(line.encode('utf-8'))
+            self.encoded.update(changed)
+            self.pending += 1
+
+        if self.pending >= self.COMPACT_AFTER:
+            self.compact()
+
+    def _append(self, record: bytes):
+        with open(self.log_path, 'a+b') as f:
+            start = f.tell()
+            if start > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # A torn record from a crash: keep it on its own line
+                    record = b'\n' + record
+            f.write(record)
+            inode = os.fstat(f.fileno()).st_ino
+            # Only advance the tail if nothing we have not replayed sits before us
+            caught_up = self.tail == (inode, start) or (self.tail is None and start == 0)
+            self.tail = (inode, start + len(record)) if caught_up else None
+
+    def _snapshot_text(self) -> str:
+        fields = ','.join(f'{json.dumps(key)}:{encoded}' for key, encoded in self.encoded.items())
+        return '{"seq":%d,"profile":{%s}}' % (self.seq, fields)
+
+    def compact(self, background: bool = True):
+        """Fold the log into a fresh snapshot.
+
+        The live log is renamed to profile.log.old and new records start a
+        fresh log straight away; the snapshot is written on a worker thread,
+        after which the old log is dropped. Replay skips records the
+        snapshot already covers, so a crash at any step loses nothing.
+        """
+        with self._lock, locked(self.log_path):
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            # Fold what is on disk, including other processes' records
+            self.load()
+            text, seq = self._snapshot_text(), self.seq
+            self.pending = 0
+            if self.old_log_path.exists():
+                # Left over from an interrupted compaction. The snapshot
+                # below covers it, so fold everything in place.
+                self._write_snapshot(text, seq)
+                open(self.log_path, 'wb').close()
+                return
+            if self.log_path.exists():
+                os.replace(self.log_path, self.old_log_path)
+            self.tail = None
+            if not background:
+                self._write_snapshot(text, seq)
+                return
+            # Not a daemon thread: the interpreter waits for it at exit
+            self._compactor = threading.Thread(
+                target=self._write_snapshot, args=(text, seq), name="sergeant-compactor")
+            self._compactor.start()
+
+    def _write_snapshot(self, text: str, seq: int):
+        with locked(self.log_path):
+            # Another process may have folded a newer state in the meantime
+            try:
+                if read_json(self.snapshot_path, dict).get("seq", 0) > seq:
+                    return
+            except StateError:
+                pass
+            write_text(self.snapshot_path, text)
+            try:
+                os.remove(self.old_log_path)
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+
+class SQLiteStore(ProfileStore):
+    """SQLite database in WAL mode, next to the profile path (profile.db).
+
+    Counters in stats and earned achievements live only in their own
+    indexed tables; every other top-level key is a JSON value in the
+    profile table. Writes only touch rows that changed. transaction() starts with
+    BEGIN IMMEDIATE, so concurrent awards queue on the write lock and each
+    one re-reads the profile before applying itself: no lost XP. Readers
+    are never blocked thanks to WAL.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS profile (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS achievements (
+            id TEXT PRIMARY KEY,
+            earned_order INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS achievements_by_order ON achievements (earned_order);
+    """
+
+    # Seconds a writer waits for the lock before giving up
+    BUSY_TIMEOUT = 30
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.db_path = self.path.with_suffix('.db')
+        self.encoded = {}
+        self._db = None
+        self._in_transaction = False
+
+    @property
+    def db(self):
+        """The sqlite3.Connection, opened on first use.
+
+        Not annotated: sqlite3 is only imported here, to keep it out of
+        awards that use another store.
+        """
+        if self._db is None:
+            import sqlite3
+
+            db = sqlite3.connect(str(self.db_path), timeout=self.BUSY_TIMEOUT,
+                                 isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(self.SCHEMA)
+            self._db = db
+        return self._db
+
+    def load(self) -> dict | None:
+        return self._read()
+
+    def _read(self) -> dict | None:
+        db = self.db
+        profile = {key: json.loads(value) for key, value in db.execute("SELECT key, value FROM profile")}
+        if not profile:
+            # Empty database: start from the JSON profile, if there is one
+            self.encoded = {}
+            return JSONStore(self.path).load()
+        profile["stats"] = dict(db.execute("SELECT name, value FROM stats"))
+        profile["achievements"] = [
+            row[0] for row in db.execute("SELECT id FROM achievements ORDER BY earned_order")
+        ]
+        self.encoded = {key: _encode(value) for key, value in profile.items()}
+        return profile
+
+    @contextmanager
+    def transaction(self):
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        self._in_transaction = True
+        try:
+            yield self._read()
+            db.execute("COMMIT")
+        except BaseException:
+            self._rollback()
+            raise
+        finally:
+            self._in_transaction = False
+
+    def save(self, data: dict, event: str = "save", **detail):
+        if self._in_transaction:
+            self._write(data)
+            return
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            self._write(data)
+            db.execute("COMMIT")
+        except BaseException:
+            self._rollback()
+            raise
+
+    def _rollback(self):
+        self.db.execute("ROLLBACK")
+        # _write records what it wrote as it goes; none of it is stored now
+        self.encoded = {}
+
+    def _write(self, data: dict):
+        db = self.db
+        for key, value in data.items():
+            encoded = _encode(value)
+            if self.encoded.get(key) == encoded:
+                continue
+            if key == "stats":
+                if key in self.encoded:
+                    old = json.loads(self.encoded[key])
+                    db.executemany(
+                        "DELETE FROM stats WHERE name = ?",
+                        [(name,) for name in old if name not in value]
+                    )
+                else:
+                    old = {}
+                    db.execute("DELETE FROM stats")
+                db.executemany(
+                    "INSERT OR REPLACE INTO stats (name, value) VALUES (?, ?)",
+                    [(name, count) for name, count in value.items() if old.get(name) != count]
+                )
+            elif key == "achievements":
+                old = json.loads(self.encoded[key]) if key in self.encoded else None
+                if old is None or value[:len(old)] != old:
+                    db.execute("DELETE FROM achievements")
+                    old = []
+                db.executemany(
+                    "INSERT OR REPLACE INTO achievements (id, earned_order) VALUES (?, ?)",
+                    [(ach_id, n) for n, ach_id in enumerate(value) if n >= len(old)]
+                )
+            else:
+                db.execute("INSERT OR REPLACE INTO profile (key, value) VALUES (?, ?)", (key, encoded))
+            if key in ("stats", "achievements"):
+                # Copies kept in the profile table by earlier versions
+                db.execute("DELETE FROM profile WHERE key = ?", (key,))
+            self.encoded[key] = encoded
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+STORES = {
+    "json": JSONStore,
+    "eventlog": EventLogStore,
+    "sqlite": SQLiteStore,
+}
+
+
+def open_store(path: Path, kind: str = None) -> ProfileStore:
+    """Open the profile store for path. kind defaults to $SERGEANT_STORE."""
+    kind = kind or os.environ.get(STORE_ENV) or DEFAULT_STORE
+    if kind not in STORES:
+        raise ValueError(f"Unknown profile store '{kind}'. Choose from: {', '.join(STORES)}")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return STORES[kind](path)
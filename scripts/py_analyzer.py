@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - PYTHON ANALYZER
+Structural intel on Python files for court martial, from one ast.parse.
+
+A single tree walk records every function's real line span, how deeply
+each scope nests its control flow, every print() call and every magic
+number. Those facts depend only on the file's bytes, so they are cached
+by content hash, in memory and under ~/.sergeant/cache: a file that has
+been tried before is never parsed again. Each cache keeps the facts of
+the CACHE_KEEP most recently used files.
+
+Comments and long lines are not in the tree; court martial still finds
+those with its line rules.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from state_io import prune_oldest, write_json
+
+# Bump when the facts recorded for a file change shape or meaning
+FACTS_VERSION = 2
+
+# Numeric literals below this (in absolute value) are never magic
+MAGIC_MIN = 100
+
+# Cache entries kept, in memory and on disk, and disk writes between prunes
+CACHE_KEEP = 16384
+PRUNE_EVERY = 256
+
+
+def default_cache_dir() -> Path:
+    return Path.home() / ".sergeant" / "cache" / "court-martial"
+
+
+def _is_constant_name(target) -> bool:
+    """MAX_RETRIES = 500 is how a magic number gets its name."""
+    if isinstance(target, ast.Attribute):
+        return target.attr.isupper()
+    return isinstance(target, ast.Name) and target.id.isupper()
+
+
+class FactCollector(ast.NodeVisitor):
+    """The one walk over a module's tree.
+
+    functions: [line, name, length] per def, length counted from the def
+    line to the last line of the body. nesting: [line, name, depth] per
+    scope that nests at all, "" naming module level, at the line of the
+    outermost statement of its deepest nest. prints: lines with a print()
+    call that is not writing to a file=. magic: [line, literal] for the
+    first magic number on each line.
+
+    A magic number is a decimal literal of MAGIC_MIN or more where the
+    line rule looks for one: in the arithmetic (or conditional) of a
+    comparison operand, or of a value assigned to a name that is not an
+    UPPER_CASE constant.
+    Keyword arguments and parameter defaults name their value, so they are
+    left alone, as are return values, container items, call arguments and
+    hex, octal and binary literals (bit patterns, not quantities). lines
+    is the source split into lines, to tell those apart.
+    """
+
+    def __init__(self, lines: list):
+        self.lines = lines
+        self.functions = []
+        self.nesting = []
+        self.prints = []
+        self.magic = {}
+        self.depth = 0
+        self.deepest = 0
+        # Line of the outermost statement of the current nest, and of the deepest one
+        self.outer = self.deepest_line = None
+
+    def facts(self, tree) -> dict:
+        self.visit(tree)
+        if self.deepest:
+            self.nesting.append([self.deepest_line, "", self.deepest])
+        self.nesting.sort()
+        return {
+            'functions': self.functions,
+            'nesting': self.nesting,
+            'prints': sorted(set(self.prints)),
+            'magic': sorted(self.magic.items()),
+        }
+
+    def _visit_function(self, node):
+        self.functions.append([node.lineno, node.name, node.end_lineno - node.lineno + 1])
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self.visit(node.args)
+        if node.returns is not None:
+            self.visit(node.returns)
+
+        # A function body is a scope of its own, starting flat
+        scope = self.depth, self.deepest, self.outer, self.deepest_line
+        self.depth = self.deepest = 0
+        self.outer = self.deepest_line = None
+        for statement in node.body:
+            self.visit(statement)
+        if self.deepest:
+            self.nesting.append([self.deepest_line, node.name, self.deepest])
+        self.depth, self.deepest, self.outer, self.deepest_line = scope
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def _visit_nested(self, node):
+        self.depth += 1
+        if self.depth == 1:
+            self.outer = node.lineno
+        if self.depth > self.deepest:
+            self.deepest, self.deepest_line = self.depth, self.outer
+        if isinstance(node, ast.If):
+            self.visit(node.test)
+            for statement in node.body:
+                self.visit(statement)
+            self.depth -= 1
+            # elif chains sit at the same depth as their if
+            if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+                self.visit(node.orelse[0])
+                return
+            self.depth += 1
+            for statement in node.orelse:
+                self.visit(statement)
+        else:
+            self.generic_visit(node)
+        self.depth -= 1
+
+    # Compound statements add a level of nesting (an elif does not)
+    visit_If = visit_For = visit_AsyncFor = visit_While = _visit_nested
+    visit_With = visit_AsyncWith = visit_Try = visit_TryStar = visit_Match = _visit_nested
+
+    def _check_magic(self, node, sign: str = ''):
+        """Record the magic numbers in an operand: 500, -500, 500 * n."""
+        if isinstance(node, ast.BinOp):
+            self._check_magic(node.left)
+            self._check_magic(node.right)
+            return
+        if isinstance(node, ast.IfExp):
+            self._check_magic(node.body)
+            self._check_magic(node.orelse)
+            return
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            self._check_magic(node.operand, '-')
+            return
+        if not isinstance(node, ast.Constant) or node.lineno in self.magic:
+            return
+        value = node.value
+        if type(value) not in (int, float) or value < MAGIC_MIN:
+            return
+        prefix = self.lines[node.lineno - 1][node.col_offset:node.col_offset + 2]
+        if prefix.lower() in (b'0x', b'0o', b'0b'):
+            return
+        self.magic[node.lineno] = sign + (str(value) if type(value) is int else repr(value))
+
+    def visit_Assign(self, node):
+        if not all(_is_constant_name(target) for target in node.targets):
+            self._check_magic(node.value)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node):
+        if node.value is not None and not _is_constant_name(node.target):
+            self._check_magic(node.value)
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node):
+        if not _is_constant_name(node.target):
+            self._check_magic(node.value)
+        self.generic_visit(node)
+
+    def visit_Compare(self, node):
+        operands = [node.left] + node.comparators
+        for n, op in enumerate(node.ops):
+            # Orderings and equality; not membership or identity
+            if not isinstance(op, (ast.In, ast.NotIn, ast.Is, ast.IsNot)):
+                self._check_magic(operands[n])
+                self._check_magic(operands[n + 1])
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if (isinstance(node.func, ast.Name) and node.func.id == 'print'
+                and not any(keyword.arg == 'file' for keyword in node.keywords)):
+            self.prints.append(node.lineno)
+        self.generic_visit(node)
+
+
+class PythonFacts:
+    """Parses Python sources into facts, remembering them by content hash.
+
+    cache_dir=None keeps the cache in memory only. In memory, the least
+    recently used entry is dropped once there are more than CACHE_KEEP.
+    On disk, reading an entry marks it used, and every PRUNE_EVERY writes
+    (starting with the first) all but the CACHE_KEEP most recently used
+    entries are deleted.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = cache_dir
+        self.memory = {}
+        self.writes = 0
+
+    def key(self, data) -> str:
+        digest = hashlib.sha1(f"{FACTS_VERSION}:{MAGIC_MIN}:".encode())
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, data) -> Optional[dict]:
+        """Facts for a file's bytes, or None if they are not valid Python."""
+        key = self.key(data)
+        facts = self.memory.pop(key, None)
+        if facts is not None:
+            self.memory[key] = facts  # Now the most recently used
+            return facts or None
+        path = self.cache_dir / f"{key}.json" if self.cache_dir else None
+        if path is not None:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    facts = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                facts = None
+        if facts is None:
+            facts = self.parse(data)
+            if path is not None:
+                self._write(path, facts)
+        self.memory[key] = facts
+        if len(self.memory) > CACHE_KEEP:
+            del self.memory[next(iter(self.memory))]
+        return facts or None
+
+    def _write(self, path: Path, facts: dict):
+        try:
+            write_json(path, facts, durable=False, indent=None, separators=(',', ':'))
+        except OSError:
+            return  # A cache that cannot be written is just a slower run
+        if self.writes % PRUNE_EVERY == 0:
+            prune_oldest(self.cache_dir, CACHE_KEEP)
+        self.writes += 1
+
+    @staticmethod
+    def parse(data) -> dict:
+        """Facts from one parse; {} when the file is not valid Python."""
+        source = bytes(data)
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            return {}
+        return FactCollector(source.splitlines()).facts(tree)
+
+
+_shared = {}
+
+
+def python_facts(data, use_cache: bool = True) -> Optional[dict]:
+    """Facts for a Python file's bytes through the per-process cache, on
+    disk too unless use_cache is False. None if the file does not parse."""
+    if use_cache not in _shared:
+        _shared[use_cache] = PythonFacts(default_cache_dir() if use_cache else None)
+    return _shared[use_cache].get(data)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - RANK LADDER
+The one rank table every script looks ranks up in.
+
+Ranks are dicts, {"name", "xp", "icon", "title"}, sorted by the XP they
+start at. Lookups bisect a precomputed threshold list, so finding the rank
+for an XP total costs O(log n) however long the ladder is.
+
+Set $SERGEANT_RANKS to a JSON file to swap in a custom ladder; see
+examples/custom_ranks.json for the format. Ranks without an icon get
+DEFAULT_ICON, and ranks without a title use their name.
+"""
+
+from __future__ import annotations
+
+import os
+from bisect import bisect_right
+from pathlib import Path
+
+from state_io import StateError, read_json
+
+RANKS_ENV = "SERGEANT_RANKS"
+DEFAULT_ICON = "🎖️"
+
+# Military progression with XP thresholds
+DEFAULT_RANKS = [
+    {"name": "Recruit", "xp": 0, "icon": "🔰", "title": "Fresh Meat"},
+    {"name": "Private", "xp": 500, "icon": "💂", "title": "Boot"},
+    {"name": "Private First Class", "xp": 1500, "icon": "🎖️", "title": "Getting There"},
+    {"name": "Corporal", "xp": 3500, "icon": "⭐", "title": "Not Terrible"},
+    {"name": "Sergeant", "xp": 7000, "icon": "⭐⭐", "title": "Competent"},
+    {"name": "Staff Sergeant", "xp": 12000, "icon": "⭐⭐⭐", "title": "Reliable"},
+    {"name": "Master Sergeant", "xp": 20000, "icon": "🌟", "title": "Seasoned"},
+    {"name": "First Sergeant", "xp": 32000, "icon": "🌟🌟", "title": "Veteran"},
+    {"name": "Sergeant Major", "xp": 50000, "icon": "🌟🌟🌟", "title": "War Hero"},
+    {"name": "Lieutenant", "xp": 75000, "icon": "🎗️", "title": "Officer Material"},
+    {"name": "Captain", "xp": 110000, "icon": "🎗️🎗️", "title": "Leader"},
+    {"name": "Major", "xp": 160000, "icon": "🏅", "title": "Strategist"},
+    {"name": "Colonel", "xp": 230000, "icon": "🏅🏅", "title": "Commander"},
+    {"name": "General", "xp": 320000, "icon": "⚔️", "title": "Legendary"},
+    {"name": "Supreme Commander", "xp": 500000, "icon": "👑", "title": "Mythic"},
+]
+
+
+class RankTable:
+    """A rank ladder with its thresholds precomputed for bisect.
+
+    Indexes like the list of rank dicts it was built from: table[0] is the
+    lowest rank, len(table) the number of ranks.
+    """
+
+    def __init__(self, ranks: list[dict]):
+        if not ranks:
+            raise ValueError("a rank ladder needs at least one rank")
+        self.ranks = sorted(ranks, key=lambda rank: rank["xp"])
+        self.thresholds = [rank["xp"] for rank in self.ranks]
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    def __getitem__(self, index):
+        return self.ranks[index]
+
+    def __iter__(self):
+        return iter(self.ranks)
+
+    def index_for(self, xp: int) -> int:
+        """Index of the highest rank xp has reached (0 below the first)."""
+        return max(0, bisect_right(self.thresholds, xp) - 1)
+
+    def rank_for(self, xp: int) -> dict:
+        return self.ranks[self.index_for(xp)]
+
+    def next_rank(self, index: int) -> dict | None:
+        """The rank after index, or None at the top of the ladder."""
+        return self.ranks[index + 1] if index + 1 < len(self.ranks) else None
+
+    def progress(self, xp: int, index: int = None) -> float:
+        """How far xp is from rank index (default: xp's own) to the next, 0.0-1.0."""
+        if index is None:
+            index = self.index_for(xp)
+        next_rank = self.next_rank(index)
+        if next_rank is None:
+            return 1.0
+        start = self.thresholds[index]
+        return (xp - start) / (next_rank["xp"] - start)
+
+
+def read_ladder(path: Path) -> RankTable:
+    """A RankTable from a JSON file: {"ranks": [...]} or a bare list."""
+    data = read_json(path)
+    if data is None:
+        raise StateError(f"Rank ladder {path} does not exist")
+    ranks = data.get("ranks") if isinstance(data, dict) else data
+    try:
+        return RankTable([
+            {
+                "name": rank["name"],
+                "xp": int(rank["xp"]),
+                "icon": rank.get("icon", DEFAULT_ICON),
+                "title": rank.get("title", rank["name"]),
+            }
+            for rank in ranks
+        ])
+    except (TypeError, KeyError, ValueError, AttributeError) as e:
+        raise StateError(f"Rank ladder {path} is not a list of ranks with name and xp ({e})") from e
+
+
+_loaded = {}
+
+
+def load_ranks(path: Path = None) -> RankTable:
+    """The ladder from path, $SERGEANT_RANKS or the default, built once per source."""
+    if path is None:
+        path = os.environ.get(RANKS_ENV) or None
+    key = str(path) if path else None
+    if key not in _loaded:
+        _loaded[key] = read_ladder(Path(path)) if path else RankTable(DEFAULT_RANKS)
+    return _loaded[key]
@@ -10,9 +10,29 @@ Scans perimeter. Reports hostiles. Provides tactical assessment.
 import os
 import sys
 import json
+import argparse
+import hashlib
+import heapq
+import re
+import subprocess
+import time
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from itertools import accumulate, repeat
+from operator import sub
+from typing import List, Optional
+
+from file_access import classify_payload, count_lines, count_matches, iter_chunks, open_source
+from state_io import prune_oldest, write_json
+from walker import walk
+
+try:
+    import numpy
+except ImportError:  # Optional: only speeds up the nesting depth scan
+    numpy = None
 
 # File patterns
 CODE_EXTENSIONS = {
@@ -41,159 +61,892 @@ CONFIG_FILES = [
 
 IGNORE_DIRS = {
     'node_modules', '.git', '__pycache__', 'venv', '.venv', 'dist', 
-    'build', 'target', '.next', '.nuxt', 'coverage', '.pytest_cache'
+    'build', 'target', '.next', '.nuxt', 'coverage', '.pytest_cache',
+    '.sergeant'
 }
 
+# Incremental recon cache: one file per AO, named after a hash of its
+# absolute path, under ~/.sergeant/cache/recon. Only the CACHE_KEEP most
+# recently used are kept. Bump CACHE_VERSION when the cache file changes
+# shape; changes to the analysis itself are picked up by the fingerprint.
+CACHE_VERSION = 3
+CACHE_KEEP = 32
+
+# How many hostiles, smells and skipped files a SITREP lists; the rest are
+# only counted
+TOP_LARGE_FILES = 10
+TOP_SMELLS = 15
+TOP_SKIPPED = 10
+
 # Code smells thresholds
 MAX_FILE_LINES = 300
 MAX_FUNCTION_LINES = 50
 MAX_NESTING_DEPTH = 4
 
 
-def scan_directory(path: Path) -> dict:
-    """Scan directory structure and gather intel."""
-    intel = {
-        'total_files': 0,
-        'total_lines': 0,
-        'languages': defaultdict(lambda: {'files': 0, 'lines': 0}),
-        'config_files': [],
-        'large_files': [],  # Potential hostiles
-        'structure': [],
-        'test_files': 0,
-        'has_tests': False,
+# Smell detectors run against the raw bytes of every code file during the
+# recon pass. Each entry is (extensions or None for all code files, detector).
+SMELL_DETECTORS = []
+
+CONSOLE_LOG = re.compile(rb'console\.log')
+ANY_TYPE = re.compile(rb': any')
+TODO_FIXME = re.compile(rb'(?i)todo|fixme')
+
+
+def smell_detector(extensions=None):
+    """Register a content check. The detector gets (data, ext), where data is
+    the file as a bytes-like buffer (usually an mmap), and returns a smell
+    dict (type, message, severity) or None."""
+    def register(detector):
+        SMELL_DETECTORS.append((frozenset(extensions) if extensions else None, detector))
+        return detector
+    return register
+
+
+@smell_detector(['.js', '.ts', '.jsx', '.tsx'])
+def detect_debug_spam(data, ext: str):
+    """Check for console.log spam (JS/TS)."""
+    console_count = count_matches(CONSOLE_LOG, data)
+    if console_count > 5:
+        return {
+            'type': 'DEBUG_SPAM',
+            'message': f'{console_count} console.log statements. Clean your foxhole.',
+            'severity': 'WARNING'
+        }
+
+
+@smell_detector(['.ts', '.tsx'])
+def detect_type_cowardice(data, ext: str):
+    """Check for any type abuse (TypeScript)."""
+    any_count = count_matches(ANY_TYPE, data)
+    if any_count > 3:
+        return {
+            'type': 'TYPE_COWARDICE',
+            'message': f'{any_count} uses of "any". TypeScript is your weapon. Use it.',
+            'severity': 'CRITICAL'
+        }
+
+
+@smell_detector()
+def detect_unfinished_business(data, ext: str):
+    """Check for TODO/FIXME (unfinished business)."""
+    todo_count = count_matches(TODO_FIXME, data)
+    if todo_count > 3:
+        return {
+            'type': 'UNFINISHED_BUSINESS',
+            'message': f'{todo_count} TODOs/FIXMEs. Finish what you started, soldier.',
+            'severity': 'WARNING'
+        }
+
+
+# Bracket bytes become +1/-1 steps (0x02/0x00 for the pure-Python path,
+# 0x01/0xff as int8 for NumPy); every other byte is dropped.
+_OPENERS, _CLOSERS = b'{[(', b'}])'
+_NOT_BRACKETS = bytes(b for b in range(256) if b not in _OPENERS + _CLOSERS)
+_OFFSET_STEPS = bytes.maketrans(_OPENERS + _CLOSERS, b'\x02' * 3 + b'\x00' * 3)
+_SIGNED_STEPS = bytes.maketrans(_OPENERS + _CLOSERS, b'\x01' * 3 + b'\xff' * 3)
+
+
+def _nesting_scan(steps: bytes, start: int, signed: bool):
+    """Clamped bracket depth over one chunk of steps, starting at depth
+    `start`. Returns (deepest, depth at the end of the chunk)."""
+    if signed:
+        depth = numpy.cumsum(numpy.frombuffer(steps, dtype=numpy.int8), dtype=numpy.int64)
+        depth += start
+        lowest = int(depth.min())
+        if lowest >= 0:
+            return int(depth.max()), int(depth[-1])
+        floor = numpy.minimum.accumulate(depth)
+        numpy.minimum(floor, 0, out=floor)
+        depth -= floor
+        return int(depth.max()), int(depth[-1])
+
+    # Steps are stored as 2/0 so the sum is offset by one per bracket
+    depth = list(map(sub, accumulate(steps, initial=start), range(len(steps) + 1)))
+    lowest = min(depth)
+    if lowest >= 0:
+        return max(depth), depth[-1]
+
+    # Unit steps reach each new low first at depth.index(-n), so the running
+    # minimum is constant between those points and each stretch needs only
+    # a max() over its slice.
+    best = 0
+    start = 0
+    for floor in range(-lowest + 1):
+        end = depth.index(-floor - 1, start) if floor < -lowest else len(depth)
+        if end > start:
+            best = max(best, max(depth[start:end]) + floor)
+        start = end
+    return best, depth[-1] - lowest
+
+
+def max_nesting_depth(data) -> int:
+    """Deepest bracket nesting in data (bytes or an mmap).
+
+    Depth never drops below zero: a stray closer is ignored rather than
+    making later openers look shallower. That is the running sum of the
+    +1/-1 steps minus its running minimum (once the minimum goes negative),
+    which NumPy or itertools.accumulate compute without a Python-level loop
+    over the characters. Large buffers are scanned in chunks.
+    """
+    signed = numpy is not None
+    table = _SIGNED_STEPS if signed else _OFFSET_STEPS
+    deepest = depth = 0
+    for chunk in iter_chunks(data):
+        steps = chunk.translate(table, _NOT_BRACKETS)
+        if steps:
+            chunk_deepest, depth = _nesting_scan(steps, depth, signed)
+            deepest = max(deepest, chunk_deepest)
+    return deepest
+
+
+@smell_detector()
+def detect_callback_hell(data, ext: str):
+    """Check nesting depth (looking for arrow hell)."""
+    max_depth = max_nesting_depth(data)
+    if max_depth > 8:
+        return {
+            'type': 'CALLBACK_HELL',
+            'message': f'Nesting depth of {max_depth}. This is not Inception.',
+            'severity': 'CRITICAL'
+        }
+
+
+@dataclass
+class SourceReport:
+    """Everything recon learns from a single read of one code file."""
+    path: str
+    ext: str
+    language: str
+    lines: Optional[int]  # None when the file could not be read or was skipped
+    smells: List[dict] = field(default_factory=list)
+    skipped: Optional[str] = None  # why the file is not treated as source
+
+
+def inspect_source(filepath: Path, rel_path: str, ext: str, detectors=None) -> SourceReport:
+    """Map a code file once and run every smell detector against it."""
+    try:
+        with open_source(filepath) as data:
+            return analyze_source(data, rel_path, ext, detectors)
+    except Exception:
+        return SourceReport(rel_path, ext, CODE_EXTENSIONS[ext], None)
+
+
+def analyze_source(data, rel_path: str, ext: str, detectors=None) -> SourceReport:
+    """Count lines and run every smell detector against a file's bytes.
+
+    Binaries, minified and generated files are sniffed out first and come
+    back with only the reason they were skipped.
+    """
+    if detectors is None:
+        detectors = SMELL_DETECTORS
+    report = SourceReport(rel_path, ext, CODE_EXTENSIONS[ext], None)
+    report.skipped = classify_payload(data, os.path.basename(rel_path))
+    if report.skipped:
+        return report
+
+    # Same count readlines() would give, without decoding anything
+    report.lines = count_lines(data)
+
+    for extensions, detector in detectors:
+        if extensions is not None and ext not in extensions:
+            continue
+        try:
+            smell = detector(data, ext)
+        except Exception:
+            continue
+        if smell:
+            report.smells.append({'file': rel_path, **smell})
+    return report
+
+
+def large_file_hostile(report: SourceReport) -> Optional[dict]:
+    """Oversized-file hostile for a source report, if it is one."""
+    if report.lines is None or report.lines <= MAX_FILE_LINES:
+        return None
+    return {
+        'path': report.path,
+        'lines': report.lines,
+        'severity': 'CRITICAL' if report.lines > 500 else 'WARNING'
     }
-    
-    for root, dirs, files in os.walk(path):
-        # Skip ignored directories
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
-        
-        rel_root = Path(root).relative_to(path)
+
+
+class TopN:
+    """The limit best items offered, by key, plus an exact count of them all.
+
+    A bounded min-heap: the worst item kept sits at the root and is pushed
+    out when a better one arrives, so memory stays O(limit) and each add()
+    is O(log limit) however many items go by. Ties go to the item offered
+    first. limit=None keeps everything in a plain list.
+    """
+
+    def __init__(self, limit: Optional[int], key=lambda item: 0):
+        self.limit = limit
+        self.key = key
+        self.count = 0
+        self.heap = []  # (key, -arrival, item), worst first; items if unbounded
+
+    def add(self, item):
+        self.count += 1
+        if self.limit is None:
+            self.heap.append(item)
+            return
+        key = self.key(item)
+        if len(self.heap) < self.limit:
+            heapq.heappush(self.heap, (key, -self.count, item))
+        elif self.heap and key > self.heap[0][0]:
+            # An equal key arrived later, so it loses to what is kept
+            heapq.heapreplace(self.heap, (key, -self.count, item))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def best(self) -> list:
+        """Kept items, best first (first offered first among equals)."""
+        if self.limit is None:
+            return sorted(self.heap, key=self.key, reverse=True)
+        return [item for _, _, item in sorted(self.heap, key=lambda e: e[:2], reverse=True)]
+
+    def in_order(self) -> list:
+        """Kept items in the order they were offered."""
+        if self.limit is None:
+            return list(self.heap)
+        return [item for _, _, item in sorted(self.heap, key=lambda e: e[1], reverse=True)]
+
+
+SMELL_RANK = {'CRITICAL': 1}
+
+
+class Collector:
+    """Aggregates intel during a recon pass.
+
+    Collectors never touch the filesystem themselves: run_recon() walks the
+    tree once and hands every collector the same directory, file and source
+    events. Subclass and override what you need, then pass an instance to
+    run_recon().
+    """
+
+    def on_directory(self, rel_root: Path, dirs: list, files: list):
+        pass
+
+    def on_file(self, rel_path: str, filename: str):
+        pass
+
+    def on_source(self, report: SourceReport):
+        pass
+
+    def result(self):
+        return None
+
+
+class IntelCollector(Collector):
+    """Structure, config files, line counts, languages, hostiles and tests.
+
+    Only the largest large_files_limit hostiles and the first skipped_limit
+    skipped files are kept (None keeps them all); large_file_count and
+    skipped_count are exact.
+    """
+
+    def __init__(self, large_files_limit: Optional[int] = TOP_LARGE_FILES,
+                 skipped_limit: Optional[int] = TOP_SKIPPED):
+        self.large_files = TopN(large_files_limit, key=lambda hostile: hostile['lines'])
+        self.skipped = TopN(skipped_limit)
+        self.intel = {
+            'total_files': 0,
+            'total_lines': 0,
+            'languages': defaultdict(lambda: {'files': 0, 'lines': 0}),
+            'config_files': [],
+            'large_files': [],  # Potential hostiles, largest first
+            'large_file_count': 0,
+            'structure': [],
+            'test_files': 0,
+            'has_tests': False,
+            'skipped': [],  # Binary, minified or generated payloads
+            'skipped_count': 0,
+        }
+
+    def on_directory(self, rel_root, dirs, files):
         depth = len(rel_root.parts)
-        
         if depth <= 2:
-            intel['structure'].append({
+            self.intel['structure'].append({
                 'path': str(rel_root) if str(rel_root) != '.' else '/',
                 'depth': depth,
                 'files': len(files),
                 'dirs': len(dirs)
             })
-        
-        for file in files:
-            filepath = Path(root) / file
-            ext = filepath.suffix.lower()
-            
-            # Check if config file
-            if file in CONFIG_FILES:
-                intel['config_files'].append(str(filepath.relative_to(path)))
-            
-            # Check if code file
-            if ext in CODE_EXTENSIONS:
-                intel['total_files'] += 1
+
+    def on_file(self, rel_path, filename):
+        # Check if config file
+        if filename in CONFIG_FILES:
+            self.intel['config_files'].append(rel_path)
+
+        # Check for tests
+        if 'test' in filename.lower() or 'spec' in filename.lower():
+            self.intel['test_files'] += 1
+            self.intel['has_tests'] = True
+
+    def on_source(self, report):
+        if report.skipped:
+            self.skipped.add({'path': report.path, 'reason': report.skipped})
+            return
+        self.intel['total_files'] += 1
+        if report.lines is None:
+            return
+        lines = report.lines
+        self.intel['total_lines'] += lines
+        self.intel['languages'][report.language]['files'] += 1
+        self.intel['languages'][report.language]['lines'] += lines
+
+        # Flag large files as hostiles
+        hostile = large_file_hostile(report)
+        if hostile:
+            self.large_files.add(hostile)
+
+    def result(self):
+        self.intel['large_files'] = self.large_files.best()
+        self.intel['large_file_count'] = self.large_files.count
+        self.intel['skipped'] = self.skipped.in_order()
+        self.intel['skipped_count'] = self.skipped.count
+        return self.intel
+
+
+class SmellCollector(Collector):
+    """Code smells reported by the smell detectors, in walk order.
+
+    With a limit, only that many are kept, CRITICAL ones first and then
+    the earliest found; count is the exact total either way.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.smells = TopN(limit, key=lambda smell: SMELL_RANK.get(smell['severity'], 0))
+
+    @property
+    def count(self) -> int:
+        return self.smells.count
+
+    def on_source(self, report):
+        for smell in report.smells:
+            self.smells.add(smell)
+
+    def result(self):
+        return self.smells.in_order()
+
+
+class StreamCollector(Collector):
+    """Writes each source report as an NDJSON line the moment it arrives.
+
+    Nothing is kept but a smell count, so the output can be consumed while
+    recon is still running and memory does not grow with the AO.
+    """
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self.smells = 0
+
+    def on_source(self, report):
+        self.smells += len(report.smells)
+        emit_record({'type': 'file', **asdict(report)}, self.out)
+
+    def result(self):
+        return self.smells
+
+
+def emit_record(record: dict, out=None):
+    """Write one NDJSON line and flush it, so readers see it right away."""
+    out = out or sys.stdout
+    out.write(json.dumps(record) + "\n")
+    out.flush()
+
+
+def default_cache_dir() -> Path:
+    return Path.home() / ".sergeant" / "cache" / "recon"
+
+
+def _cache_fingerprint(detectors) -> str:
+    """Hash everything a cached SourceReport depends on.
+
+    That is the source of recon.py and file_access.py, where the analysis,
+    its helpers and thresholds live, so any edit to them invalidates the
+    cache. Detectors may be defined elsewhere, so their bytecode and
+    constants are hashed too.
+    """
+    digest = hashlib.sha1(f"{CACHE_VERSION}:".encode())
+    here = Path(__file__).resolve()
+    for source in (here, here.with_name('file_access.py')):
+        try:
+            digest.update(source.read_bytes())
+        except OSError:
+            digest.update(str(source).encode())
+    for extensions, detector in detectors:
+        code = detector.__code__
+        digest.update(repr((sorted(extensions or ()), detector.__qualname__, code.co_consts)).encode())
+        digest.update(code.co_code)
+    return digest.hexdigest()
+
+
+class ReconCache:
+    """Per-file SourceReports from earlier recon runs of one AO.
+
+    Entries are keyed by relative path and validated against the file's
+    mtime_ns, size and inode, so unchanged files are never re-read. Only
+    files seen during the current run are written back, which evicts
+    anything deleted since the last recon. The cache lives outside the AO
+    (see default_cache_dir), so recon leaves nothing behind in it.
+    """
+
+    # Files modified this close to the start of the run may change again
+    # within the same mtime tick; leave them out of the cache.
+    RACY_WINDOW_NS = 2 * 10**9
+
+    def __init__(self, root: Path, detectors=None, cache_dir: Optional[Path] = None):
+        self.root = os.path.abspath(root)
+        key = hashlib.sha1(os.fsencode(self.root)).hexdigest()
+        self.path = (cache_dir or default_cache_dir()) / f"{key}.json"
+        self.fingerprint = _cache_fingerprint(SMELL_DETECTORS if detectors is None else detectors)
+        self.started_ns = time.time_ns()
+        self.entries = {}
+        self.seen = {}
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('fingerprint') == self.fingerprint and cached.get('root') == self.root:
+                self.entries = cached['files']
+        except Exception:
+            pass
+
+    def lookup(self, rel_path: str, ext: str, st) -> Optional[SourceReport]:
+        entry = self.entries.get(rel_path)
+        if entry is None or entry[:3] != [st.st_mtime_ns, st.st_size, st.st_ino]:
+            return None
+        self.seen[rel_path] = entry
+        return SourceReport(rel_path, ext, CODE_EXTENSIONS[ext], entry[3], entry[4], entry[5])
+
+    def store(self, report: SourceReport, st):
+        self.dirty = True
+        if st.st_mtime_ns > self.started_ns - self.RACY_WINDOW_NS:
+            return
+        self.seen[report.path] = [st.st_mtime_ns, st.st_size, st.st_ino,
+                                  report.lines, report.smells, report.skipped]
+
+    def save(self):
+        """Persist the entries seen this run and drop the caches of AOs
+        least recently run. Failures are not fatal."""
+        try:
+            if not self.dirty and len(self.seen) == len(self.entries):
+                # Still counts as used for pruning
+                os.utime(self.path)
+                return
+            write_json(self.path, {'fingerprint': self.fingerprint, 'root': self.root,
+                                   'files': self.seen},
+                       durable=False, indent=None, separators=(',', ':'))
+        except OSError:
+            return
+        prune_oldest(self.path.parent, CACHE_KEEP)
+
+
+def _inspect_in_pool(tasks: list, detectors, jobs: int):
+    """Fan inspect_source out across a process pool in chunked batches.
+
+    pool.map yields results in submission order, so collectors see sources in
+    exactly the order a serial walk would produce them.
+    """
+    chunksize = max(1, min(256, len(tasks) // (jobs * 4)))
+    filepaths, rel_paths, exts = zip(*tasks)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(
+            inspect_source, filepaths, rel_paths, exts, repeat(detectors),
+            chunksize=chunksize
+        )
+
+
+def run_recon(path: Path, collectors: list, detectors=None, jobs: int = 1,
+              cache: Optional[ReconCache] = None) -> list:
+    """Walk the AO once, reading each code file a single time, and feed
+    every collector. Returns each collector's result in order.
+
+    With jobs > 1 the walk only queues code files; they are analyzed in a
+    process pool afterwards and merged back in walk order. With a cache,
+    files whose stat matches a previous run are not read at all. Anything
+    .gitignore or .sergeantignore excludes is never visited.
+    """
+    # (task, stat, report) in walk order; report is None until analyzed
+    pending = []
+    # Ignored directories and gitignored subtrees are pruned by the walker
+    for rel_root, dirs, files in walk(path, IGNORE_DIRS):
+        dir_names = [entry.name for entry in dirs]
+        file_names = [entry.name for entry in files]
+        for collector in collectors:
+            collector.on_directory(Path(rel_root), dir_names, file_names)
+
+        for entry in files:
+            file = entry.name
+            rel_path = os.path.join(rel_root, file) if rel_root else file
+            for collector in collectors:
+                collector.on_file(rel_path, file)
+
+            ext = os.path.splitext(file)[1].lower()
+            if ext not in CODE_EXTENSIONS:
+                continue
+
+            filepath = entry.path
+            st = report = None
+            if cache is not None:
                 try:
-                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = len(f.readlines())
-                        intel['total_lines'] += lines
-                        intel['languages'][CODE_EXTENSIONS[ext]]['files'] += 1
-                        intel['languages'][CODE_EXTENSIONS[ext]]['lines'] += lines
-                        
-                        # Flag large files as hostiles
-                        if lines > MAX_FILE_LINES:
-                            intel['large_files'].append({
-                                'path': str(filepath.relative_to(path)),
-                                'lines': lines,
-                                'severity': 'CRITICAL' if lines > 500 else 'WARNING'
-                            })
-                except Exception:
+                    st = entry.stat()
+                    report = cache.lookup(rel_path, ext, st)
+                except OSError:
                     pass
-            
-            # Check for tests
-            if 'test' in file.lower() or 'spec' in file.lower():
-                intel['test_files'] += 1
-                intel['has_tests'] = True
-    
+            if report is None and jobs > 1:
+                pending.append(((filepath, rel_path, ext), st, None))
+                continue
+            if report is None:
+                report = inspect_source(filepath, rel_path, ext, detectors)
+                if st is not None:
+                    cache.store(report, st)
+            if pending:
+                # Keep walk order behind files still waiting for the pool
+                pending.append((None, None, report))
+                continue
+            for collector in collectors:
+                collector.on_source(report)
+
+    if pending:
+        tasks = [task for task, st, report in pending if report is None]
+        analyzed = _inspect_in_pool(tasks, detectors, jobs) if tasks else iter(())
+        for task, st, report in pending:
+            if report is None:
+                report = next(analyzed)
+                if st is not None:
+                    cache.store(report, st)
+            for collector in collectors:
+                collector.on_source(report)
+
+    if cache is not None:
+        cache.save()
+
+    return [collector.result() for collector in collectors]
+
+
+def scan_directory(path: Path) -> dict:
+    """Scan directory structure and gather intel."""
+    intel, = run_recon(path, [IntelCollector()], detectors=[])
     return intel
 
 
 def analyze_code_smells(path: Path) -> list:
     """Detect code smells and violations."""
-    smells = []
-    
-    for root, dirs, files in os.walk(path):
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
-        
-        for file in files:
-            filepath = Path(root) / file
-            ext = filepath.suffix.lower()
-            
-            if ext not in CODE_EXTENSIONS:
+    smells, = run_recon(path, [SmellCollector()])
+    return smells
+
+
+class GitError(Exception):
+    """Raised when the target is not a git work tree or git fails."""
+
+
+def _git(path: Path, *args, input: bytes = None) -> bytes:
+    try:
+        proc = subprocess.run(
+            ['git', '-C', str(path)] + list(args), input=input,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    except OSError as e:
+        raise GitError(f"git is not available: {e}")
+    if proc.returncode != 0:
+        raise GitError(proc.stderr.decode('utf-8', errors='ignore').strip())
+    return proc.stdout
+
+
+def git_changed_sources(path: Path, since: str = None, staged: bool = False) -> list:
+    """List code files changed according to git, with both versions.
+
+    Returns (rel_path, ext, before, after) tuples where before/after are the
+    file contents as bytes, or None when the file did not exist on that side.
+    --staged compares the index against `since` (default HEAD); otherwise
+    the working tree is compared against `since`, and untracked files that
+    are not ignored count as added. Only the diff is read, never the rest
+    of the tree. Submodules (gitlinks) are not files, and blobs git no
+    longer has read as absent.
+    """
+    if _git(path, 'rev-parse', '--is-inside-work-tree').strip() != b'true':
+        raise GitError(f"not inside a git work tree: {path}")
+
+    args = ['diff', '--raw', '-z', '--no-renames', '--abbrev=40', '--relative']
+    if staged:
+        args.append('--cached')
+    args += [since or 'HEAD', '--']
+    fields = _git(path, *args).split(b'\0')
+
+    def wanted(rel_path):
+        ext = os.path.splitext(rel_path)[1].lower()
+        if ext in CODE_EXTENSIONS and not IGNORE_DIRS.intersection(Path(rel_path).parts[:-1]):
+            return ext
+        return None
+
+    null_sha = '0' * 40
+    gitlink = '160000'
+    changes = []
+    blobs = set()
+    for meta, name in zip(fields[0::2], fields[1::2]):
+        if not meta.startswith(b':'):
+            continue
+        old_mode, new_mode, old_sha, new_sha, status = meta[1:].decode().split(' ')
+        rel_path = os.fsdecode(name)
+        ext = wanted(rel_path)
+        if ext is None:
+            continue
+        old_sha = None if old_sha == null_sha or old_mode == gitlink else old_sha
+        if status == 'D' or new_mode == gitlink:
+            new_sha = None
+        elif new_sha == null_sha:
+            new_sha = ''  # Working tree copy, read from disk
+        if old_sha is None and new_sha is None:
+            continue
+        changes.append((rel_path, ext, old_sha, new_sha))
+        blobs.update(sha for sha in (old_sha, new_sha) if sha)
+
+    if not staged:
+        # New files nobody has added yet are the ones most in need of a look
+        listed = {change[0]: n for n, change in enumerate(changes)}
+        others = _git(path, 'ls-files', '--others', '--exclude-standard', '-z', '--', '.')
+        for name in others.split(b'\0'):
+            rel_path = os.fsdecode(name)
+            ext = wanted(rel_path) if name else None
+            if ext is None:
                 continue
-                
+            if rel_path in listed:
+                # Removed from the index but still on disk
+                n = listed[rel_path]
+                changes[n] = changes[n][:3] + ('',)
+            else:
+                changes.append((rel_path, ext, None, ''))
+
+    # One cat-file process for every blob in the diff
+    contents = {}
+    if blobs:
+        order = sorted(blobs)
+        out = _git(path, 'cat-file', '--batch', input=''.join(f'{sha}\n' for sha in order).encode())
+        pos = 0
+        for sha in order:
+            header_end = out.index(b'\n', pos)
+            header = out[pos:header_end].split()
+            pos = header_end + 1
+            if header[-1] == b'missing':
+                continue  # Pruned or never fetched: treated as absent
+            size = int(header[2])
+            contents[sha] = out[pos:pos + size]
+            pos += size + 1
+
+    sources = []
+    for rel_path, ext, old_sha, new_sha in changes:
+        before = contents.get(old_sha) if old_sha else None
+        if new_sha == '':
             try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    lines = content.split('\n')
-                    rel_path = str(filepath.relative_to(path))
-                    
-                    # Check for console.log spam (JS/TS)
-                    if ext in ['.js', '.ts', '.jsx', '.tsx']:
-                        console_count = content.count('console.log')
-                        if console_count > 5:
-                            smells.append({
-                                'file': rel_path,
-                                'type': 'DEBUG_SPAM',
-                                'message': f'{console_count} console.log statements. Clean your foxhole.',
-                                'severity': 'WARNING'
-                            })
-                    
-                    # Check for any type abuse (TypeScript)
-                    if ext in ['.ts', '.tsx']:
-                        any_count = content.count(': any')
-                        if any_count > 3:
-                            smells.append({
-                                'file': rel_path,
-                                'type': 'TYPE_COWARDICE',
-                                'message': f'{any_count} uses of "any". TypeScript is your weapon. Use it.',
-                                'severity': 'CRITICAL'
-                            })
-                    
-                    # Check for TODO/FIXME (unfinished business)
-                    todo_count = content.lower().count('todo') + content.lower().count('fixme')
-                    if todo_count > 3:
-                        smells.append({
-                            'file': rel_path,
-                            'type': 'UNFINISHED_BUSINESS',
-                            'message': f'{todo_count} TODOs/FIXMEs. Finish what you started, soldier.',
-                            'severity': 'WARNING'
-                        })
-                    
-                    # Check nesting depth (looking for arrow hell)
-                    max_depth = 0
-                    current_depth = 0
-                    for char in content:
-                        if char in '{[(':
-                            current_depth += 1
-                            max_depth = max(max_depth, current_depth)
-                        elif char in '}])':
-                            current_depth = max(0, current_depth - 1)
-                    
-                    if max_depth > 8:
-                        smells.append({
-                            'file': rel_path,
-                            'type': 'CALLBACK_HELL',
-                            'message': f'Nesting depth of {max_depth}. This is not Inception.',
-                            'severity': 'CRITICAL'
-                        })
-                        
-            except Exception:
-                pass
-    
-    return smells
+                with open(path / rel_path, 'rb') as f:
+                    after = f.read()
+            except OSError:
+                after = None
+        else:
+            after = contents.get(new_sha) if new_sha else None
+        sources.append((rel_path, ext, before, after))
+    return sources
+
+
+def _hostile_keys(report: Optional[SourceReport]) -> dict:
+    """Hostiles in one report, keyed by (path, type) for diffing."""
+    hostiles = {}
+    if report is None:
+        return hostiles
+    big = large_file_hostile(report)
+    if big:
+        hostiles[(report.path, 'OVERSIZED')] = {
+            'file': report.path,
+            'type': 'OVERSIZED',
+            'message': f"{big['lines']} lines. Max {MAX_FILE_LINES}.",
+            'severity': big['severity']
+        }
+    for smell in report.smells:
+        hostiles[(report.path, smell['type'])] = smell
+    return hostiles
+
+
+def git_delta(path: Path, since: str = None, staged: bool = False, on_change=None) -> dict:
+    """Analyze both sides of a git diff and compare them.
+
+    on_change, if given, is called with each changed file's own record
+    (path, language, before/after lines, new and resolved hostiles) as
+    soon as that file has been analyzed.
+    """
+    delta = {
+        'files': 0,
+        'languages': defaultdict(lambda: {'before': 0, 'after': 0, 'files': 0}),
+        'new_hostiles': [],
+        'resolved_hostiles': [],
+    }
+    for rel_path, ext, before, after in git_changed_sources(path, since, staged):
+        old = analyze_source(before, rel_path, ext) if before is not None else None
+        new = analyze_source(after, rel_path, ext) if after is not None else None
+        old_hostiles = _hostile_keys(old)
+        new_hostiles = _hostile_keys(new)
+        change = {
+            'path': rel_path,
+            'language': CODE_EXTENSIONS[ext],
+            'before': (old.lines or 0) if old else 0,
+            'after': (new.lines or 0) if new else 0,
+            'new_hostiles': [h for k, h in new_hostiles.items() if k not in old_hostiles],
+            'resolved_hostiles': [h for k, h in old_hostiles.items() if k not in new_hostiles],
+        }
+        if on_change:
+            on_change(change)
+
+        delta['files'] += 1
+        lang = delta['languages'][change['language']]
+        lang['files'] += 1
+        lang['before'] += change['before']
+        lang['after'] += change['after']
+        delta['new_hostiles'].extend(change['new_hostiles'])
+        delta['resolved_hostiles'].extend(change['resolved_hostiles'])
+    return delta
+
+
+def _delta_scope(since: str = None, staged: bool = False) -> str:
+    if staged:
+        return f"staged changes vs {since or 'HEAD'}"
+    return f"working tree vs {since or 'HEAD'}"
+
+
+def delta_record(path: Path, since: str = None, staged: bool = False) -> dict:
+    """The delta SITREP as one JSON-ready dict."""
+    delta = git_delta(path, since, staged)
+    return {
+        'type': 'delta',
+        'ao': str(path.absolute()),
+        'scope': _delta_scope(since, staged),
+        'time': datetime.now().isoformat(timespec='seconds'),
+        **delta,
+    }
 
 
-def generate_sitrep(path: Path) -> str:
+def stream_delta(path: Path, since: str = None, staged: bool = False, out=None):
+    """Write the delta SITREP as NDJSON: a line per changed file as it is
+    analyzed, then a summary line with the totals."""
+    delta = git_delta(path, since, staged, on_change=lambda change: emit_record(
+        {'type': 'file', **change}, out))
+    emit_record({
+        'type': 'summary',
+        'ao': str(path.absolute()),
+        'scope': _delta_scope(since, staged),
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'files': delta['files'],
+        'languages': delta['languages'],
+        'new_hostiles': len(delta['new_hostiles']),
+        'resolved_hostiles': len(delta['resolved_hostiles']),
+    }, out)
+
+
+def generate_delta_sitrep(path: Path, since: str = None, staged: bool = False) -> str:
+    """Generate a situation report covering only what git says changed."""
+    delta = git_delta(path, since, staged)
+    scope = _delta_scope(since, staged)
+
+    report = []
+    report.append("=" * 60)
+    report.append("          🎖️  DELTA SITREP - RECON COMPLETE  🎖️")
+    report.append("=" * 60)
+    report.append(f"\n📍 AO (Area of Operations): {path.absolute()}")
+    report.append(f"🔀 Scope: {scope}")
+    report.append(f"📅 Recon Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    report.append("\n" + "-" * 40)
+    report.append("📊 FRONT LINE MOVEMENT")
+    report.append("-" * 40)
+    report.append(f"Changed Files: {delta['files']}")
+    for lang, data in sorted(delta['languages'].items(), key=lambda x: abs(x[1]['after'] - x[1]['before']), reverse=True):
+        change = data['after'] - data['before']
+        report.append(f"{lang:20} {change:+,} lines ({data['files']} files, {data['before']:,} → {data['after']:,})")
+
+    icons = {'CRITICAL': "🔴"}
+    if delta['new_hostiles']:
+        report.append("\n" + "-" * 40)
+        report.append("💀 NEW HOSTILES")
+        report.append("-" * 40)
+        for hostile in delta['new_hostiles']:
+            report.append(f"  {icons.get(hostile['severity'], '🟡')} [{hostile['type']}] {hostile['file']}")
+            report.append(f"      └─ {hostile['message']}")
+
+    if delta['resolved_hostiles']:
+        report.append("\n" + "-" * 40)
+        report.append("✅ HOSTILES NEUTRALIZED")
+        report.append("-" * 40)
+        for hostile in delta['resolved_hostiles']:
+            report.append(f"  ✔ [{hostile['type']}] {hostile['file']}")
+
+    report.append("\n" + "=" * 60)
+    net = len(delta['new_hostiles']) - len(delta['resolved_hostiles'])
+    if delta['files'] == 0:
+        report.append("\n📍 No code changes in scope. Nothing moved on the front line.")
+    elif net > 0:
+        report.append(f"\n⚠️  {net} more hostile(s) than before. You're losing ground, Private.")
+    elif net < 0:
+        report.append(f"\n✅ {-net} fewer hostile(s) than before. Ground gained. Good work, soldier.")
+    else:
+        report.append("\n📍 Holding the line. No net change in hostiles.")
+
+    report.append("\n" + "=" * 60)
+    report.append("        END TRANSMISSION - SERGEANT CLAUDE, ASF")
+    report.append("=" * 60)
+
+    return "\n".join(report)
+
+
+def threat_level(intel: dict, smell_count: int) -> str:
+    """LOW, MEDIUM, HIGH or CRITICAL, from what a recon pass turned up."""
+    if not intel['has_tests']:
+        return "CRITICAL"
+    if smell_count > 10 or intel['large_file_count'] > 5:
+        return "HIGH"
+    if smell_count > 5 or intel['large_file_count'] > 2:
+        return "MEDIUM"
+    return "LOW"
+
+
+def sitrep_record(path: Path, jobs: int = 1, use_cache: bool = True) -> dict:
+    """The tactical SITREP as one JSON-ready dict: intel, smells and threat level."""
+    cache = ReconCache(path) if use_cache else None
+    smell_collector = SmellCollector(TOP_SMELLS)
+    intel, smells = run_recon(path, [IntelCollector(), smell_collector], jobs=jobs, cache=cache)
+    return {
+        'type': 'sitrep',
+        'ao': str(path.absolute()),
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'intel': intel,
+        'smells': smells,
+        'smell_count': smell_collector.count,
+        'threat_level': threat_level(intel, smell_collector.count),
+    }
+
+
+def stream_sitrep(path: Path, jobs: int = 1, use_cache: bool = True, out=None):
+    """Write the tactical SITREP as NDJSON: a line per code file, in walk
+    order, as soon as it is analyzed, then a summary line with the intel."""
+    cache = ReconCache(path) if use_cache else None
+    intel, smell_count = run_recon(path, [IntelCollector(), StreamCollector(out)],
+                                   jobs=jobs, cache=cache)
+    emit_record({
+        'type': 'summary',
+        'ao': str(path.absolute()),
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'intel': intel,
+        'smells': smell_count,
+        'threat_level': threat_level(intel, smell_count),
+    }, out)
+
+
+def generate_sitrep(path: Path, jobs: int = 1, use_cache: bool = True) -> str:
     """Generate tactical situation report."""
-    intel = scan_directory(path)
-    smells = analyze_code_smells(path)
+    cache = ReconCache(path) if use_cache else None
+    smell_collector = SmellCollector(TOP_SMELLS)
+    intel, smells = run_recon(path, [IntelCollector(), smell_collector], jobs=jobs, cache=cache)
     
     report = []
     report.append("=" * 60)
@@ -235,44 +988,50 @@ def generate_sitrep(path: Path) -> str:
         report.append("\n" + "-" * 40)
         report.append("🎯 HOSTILES DETECTED (Oversized Files)")
         report.append("-" * 40)
-        for hostile in sorted(intel['large_files'], key=lambda x: x['lines'], reverse=True)[:10]:
+        for hostile in intel['large_files']:
             icon = "🔴" if hostile['severity'] == 'CRITICAL' else "🟡"
             report.append(f"  {icon} {hostile['path']} ({hostile['lines']} lines)")
+        if intel['large_file_count'] > len(intel['large_files']):
+            report.append(f"  ... and {intel['large_file_count'] - len(intel['large_files'])} more")
+
+    # Skipped payloads (binary, minified, generated)
+    if intel['skipped']:
+        report.append("\n" + "-" * 40)
+        report.append(f"🚫 NON-COMBATANTS ({intel['skipped_count']} skipped, not source)")
+        report.append("-" * 40)
+        for skipped in intel['skipped']:
+            report.append(f"  • {skipped['path']} - {skipped['reason']}")
+        if intel['skipped_count'] > len(intel['skipped']):
+            report.append(f"  ... and {intel['skipped_count'] - len(intel['skipped'])} more")
     
     # Code smells (enemy positions)
     if smells:
         report.append("\n" + "-" * 40)
         report.append("💀 ENEMY POSITIONS (Code Smells)")
         report.append("-" * 40)
-        for smell in smells[:15]:
+        for smell in smells:
             icon = "🔴" if smell['severity'] == 'CRITICAL' else "🟡"
             report.append(f"  {icon} [{smell['type']}] {smell['file']}")
             report.append(f"      └─ {smell['message']}")
+        if smell_collector.count > len(smells):
+            report.append(f"  ... and {smell_collector.count - len(smells)} more")
     
     # Tactical assessment
     report.append("\n" + "=" * 60)
     report.append("📋 TACTICAL ASSESSMENT")
     report.append("=" * 60)
     
-    threat_level = "LOW"
-    if len(smells) > 10 or len(intel['large_files']) > 5:
-        threat_level = "HIGH"
-    elif len(smells) > 5 or len(intel['large_files']) > 2:
-        threat_level = "MEDIUM"
-    
-    if not intel['has_tests']:
-        threat_level = "CRITICAL"
-    
+    level = threat_level(intel, smell_collector.count)
     threat_icons = {"LOW": "🟢", "MEDIUM": "🟡", "HIGH": "🟠", "CRITICAL": "🔴"}
-    report.append(f"\nTHREAT LEVEL: {threat_icons[threat_level]} {threat_level}")
+    report.append(f"\nTHREAT LEVEL: {threat_icons[level]} {level}")
     
-    if threat_level == "CRITICAL":
+    if level == "CRITICAL":
         report.append("\n⚠️  SITUATION IS DIRE. IMMEDIATE ACTION REQUIRED.")
         report.append("    Sergeant recommends /run-delta for emergency stabilization.")
-    elif threat_level == "HIGH":
+    elif level == "HIGH":
         report.append("\n⚠️  HEAVY RESISTANCE EXPECTED. Plan your approach carefully.")
         report.append("    Sergeant recommends systematic /court-martial of each hostile.")
-    elif threat_level == "MEDIUM":
+    elif level == "MEDIUM":
         report.append("\n📍 Moderate cleanup required. Nothing we can't handle.")
         report.append("    Proceed with /run-alpha when ready.")
     else:
@@ -287,12 +1046,36 @@ def generate_sitrep(path: Path) -> str:
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: recon.py <target_directory>")
-        print("\nDrops a recon agent into the specified codebase.")
-        sys.exit(1)
-    
-    target = Path(sys.argv[1])
+    parser = argparse.ArgumentParser(
+        prog="recon.py",
+        description="Drops a recon agent into the specified codebase."
+    )
+    parser.add_argument("target", help="target directory")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="analyze files across N worker processes (0 = one per CPU)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="ignore and don't update the recon cache in ~/.sergeant/cache/recon"
+    )
+    parser.add_argument(
+        "--since", metavar="REF",
+        help="only analyze files changed since a git ref and report the delta"
+    )
+    parser.add_argument(
+        "--staged", action="store_true",
+        help="only analyze staged changes (vs --since, default HEAD) and report the delta"
+    )
+    parser.add_argument(
+        "--format", choices=("text", "json", "ndjson"), default="text",
+        help="text SITREP (default), one JSON document, or NDJSON streamed "
+             "a line per file as it is analyzed, then a summary line"
+    )
+    args = parser.parse_args()
+
+    target = Path(args.target)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
     
     if not target.exists():
         print(f"❌ Target directory does not exist: {target}")
@@ -302,7 +1085,26 @@ def main():
         print(f"❌ Target is not a directory: {target}")
         sys.exit(1)
     
-    print(generate_sitrep(target))
+    if args.since or args.staged:
+        try:
+            if args.format == "ndjson":
+                stream_delta(target, since=args.since, staged=args.staged)
+            elif args.format == "json":
+                print(json.dumps(delta_record(target, since=args.since, staged=args.staged), indent=2))
+            else:
+                print(generate_delta_sitrep(target, since=args.since, staged=args.staged))
+        except GitError as e:
+            print(f"❌ Git recon failed: {e}")
+            sys.exit(1)
+        return
+
+    use_cache = not args.no_cache
+    if args.format == "ndjson":
+        stream_sitrep(target, jobs=jobs, use_cache=use_cache)
+    elif args.format == "json":
+        print(json.dumps(sitrep_record(target, jobs=jobs, use_cache=use_cache), indent=2))
+    else:
+        print(generate_sitrep(target, jobs=jobs, use_cache=use_cache))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - XP CLIENT
+Same commands and output as xp_tracker.py, served by sergeantd when it is
+running and handled in-process when it is not.
+
+Usage: python sergeant.py [profile|award <action>|award --batch [file|-]|loot [rarity]|daily|achievements]
+
+Kept to the standard library's socket and json so that talking to the
+daemon costs no more than starting the interpreter. socket itself is only
+imported when a daemon socket exists: without one, this is the cheapest
+way into xp_tracker (its bytecode is cached, unlike a script's).
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+SOCKET_ENV = "SERGEANT_SOCKET"
+
+
+def socket_path() -> Path:
+    """Where sergeantd listens: $SERGEANT_SOCKET or ~/.sergeant/sergeantd.sock."""
+    path = os.environ.get(SOCKET_ENV)
+    return Path(path) if path else Path.home() / ".sergeant" / "sergeantd.sock"
+
+
+def connect(path: Path = None, timeout: float = 5.0):
+    """A socket connected to sergeantd, or None when it is not running."""
+    path = path or socket_path()
+    if not os.path.exists(path):
+        return None
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def exchange(sock, argv: list, stdin: str = None) -> dict:
+    """Send one command over a socket from connect() and read the reply."""
+    message = {"argv": argv}
+    if stdin is not None:
+        message["stdin"] = stdin
+    sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+    reply = b''
+    while not reply.endswith(b'\n'):
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("sergeantd closed the connection")
+        reply += chunk
+    return json.loads(reply)
+
+
+def request(argv: list, path: Path = None, timeout: float = 5.0) -> dict:
+    """Send one command to sergeantd and return its reply.
+
+    Raises ConnectionRefusedError when no daemon is listening.
+    """
+    sock = connect(path, timeout)
+    if sock is None:
+        raise ConnectionRefusedError(f"sergeantd is not listening on {path or socket_path()}")
+    with sock:
+        return exchange(sock, argv)
+
+
+def main():
+    sock = connect()
+    if sock is None:
+        import xp_tracker
+        from state_io import StateError
+
+        try:
+            xp_tracker.main()
+        except StateError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        return
+
+    argv, stdin = sys.argv[1:], None
+    if argv[:2] == ["award", "--batch"]:
+        # The daemon has neither our stdin nor our working directory
+        source = argv[2] if len(argv) > 2 else "-"
+        try:
+            if source == "-":
+                stdin = sys.stdin.read()
+            else:
+                with open(source, 'r', encoding='utf-8') as f:
+                    stdin = f.read()
+        except OSError as e:
+            print(f"❌ award --batch: {e}")
+            sys.exit(1)
+        argv = ["award", "--batch", "-"]
+
+    # Once connected, never fall back: the daemon may already have applied
+    # the award, and running it again in-process would count it twice
+    with sock:
+        reply = exchange(sock, argv, stdin)
+    sys.stdout.write(reply.get("output", ""))
+    if reply.get("error"):
+        print(f"❌ sergeantd: {reply['error']}")
+    if not reply.get("ok"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
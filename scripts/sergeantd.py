@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - RESIDENT DAEMON
+Keeps the soldier's profile loaded so an award is a socket round trip,
+not an interpreter start, an import, a profile load and a profile save.
+
+Usage:
+    python sergeantd.py [--socket PATH] [--flush-interval SECONDS] [--flush-every N]
+    python sergeantd.py stop | status
+
+Clients (see sergeant.py) connect once per request and send it as one
+JSON line, with the input for "award --batch -" in "stdin" when there is
+any:
+
+    {"argv": ["award", "bug_fixed"]}
+
+and get one JSON reply line with what xp_tracker.py would have printed:
+
+    {"ok": true, "output": "..."}
+
+Changes are written behind: at most flush-interval seconds or flush-every
+commands after they happen, and always on stop, SIGTERM or Ctrl+C. Each
+flush is merged onto the latest stored profile, so scripts that write it
+directly meanwhile (achievements.py unlock, daily_challenges.py progress)
+keep their medals and XP.
+"""
+
+import argparse
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from sergeant import SOCKET_ENV, request, socket_path
+from state_io import StateError
+
+# Commands answered by the daemon itself rather than xp_tracker
+CONTROL_COMMANDS = ("ping", "flush", "stop")
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    """Serves one request per connection.
+
+    Requests are served one at a time, so a client that stalls holds up
+    every other one: it gets `timeout` seconds to send its request, well
+    under the 5 seconds sergeant.py waits for a reply.
+    """
+
+    timeout = 2.0
+
+    def handle(self):
+        try:
+            line = self.rfile.readline()
+        except OSError:
+            return  # timed out or hung up before sending anything
+        if not line.strip():
+            return
+        try:
+            message = json.loads(line)
+            argv = [str(arg) for arg in message["argv"]]
+            reply = self.server.execute(argv, message.get("stdin"))
+        except (ValueError, KeyError, TypeError) as e:
+            reply = {"ok": False, "error": f"Bad request: {e}"}
+        self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+
+class SergeantDaemon(socketserver.UnixStreamServer):
+    """Single-threaded server: commands run one at a time against one tracker."""
+
+    def __init__(self, path: Path, tracker):
+        self.tracker = tracker
+        self.stopping = False
+        super().__init__(str(path), CommandHandler)
+        os.chmod(path, 0o600)
+
+    def execute(self, argv: list, stdin: str = None) -> dict:
+        if argv and argv[0] in CONTROL_COMMANDS:
+            return self.control(argv[0])
+
+        import xp_tracker
+
+        output = io.StringIO()
+        real_stdin = sys.stdin
+        # award --batch - reads the client's stdin, which it sends along
+        sys.stdin = io.StringIO(stdin or "")
+        try:
+            with redirect_stdout(output):
+                status = xp_tracker.run_command(self.tracker, argv)
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}", "output": output.getvalue()}
+        finally:
+            sys.stdin = real_stdin
+        return {"ok": not status, "output": output.getvalue()}
+
+    def control(self, command: str) -> dict:
+        if command == "flush":
+            self.tracker.flush()
+        elif command == "stop":
+            self.stopping = True
+        return {"ok": True, "output": "", "pid": os.getpid()}
+
+    def service_actions(self):
+        # Called by serve_forever after every request and poll
+        if self.stopping:
+            raise SystemExit(0)
+
+
+def is_running(path: Path) -> bool:
+    try:
+        request(["ping"], path, timeout=1.0)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def serve(path: Path, flush_interval: float, flush_every: int):
+    from xp_tracker import XPTracker
+
+    if is_running(path):
+        print(f"❌ sergeantd is already running on {path}")
+        sys.exit(1)
+    # A socket file left behind by a daemon that did not exit cleanly
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tracker = XPTracker(write_behind=True, flush_interval=flush_interval, flush_every=flush_every)
+    daemon = SergeantDaemon(path, tracker)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"🎖️ sergeantd reporting for duty on {path} (pid {os.getpid()})", flush=True)
+    try:
+        daemon.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        tracker.flush()
+        tracker.store.close()
+        print("🎖️ sergeantd dismissed, profile saved", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sergeant Claude resident XP daemon")
+    parser.add_argument("command", nargs="?", choices=("serve", "stop", "status"), default="serve")
+    parser.add_argument("--socket", type=Path, default=None,
+                        help=f"Socket path (default: ${SOCKET_ENV} or ~/.sergeant/sergeantd.sock)")
+    parser.add_argument("--flush-interval", type=float, default=2.0,
+                        help="Write changes at most this many seconds after they happen (default: 2)")
+    parser.add_argument("--flush-every", type=int, default=50,
+                        help="Write changes after this many commands at the latest (default: 50)")
+    args = parser.parse_args()
+    path = args.socket or socket_path()
+
+    if args.command == "serve":
+        serve(path, args.flush_interval, max(1, args.flush_every))
+        return
+
+    try:
+        reply = request(["stop" if args.command == "stop" else "ping"], path)
+    except (OSError, ValueError):
+        print(f"sergeantd is not running ({path})")
+        sys.exit(1 if args.command == "stop" else 3)
+    if args.command == "stop":
+        print(f"🎖️ sergeantd (pid {reply.get('pid')}) stood down")
+    else:
+        print(f"🎖️ sergeantd is running on {path} (pid {reply.get('pid')})")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except StateError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
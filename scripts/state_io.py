@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - STATE I/O
+Crash-safe, lock-aware reads and writes for every state file.
+
+Writes land in a temp file next to the target, are fsynced, then swapped in
+with os.replace(), so readers only ever see a complete document.
+Read-modify-write cycles hold an advisory lock on a sidecar .lock file
+(fcntl.flock; an O_EXCL lock file where fcntl does not exist), so hooks
+firing at the same time queue up instead of overwriting each other.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Seconds to wait for a lock before giving up
+LOCK_TIMEOUT = 10.0
+# An O_EXCL lock file older than this is assumed abandoned by a dead process
+STALE_LOCK_AGE = 60.0
+# Attempts for reads and replaces that race with another writer
+RETRIES = 5
+
+
+class StateError(Exception):
+    """A state file exists but cannot be read, or its lock never frees up."""
+
+
+_held = threading.local()
+
+
+def _backoff(attempt: int) -> float:
+    return min(0.2, 0.005 * (2 ** attempt))
+
+
+def _lock_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + '.lock')
+
+
+@contextmanager
+def locked(path: Path, timeout: float = LOCK_TIMEOUT):
+    """Hold the exclusive advisory lock for a state file.
+
+    Re-entrant within a thread, so helpers called while a lock is held can
+    lock again freely. Other threads and processes wait, retrying with
+    backoff, and StateError is raised after timeout seconds.
+    """
+    lock_path = _lock_path(path)
+    key = str(lock_path)
+    depths = getattr(_held, 'depths', None)
+    if depths is None:
+        depths = _held.depths = {}
+    if depths.get(key):
+        depths[key] += 1
+        try:
+            yield
+        finally:
+            depths[key] -= 1
+        return
+
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    release = _acquire(lock_path, timeout)
+    depths[key] = 1
+    try:
+        yield
+    finally:
+        depths[key] = 0
+        release()
+
+
+def _acquire(lock_path: Path, timeout: float):
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        if fcntl is not None:
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+            else:
+                def release():
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                    os.close(fd)
+                return release
+        else:
+            try:
+                fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > STALE_LOCK_AGE:
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    pass
+            else:
+                os.close(fd)
+                return lambda: os.remove(lock_path)
+
+        if time.monotonic() >= deadline:
+            raise StateError(f"Timed out after {timeout:.0f}s waiting for {lock_path}")
+        time.sleep(_backoff(attempt))
+        attempt += 1
+
+
+def read_json(path: Path, default=None):
+    """Load a JSON state file.
+
+    A missing file gives default (called first if it is callable). A file
+    that will not parse is retried a few times, in case a writer that
+    bypasses this module is mid-write, then raises StateError. It never
+    silently comes back as default.
+    """
+    path = Path(path)
+    for attempt in range(RETRIES):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default() if callable(default) else default
+        except (ValueError, UnicodeDecodeError) as e:
+            error = e
+        except OSError as e:
+            raise StateError(f"Cannot read {path}: {e}") from e
+        time.sleep(_backoff(attempt))
+    raise StateError(f"{path} is corrupt ({error}). Fix or move it; it was left untouched.")
+
+
+def _create_temp(path: Path):
+    """Open a new, uniquely named temp file next to path.
+
+    What tempfile.mkstemp() does, without the cost of importing tempfile
+    (and shutil and random with it) on every hook.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        tmp_path = path.with_name(f'.{path.name}.{os.urandom(6).hex()}.tmp')
+        try:
+            return os.open(tmp_path, flags, 0o600), tmp_path
+        except FileExistsError:
+            continue
+
+
+def write_text(path: Path, text: str, durable: bool = True):
+    """Atomically replace path with text: temp file, fsync, os.replace.
+
+    durable=False skips the fsync, for caches that can afford to lose a
+    write on power loss but not to pay for one per file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = _create_temp(path)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        for attempt in range(RETRIES):
+            try:
+                os.replace(tmp_path, path)
+                return
+            except PermissionError:
+                # Windows refuses while another process has the file open
+                if attempt == RETRIES - 1:
+                    raise
+                time.sleep(_backoff(attempt))
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json(path: Path, data, durable: bool = True, **dump_options):
+    """Atomically replace a JSON state file. Pretty-printed unless told otherwise."""
+    dump_options.setdefault('indent', 2)
+    write_text(path, json.dumps(data, **dump_options), durable)
+
+
+def prune_oldest(directory: Path, keep: int, suffix: str = '.json') -> int:
+    """Delete all but the keep most recently modified *suffix files in
+    directory, so a cache cannot grow without bound. Best effort: files
+    that vanish or cannot be removed are skipped. Returns how many went."""
+    found = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(suffix) and not entry.name.startswith('.'):
+                    try:
+                        found.append((entry.stat().st_mtime_ns, entry.path))
+                    except OSError:
+                        pass
+    except OSError:
+        return 0
+    if len(found) <= keep:
+        return 0
+    found.sort(reverse=True)
+    removed = 0
+    for _, path in found[keep:]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+@contextmanager
+def update_json(path: Path, default=None, **dump_options):
+    """Locked read-modify-write of a JSON state file.
+
+        with update_json(path, dict) as state:
+            state["xp"] += 50
+
+    The document is written back atomically when the block exits cleanly.
+    """
+    with locked(path):
+        data = read_json(path, default)
+        yield data
+        write_json(path, data, **dump_options)
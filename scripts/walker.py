@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+SERGEANT CLAUDE - AO WALKER
+Walks an area of operations the way recon and court martial see it.
+
+Built on os.scandir: every entry comes back as an os.DirEntry, so file type
+checks need no extra stat call and entry.stat() is cached. .gitignore and
+.sergeantignore files (plus .git/info/exclude at the root) are compiled as
+the walk reaches them, and an ignored directory is pruned before anything
+inside it is listed, let alone read.
+
+Ignore rules follow gitignore: blank lines and # comments are skipped, !
+re-includes, a trailing / matches directories only, a pattern with a / in
+it is relative to the file's directory, and * ? [] ** glob as in git.
+Deeper files override shallower ones, and later lines override earlier
+ones.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+
+IGNORE_FILES = ('.gitignore', '.sergeantignore')
+
+
+def _translate_segment(segment: str) -> str:
+    """Regex for one path segment of a glob: * ? [...] and \\ escapes."""
+    out = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        if char == '\\' and i + 1 < len(segment):
+            out.append(re.escape(segment[i + 1]))
+            i += 2
+            continue
+        if char == '*':
+            out.append('[^/]*')
+        elif char == '?':
+            out.append('[^/]')
+        elif char == '[':
+            end = segment.find(']', i + 2)
+            if end < 0:
+                out.append(re.escape(char))
+            else:
+                body = segment[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\').replace('[', '\\[') + ']')
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return ''.join(out)
+
+
+def translate(pattern: str) -> str:
+    """Regex matching the paths, relative to the ignore file, a glob covers."""
+    anchored = '/' in pattern
+    segments = pattern.lstrip('/').split('/')
+    out = []
+    for n, segment in enumerate(segments):
+        last = n == len(segments) - 1
+        if segment == '**':
+            # a/** is everything inside a; **/b and a/**/b any depth
+            out.append('.*' if last else '(?:.*/)?')
+            continue
+        out.append(_translate_segment(segment))
+        if not last:
+            out.append('/')
+    regex = ''.join(out)
+    return regex if anchored else '(?:.*/)?' + regex
+
+
+class IgnoreRules:
+    """The rules of the ignore files in one directory, compiled.
+
+    Rules are tried in reverse through a single alternation per entry kind,
+    so one fullmatch() finds the last rule that applies.
+    """
+
+    def __init__(self, base: str, lines):
+        self.base = base
+        rules = []
+        for line in lines:
+            line = line.rstrip('\n')
+            # Trailing spaces are dropped unless escaped
+            stripped = line.rstrip(' ')
+            if stripped.endswith('\\') and len(stripped) < len(line):
+                stripped += ' '
+            line = stripped
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            elif line.startswith(('\\!', '\\#')):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if line:
+                rules.append((translate(line), negated, dir_only))
+        self.empty = not rules
+        self.dirs = self._compile(rules)
+        self.files = self._compile([rule for rule in rules if not rule[2]])
+
+    @staticmethod
+    def _compile(rules):
+        if not rules:
+            return None, ()
+        rules = rules[::-1]
+        pattern = re.compile('|'.join(f'({regex})' for regex, _, _ in rules), re.DOTALL)
+        return pattern, tuple(negated for _, negated, _ in rules)
+
+    def match(self, rel_path: str, is_dir: bool):
+        """True if ignored, False if re-included, None if no rule applies."""
+        pattern, negated = self.dirs if is_dir else self.files
+        if pattern is None:
+            return None
+        if self.base:
+            rel_path = rel_path[len(self.base) + 1:]
+        found = pattern.fullmatch(rel_path)
+        if found is None:
+            return None
+        return not negated[found.lastindex - 1]
+
+
+def _read_lines(path) -> list:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.readlines()
+    except OSError:
+        return []
+
+
+def _load_rules(top: str, base: str, entries: list, ignore_files) -> IgnoreRules | None:
+    lines = []
+    if not base:
+        lines.extend(_read_lines(os.path.join(top, '.git', 'info', 'exclude')))
+    for name in ignore_files:
+        for entry in entries:
+            if entry.name == name:
+                lines.extend(_read_lines(entry.path))
+    rules = IgnoreRules(base, lines) if lines else None
+    return None if rules is None or rules.empty else rules
+
+
+def is_ignored(rule_sets: tuple, rel_path: str, is_dir: bool) -> bool:
+    """Whether the deepest rule that matches rel_path (posix) ignores it."""
+    for rules in reversed(rule_sets):
+        verdict = rules.match(rel_path, is_dir)
+        if verdict is not None:
+            return verdict
+    return False
+
+
+def walk(root: Path, skip_dirs=frozenset(), ignore_files=IGNORE_FILES):
+    """Yield (rel_root, dirs, files) for root and every directory below it.
+
+    Like os.walk(topdown=True): rel_root is relative to root ('' for root
+    itself, os.sep separated), dirs and files are lists of os.DirEntry,
+    directories are visited depth first in scandir order, symlinked
+    directories are listed but not entered, and unreadable directories are
+    skipped. skip_dirs names are never entered, and ignored entries are
+    left out of both lists. Removing entries from dirs before resuming the
+    generator prunes them too.
+    """
+    root = os.fspath(root)
+    # (directory, rel path, posix rel path, rule sets in force)
+    stack = [(root, '', '', ())]
+    while stack:
+        top, rel, key, rule_sets = stack.pop()
+        try:
+            with os.scandir(top) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        if ignore_files:
+            rules = _load_rules(top, key, entries, ignore_files)
+            if rules is not None:
+                rule_sets += (rules,)
+
+        dirs, files = [], []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir and entry.name in skip_dirs:
+                continue
+            if rule_sets and is_ignored(rule_sets, f'{key}/{entry.name}' if key else entry.name, is_dir):
+                continue
+            (dirs if is_dir else files).append(entry)
+
+        yield rel, dirs, files
+
+        for entry in reversed(dirs):
+            if entry.is_symlink():
+                continue
+            stack.append((
+                entry.path,
+                os.path.join(rel, entry.name) if rel else entry.name,
+                f'{key}/{entry.name}' if key else entry.name,
+                rule_sets,
+            ))
@@ -4,13 +4,26 @@ SERGEANT CLAUDE - COMBAT XP & ACHIEVEMENT SYSTEM
 Maximum dopamine. Mobile game mechanics. Progress bars everywhere.
 """
 
+from __future__ import annotations
+
+import atexit
 import json
-import os
+import sys
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
-import random
+from contextlib import contextmanager
+
+from achievement_index import AchievementIndex
+from profile_schema import (adopt_profile, default_profile_path, load_profile, merge_changes,
+                            retire_legacy)
+from profile_store import ProfileStore, open_store
+from ranks import load_ranks
+from state_io import StateError
+
+# Write-behind defaults: save at most this long / this many changes late
+FLUSH_INTERVAL = 2.0
+FLUSH_EVERY = 50
 
 # XP VALUES - Calibrated for dopamine
 XP_VALUES = {
@@ -46,25 +59,6 @@ XP_VALUES = {
     "speed_demon": 200,  # Complete objective under time
 }
 
-# RANKS - Military progression with XP thresholds
-RANKS = [
-    {"name": "Recruit", "xp": 0, "icon": "🔰", "title": "Fresh Meat"},
-    {"name": "Private", "xp": 500, "icon": "💂", "title": "Boot"},
-    {"name": "Private First Class", "xp": 1500, "icon": "🎖️", "title": "Getting There"},
-    {"name": "Corporal", "xp": 3500, "icon": "⭐", "title": "Not Terrible"},
-    {"name": "Sergeant", "xp": 7000, "icon": "⭐⭐", "title": "Competent"},
-    {"name": "Staff Sergeant", "xp": 12000, "icon": "⭐⭐⭐", "title": "Reliable"},
-    {"name": "Master Sergeant", "xp": 20000, "icon": "🌟", "title": "Seasoned"},
-    {"name": "First Sergeant", "xp": 32000, "icon": "🌟🌟", "title": "Veteran"},
-    {"name": "Sergeant Major", "xp": 50000, "icon": "🌟🌟🌟", "title": "War Hero"},
-    {"name": "Lieutenant", "xp": 75000, "icon": "🎗️", "title": "Officer Material"},
-    {"name": "Captain", "xp": 110000, "icon": "🎗️🎗️", "title": "Leader"},
-    {"name": "Major", "xp": 160000, "icon": "🏅", "title": "Strategist"},
-    {"name": "Colonel", "xp": 230000, "icon": "🏅🏅", "title": "Commander"},
-    {"name": "General", "xp": 320000, "icon": "⚔️", "title": "Legendary"},
-    {"name": "Supreme Commander", "xp": 500000, "icon": "👑", "title": "Mythic"},
-]
-
 # ACHIEVEMENTS
 ACHIEVEMENTS = {
     # Combat Achievements
@@ -73,7 +67,9 @@ ACHIEVEMENTS = {
         "desc": "Fix your first bug",
         "icon": "🩸",
         "xp_reward": 100,
-        "rarity": "COMMON"
+        "rarity": "COMMON",
+        "stat": "bugs_fixed",
+        "threshold": 1
     },
     "bug_hunter": {
         "name": "Bug Hunter",
@@ -81,6 +77,7 @@ ACHIEVEMENTS = {
         "icon": "🐛",
         "xp_reward": 250,
         "rarity": "COMMON",
+        "stat": "bugs_fixed",
         "threshold": 10
     },
     "exterminator": {
@@ -89,6 +86,7 @@ ACHIEVEMENTS = {
         "icon": "☠️",
         "xp_reward": 1000,
         "rarity": "RARE",
+        "stat": "bugs_fixed",
         "threshold": 50
     },
     "bug_genocide": {
@@ -97,6 +95,7 @@ ACHIEVEMENTS = {
         "icon": "💀",
         "xp_reward": 5000,
         "rarity": "LEGENDARY",
+        "stat": "bugs_fixed",
         "threshold": 200
     },
     
@@ -106,7 +105,9 @@ ACHIEVEMENTS = {
         "desc": "Write your first test",
         "icon": "🧪",
         "xp_reward": 100,
-        "rarity": "COMMON"
+        "rarity": "COMMON",
+        "stat": "tests_written",
+        "threshold": 1
     },
     "test_believer": {
         "name": "Test Believer",
@@ -114,6 +115,7 @@ ACHIEVEMENTS = {
         "icon": "🔬",
         "xp_reward": 500,
         "rarity": "UNCOMMON",
+        "stat": "tests_written",
         "threshold": 25
     },
     "test_zealot": {
@@ -122,6 +124,7 @@ ACHIEVEMENTS = {
         "icon": "⚗️",
         "xp_reward": 2000,
         "rarity": "EPIC",
+        "stat": "tests_written",
         "threshold": 100
     },
     "not_a_twirk": {
@@ -139,6 +142,7 @@ ACHIEVEMENTS = {
         "icon": "📅",
         "xp_reward": 150,
         "rarity": "COMMON",
+        "stat": "streak",
         "threshold": 3
     },
     "dedicated": {
@@ -147,6 +151,7 @@ ACHIEVEMENTS = {
         "icon": "🔥",
         "xp_reward": 500,
         "rarity": "UNCOMMON",
+        "stat": "streak",
         "threshold": 7
     },
     "committed": {
@@ -155,6 +160,7 @@ ACHIEVEMENTS = {
         "icon": "🔥🔥",
         "xp_reward": 1500,
         "rarity": "RARE",
+        "stat": "streak",
         "threshold": 14
     },
     "unstoppable": {
@@ -163,6 +169,7 @@ ACHIEVEMENTS = {
         "icon": "🔥🔥🔥",
         "xp_reward": 5000,
         "rarity": "EPIC",
+        "stat": "streak",
         "threshold": 30
     },
     "no_life": {
@@ -171,6 +178,7 @@ ACHIEVEMENTS = {
         "icon": "💎🔥",
         "xp_reward": 25000,
         "rarity": "LEGENDARY",
+        "stat": "streak",
         "threshold": 100
     },
     
@@ -227,7 +235,9 @@ ACHIEVEMENTS = {
         "desc": "Complete your first mission",
         "icon": "🎯",
         "xp_reward": 500,
-        "rarity": "UNCOMMON"
+        "rarity": "UNCOMMON",
+        "stat": "missions_completed",
+        "threshold": 1
     },
     "veteran": {
         "name": "Veteran",
@@ -235,6 +245,7 @@ ACHIEVEMENTS = {
         "icon": "🎖️",
         "xp_reward": 2500,
         "rarity": "RARE",
+        "stat": "missions_completed",
         "threshold": 5
     },
     "war_hero": {
@@ -243,6 +254,7 @@ ACHIEVEMENTS = {
         "icon": "🏆",
         "xp_reward": 10000,
         "rarity": "EPIC",
+        "stat": "missions_completed",
         "threshold": 20
     },
     
@@ -253,6 +265,7 @@ ACHIEVEMENTS = {
         "icon": "🎮",
         "xp_reward": 100,
         "rarity": "COMMON",
+        "stat": "combo",
         "threshold": 5
     },
     "combo_king": {
@@ -261,6 +274,7 @@ ACHIEVEMENTS = {
         "icon": "👑",
         "xp_reward": 500,
         "rarity": "RARE",
+        "stat": "combo",
         "threshold": 15
     },
     "combo_god": {
@@ -269,6 +283,7 @@ ACHIEVEMENTS = {
         "icon": "🌟👑",
         "xp_reward": 3000,
         "rarity": "LEGENDARY",
+        "stat": "combo",
         "threshold": 50
     },
     
@@ -303,6 +318,27 @@ ACHIEVEMENTS = {
     },
 }
 
+# Achievements earned by a counter reaching a threshold, indexed by counter.
+# "streak" is the current streak and "combo" the highest combo.
+ACHIEVEMENT_INDEX = AchievementIndex({
+    ach_id: {ach["stat"]: ach["threshold"]}
+    for ach_id, ach in ACHIEVEMENTS.items() if "stat" in ach
+})
+
+# Action -> the stats counter it increments
+STAT_MAP = {
+    "bug_fixed": "bugs_fixed",
+    "test_written": "tests_written",
+    "file_created": "files_created",
+    "feature_complete": "features_complete",
+    "objective_complete": "objectives_completed",
+    "mission_complete": "missions_completed",
+    "recon_complete": "recons",
+    "court_martial_run": "court_martials",
+    "ambush_complete": "ambushes",
+    "fortify_complete": "fortifications",
+}
+
 # RARITY COLORS
 RARITY_COLORS = {
     "COMMON": "⬜",
@@ -348,75 +384,145 @@ LOOT_TABLE = {
 
 
 class XPTracker:
-    def __init__(self, save_path: str = None):
+    """The soldier's profile and everything that changes it.
+    
+    By default every mutation is saved before it returns. With
+    write_behind=True mutations only mark the profile dirty, and it is
+    saved flush_interval seconds after the first unsaved change, after
+    flush_every changes, on flush(), on leaving a with-block, or at
+    interpreter exit, whichever comes first. A flush applies what changed
+    since the last save onto the latest stored profile (merge_changes), so
+    what other processes saved meanwhile is kept.
+    """
+    
+    def __init__(self, save_path: str = None, store: ProfileStore = None,
+                 write_behind: bool = False, flush_interval: float = FLUSH_INTERVAL,
+                 flush_every: int = FLUSH_EVERY):
         if save_path is None:
-            # Use global profile in ~/.sergeant/
-            sergeant_dir = Path.home() / ".sergeant"
-            sergeant_dir.mkdir(parents=True, exist_ok=True)
-            self.save_path = sergeant_dir / "profile.json"
+            # Use the global profile in ~/.sergeant/, shared by every script
+            self.save_path = default_profile_path()
         else:
             self.save_path = Path(save_path)
-        self.data = self._load()
+        # Backend comes from $SERGEANT_STORE unless one is passed in
+        self.store = store if store is not None else open_store(self.save_path)
+        # Loaded on first use: an award reads the profile inside its
+        # transaction, so loading it up front would read it twice
+        self._data = None
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.dirty = False
+        self._changes = 0
+        self._timer = None
+        self._lock = threading.RLock()
+        self._earned = None
+        # Write-behind: the profile as stored when the unsaved changes began
+        self._base = None
+    
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = self._load()
+        return self._data
+    
+    @data.setter
+    def data(self, profile: dict):
+        self._data = profile
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.flush()
     
     def _load(self) -> dict:
         """Load profile or create new one."""
-        default = {
-            "xp": 0,
-            "lifetime_xp": 0,
-            "rank_index": 0,
-            "achievements": [],
-            "titles": ["Recruit"],
-            "active_title": "Recruit",
-            "stats": {
-                "bugs_fixed": 0,
-                "tests_written": 0,
-                "files_created": 0,
-                "objectives_completed": 0,
-                "missions_completed": 0,
-                "clean_court_martials": 0,
-                "clean_court_martial_streak": 0,
-            },
-            "streak": {
-                "current": 0,
-                "longest": 0,
-                "last_active": None,
-            },
-            "combo": {
-                "current": 0,
-                "highest": 0,
-                "last_action": None,
-            },
-            "multiplier": {
-                "value": 1.0,
-                "expires": None,
-            },
-            "daily": {
-                "xp_earned": 0,
-                "actions": 0,
-                "date": None,
-            },
-            "inventory": [],
-            "created": datetime.now().isoformat(),
-            "last_session": None,
-        }
-        
-        if self.save_path.exists():
-            try:
-                with open(self.save_path, 'r', encoding='utf-8') as f:
-                    loaded = json.load(f)
-                    # Merge with defaults for new fields
-                    for key in default:
-                        if key not in loaded:
-                            loaded[key] = default[key]
-                    return loaded
-            except:
-                pass
-        return default
-    
-    def _save(self):
+        return load_profile(self.store)
+    
+    def _save(self, event: str = "save", **detail):
         """Save profile."""
-        with open(self.save_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2, default=str)
+        self.store.save(self.data, event, **detail)
+    
+    @contextmanager
+    def _transaction(self, event: str, **detail):
+        """Apply one mutation to the latest stored profile, then save it.
+        
+        Stores that serialize writers hand back what other sessions wrote
+        since we loaded, so concurrent awards never overwrite each other.
+        """
+        with self._lock:
+            if self.write_behind:
+                if not self.dirty:
+                    # Pick up what other processes saved since our last flush.
+                    # Copied, as a store may hand back the profile it caches
+                    import copy
+                    self._base = copy.deepcopy(self._load())
+                    self.data = copy.deepcopy(self._base)
+                yield
+                self._mark_dirty()
+                return
+            legacy = []
+            with self.store.transaction() as latest:
+                if latest is not None or self._data is None:
+                    self.data, legacy = adopt_profile(self.store, latest)
+                yield
+                self._save(event, **detail)
+                retire_legacy(legacy)
+    
+    def refresh(self):
+        """Pick up what other processes saved, before answering a read.
+        
+        Only a write-behind tracker holds the profile between commands.
+        With unsaved changes it keeps them as they are: flush merges them
+        onto the latest profile.
+        """
+        with self._lock:
+            if self.write_behind and not self.dirty:
+                self.data = self._load()
+    
+    def _mark_dirty(self):
+        self._changes += 1
+        if not self.dirty:
+            self.dirty = True
+            atexit.register(self.flush)
+            self._start_timer()
+        if self._changes >= self.flush_every:
+            self.flush()
+    
+    def _start_timer(self):
+        self._timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        except (StateError, OSError) as e:
+            # Keep the changes in memory and try again later
+            print(f"⚠️ Could not save the profile: {e}", file=sys.stderr)
+            with self._lock:
+                if self.dirty and self._timer is None:
+                    self._start_timer()
+    
+    def flush(self):
+        """Save unsaved changes now. A no-op when nothing is dirty."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self.dirty:
+                return
+            with self.store.transaction() as latest:
+                profile, legacy = adopt_profile(self.store, latest)
+                # self.data stays as it was if the save fails, to merge again
+                merged = merge_changes(profile, self._base, self.data)
+                self.store.save(merged, "flush", changes=self._changes)
+                retire_legacy(legacy)
+            self.data = merged
+            self.dirty = False
+            self._base = None
+            self._changes = 0
+            atexit.unregister(self.flush)
     
     def _check_streak(self):
         """Update streak based on last active date."""
@@ -488,6 +594,26 @@ class XPTracker:
     
     def award_xp(self, action: str, custom_amount: int = None) -> dict:
         """Award XP for an action."""
+        with self._transaction("award", action=action):
+            return self._apply_award(action, custom_amount)
+    
+    def award_many(self, actions: list) -> list[dict]:
+        """Award XP for several actions in order, saving the profile once.
+        
+        Each item is an action name or an (action, custom_amount) pair.
+        Combo, streak, multiplier, rank-ups and achievements come out
+        exactly as if award_xp had been called for each in turn; the
+        results are returned in the same order.
+        """
+        results = []
+        with self._transaction("award", actions=len(actions)):
+            for item in actions:
+                action, custom_amount = (item, None) if isinstance(item, str) else item
+                results.append(self._apply_award(action, custom_amount))
+        return results
+    
+    def _apply_award(self, action: str, custom_amount: int = None) -> dict:
+        """Apply one award to the in-memory profile."""
         self._check_streak()
         self._update_combo()
         
@@ -510,8 +636,6 @@ class XPTracker:
         # Check achievements
         new_achievements = self._check_achievements(action)
         
-        self._save()
-        
         return {
             "xp_earned": final_xp,
             "base_xp": base_xp,
@@ -523,98 +647,74 @@ class XPTracker:
             "new_achievements": new_achievements,
         }
     
-    def _check_rank_up(self) -> Optional[dict]:
+    def _check_rank_up(self) -> dict | None:
         """Check if user ranked up."""
-        current_rank = self.data["rank_index"]
-        xp = self.data["xp"]
-        
-        for i, rank in enumerate(RANKS):
-            if xp >= rank["xp"]:
-                continue
-            else:
-                new_rank = i - 1
-                break
-        else:
-            new_rank = len(RANKS) - 1
-        
-        if new_rank > current_rank:
+        ranks = load_ranks()
+        new_rank = ranks.index_for(self.data["xp"])
+        if new_rank > self.data["rank_index"]:
             self.data["rank_index"] = new_rank
-            return RANKS[new_rank]
+            return ranks[new_rank]
         return None
     
-    def _check_achievements(self, action: str) -> List[dict]:
+    def _check_achievements(self, action: str) -> list[dict]:
         """Check for new achievements."""
         new = []
-        earned = self.data["achievements"]
         stats = self.data["stats"]
         
         # Update stats based on action
-        stat_map = {
-            "bug_fixed": "bugs_fixed",
-            "test_written": "tests_written",
-            "file_created": "files_created",
-            "objective_complete": "objectives_completed",
-            "mission_complete": "missions_completed",
-        }
-        if action in stat_map:
-            stats[stat_map[action]] = stats.get(stat_map[action], 0) + 1
-        
-        # Check each achievement
-        checks = [
-            ("first_blood", stats.get("bugs_fixed", 0) >= 1),
-            ("bug_hunter", stats.get("bugs_fixed", 0) >= 10),
-            ("exterminator", stats.get("bugs_fixed", 0) >= 50),
-            ("bug_genocide", stats.get("bugs_fixed", 0) >= 200),
-            ("test_curious", stats.get("tests_written", 0) >= 1),
-            ("test_believer", stats.get("tests_written", 0) >= 25),
-            ("test_zealot", stats.get("tests_written", 0) >= 100),
-            ("showing_up", self.data["streak"]["current"] >= 3),
-            ("dedicated", self.data["streak"]["current"] >= 7),
-            ("committed", self.data["streak"]["current"] >= 14),
-            ("unstoppable", self.data["streak"]["current"] >= 30),
-            ("no_life", self.data["streak"]["current"] >= 100),
-            ("combo_starter", self.data["combo"]["highest"] >= 5),
-            ("combo_king", self.data["combo"]["highest"] >= 15),
-            ("combo_god", self.data["combo"]["highest"] >= 50),
-            ("mission_possible", stats.get("missions_completed", 0) >= 1),
-            ("veteran", stats.get("missions_completed", 0) >= 5),
-            ("war_hero", stats.get("missions_completed", 0) >= 20),
-        ]
+        changed = ["streak", "combo"]
+        if action in STAT_MAP:
+            stats[STAT_MAP[action]] = stats.get(STAT_MAP[action], 0) + 1
+            changed.append(STAT_MAP[action])
+        
+        # Only thresholds the changed counters just crossed are tested
+        earned = self._achievement_tracker()
+        new_ids = earned.check(changed, self._achievement_stat)
         
         # Night owl check
         hour = datetime.now().hour
-        if 2 <= hour <= 5 and "night_owl" not in earned:
-            checks.append(("night_owl", True))
+        if 2 <= hour <= 5 and earned.earn("night_owl"):
+            new_ids.append("night_owl")
         
-        for ach_id, condition in checks:
-            if condition and ach_id not in earned:
-                earned.append(ach_id)
-                ach = ACHIEVEMENTS[ach_id]
-                self.data["xp"] += ach["xp_reward"]
-                self.data["lifetime_xp"] += ach["xp_reward"]
-                new.append(ach)
+        for ach_id in new_ids:
+            ach = ACHIEVEMENTS[ach_id]
+            self.data["xp"] += ach["xp_reward"]
+            self.data["lifetime_xp"] += ach["xp_reward"]
+            new.append(ach)
         
         return new
     
+    def _achievement_tracker(self):
+        # Rebuilt whenever a reload hands us a different achievements list
+        earned = self.data["achievements"]
+        if self._earned is None or self._earned.earned is not earned:
+            self._earned = ACHIEVEMENT_INDEX.tracker(earned)
+        return self._earned
+    
+    def _achievement_stat(self, key: str) -> int:
+        if key == "streak":
+            return self.data["streak"]["current"]
+        if key == "combo":
+            return self.data["combo"]["highest"]
+        return self.data["stats"].get(key, 0)
+    
     def get_rank(self) -> dict:
         """Get current rank info."""
-        rank = RANKS[self.data["rank_index"]]
-        next_rank = RANKS[self.data["rank_index"] + 1] if self.data["rank_index"] < len(RANKS) - 1 else None
-        
-        if next_rank:
-            progress = (self.data["xp"] - rank["xp"]) / (next_rank["xp"] - rank["xp"])
-        else:
-            progress = 1.0
-        
+        ranks = load_ranks()
+        # A custom ladder may be shorter than the one the rank was earned on
+        index = min(self.data["rank_index"], len(ranks) - 1)
         return {
-            "current": rank,
-            "next": next_rank,
-            "progress": progress,
+            "current": ranks[index],
+            "next": ranks.next_rank(index),
+            "progress": ranks.progress(self.data["xp"], index),
             "xp": self.data["xp"],
         }
     
     def open_loot_box(self, rarity: str = None) -> dict:
         """Open a loot box!"""
+        # Only loot needs random; importing it costs every award
+        import random
+        
         if rarity is None:
             # Random rarity weighted
             roll = random.random()
@@ -631,19 +731,19 @@ class XPTracker:
         
         loot = random.choice(LOOT_TABLE[rarity])
         
-        if loot["type"] == "xp":
-            self.data["xp"] += loot["amount"]
-            self.data["lifetime_xp"] += loot["amount"]
-        elif loot["type"] == "multiplier":
-            self.data["multiplier"]["value"] = loot["amount"]
-            self.data["multiplier"]["expires"] = (
-                datetime.now() + timedelta(minutes=loot["duration"])
-            ).isoformat()
-        elif loot["type"] == "title":
-            if loot["name"] not in self.data["titles"]:
-                self.data["titles"].append(loot["name"])
-        
-        self._save()
+        with self._transaction("loot", rarity=rarity):
+            if loot["type"] == "xp":
+                self.data["xp"] += loot["amount"]
+                self.data["lifetime_xp"] += loot["amount"]
+            elif loot["type"] == "multiplier":
+                self.data["multiplier"]["value"] = loot["amount"]
+                self.data["multiplier"]["expires"] = (
+                    datetime.now() + timedelta(minutes=loot["duration"])
+                ).isoformat()
+            elif loot["type"] == "title":
+                if loot["name"] not in self.data["titles"]:
+                    self.data["titles"].append(loot["name"])
+        
         return {"rarity": rarity, "loot": loot}
     
     def get_profile_display(self) -> str:
@@ -779,32 +879,93 @@ class XPTracker:
         return "\n".join(lines)
 
 
+def read_batch(source: str) -> list:
+    """Parse award --batch input from a file, or stdin when source is "-".
+    
+    One action per line: either a bare action name or a JSON object such
+    as {"action": "bug_fixed", "amount": 80}. Blank lines are skipped.
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    
+    actions = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith("{"):
+            actions.append(line)
+            continue
+        try:
+            entry = json.loads(line)
+            action, amount = entry["action"], entry.get("amount")
+        except (ValueError, KeyError, TypeError):
+            raise ValueError(f"line {number}: expected an action name or {{\"action\": ...}}, got {line[:60]}")
+        if not isinstance(action, str) or not (amount is None or isinstance(amount, int)):
+            raise ValueError(f"line {number}: action must be a string and amount an integer")
+        actions.append((action, amount))
+    return actions
+
+
+def combine_results(results: list[dict]) -> dict:
+    """Fold award_many results into one popup: total XP, final bonuses."""
+    combined = dict(results[-1])
+    combined["xp_earned"] = sum(r["xp_earned"] for r in results)
+    combined["base_xp"] = sum(r["base_xp"] for r in results)
+    rank_ups = [r["rank_up"] for r in results if r["rank_up"]]
+    combined["rank_up"] = rank_ups[-1] if rank_ups else None
+    combined["new_achievements"] = [ach for r in results for ach in r["new_achievements"]]
+    return combined
+
+
 def main():
     """CLI interface for XP tracker."""
-    import sys
+    sys.exit(run_command(XPTracker(), sys.argv[1:]))
+
+
+def run_command(tracker: XPTracker, args: list[str]) -> int:
+    """Run one CLI command against tracker, printing its output.
     
-    tracker = XPTracker()
+    Shared by main() and sergeantd, which keeps a tracker resident.
+    Returns the exit status.
+    """
+    if not args:
+        args = ["profile"]
     
-    if len(sys.argv) < 2:
-        print(tracker.get_profile_display())
-        return
-    
-    cmd = sys.argv[1]
+    cmd = args[0]
+    if cmd in ("profile", "daily", "achievements"):
+        tracker.refresh()
     
     if cmd == "profile":
         print(tracker.get_profile_display())
     
     elif cmd == "award":
-        if len(sys.argv) < 3:
-            print("Usage: xp_tracker.py award <action>")
+        if len(args) < 2:
+            print("Usage: xp_tracker.py award <action> | award --batch [file|-]")
             print(f"Actions: {', '.join(XP_VALUES.keys())}")
-            return
-        action = sys.argv[2]
+            return 0
+        if args[1] == "--batch":
+            try:
+                actions = read_batch(args[2] if len(args) > 2 else "-")
+            except (OSError, ValueError) as e:
+                print(f"❌ award --batch: {e}")
+                return 1
+            if not actions:
+                print("No actions to award.")
+                return 0
+            results = tracker.award_many(actions)
+            print(f"🎯 {len(results)} ACTIONS")
+            print(tracker.get_xp_popup(combine_results(results)))
+            return 0
+        action = args[1]
         result = tracker.award_xp(action)
         print(tracker.get_xp_popup(result))
     
     elif cmd == "loot":
-        rarity = sys.argv[2] if len(sys.argv) > 2 else None
+        rarity = args[1] if len(args) > 1 else None
         result = tracker.open_loot_box(rarity)
         print(f"\n🎁 LOOT BOX OPENED! [{result['rarity'].upper()}]")
         print(f"   → {result['loot']['name']}")
@@ -829,7 +990,12 @@ def main():
     else:
         print(f"Unknown command: {cmd}")
         print("Commands: profile, award, loot, daily, achievements")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except StateError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)